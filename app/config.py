@@ -1,13 +1,121 @@
 import os
 from dotenv import load_dotenv
+from app.secrets_provider import get_secrets_provider
 
 load_dotenv()
 
+def _secret(env_name: str, parameter_name: str):
+    """Environment variable if set, otherwise the parameter from the secrets provider."""
+    return os.getenv(env_name) or get_secrets_provider().get(parameter_name)
+
 class Config:
-    MONGO_DB_URL = os.getenv("MONGODB_URL")
-    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-    JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+    MONGO_DB_NAME = os.getenv("MONGODB_DB_NAME", "CollaborativeArticles")
+    # Connection pool tuning (a Lambda container serves one request at a time)
+    MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", 10))
+    MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", 0))
+    MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", 60000))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000))
+    MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", 5000))
+    MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", 20000))
     JWT_ALGORITHM = "HS256"
+
+    # Secrets are resolved lazily (environment first, then the secrets provider,
+    # e.g. SSM /fastapi/*) so importing the app makes no network calls.
+    @property
+    def MONGO_DB_URL(self):
+        return _secret("MONGODB_URL", "mongodb_url")
+
+    @property
+    def OPENAI_API_KEY(self):
+        return _secret("OPENAI_API_KEY", "openai_api_key")
+
+    @property
+    def JWT_SECRET_KEY(self):
+        return _secret("JWT_SECRET_KEY", "jwt_secret_key")
+
+    # Structured logging: LOG_SAMPLE_RATES is a comma-separated list of
+    # "METHOD /path/prefix=rate" rules (longest prefix wins) applied to
+    # INFO/DEBUG records; warnings and errors are always kept.
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", 1.0))
+    LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+    # Dump every raw Lambda event/context (debugging only; costly in CloudWatch)
+    LOG_LAMBDA_EVENTS = os.getenv("LOG_LAMBDA_EVENTS", "false").lower() == "true"
+    # Per-route latency / Mongo / OpenAI metrics (GET /api/v1/admin/metrics/, Server-Timing header)
+    # recorded for a METRICS_SAMPLE_RATE fraction of requests.
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_SAMPLE_RATE = float(os.getenv("METRICS_SAMPLE_RATE", 1.0))
+    # Aggregate every Mongo command by shape (python -m app.manage profile-queries,
+    # GET /api/v1/admin/query-profile/); commands slower than MONGO_SLOW_QUERY_MS are logged.
+    MONGO_PROFILER_ENABLED = os.getenv("MONGO_PROFILER_ENABLED", "false").lower() == "true"
+    MONGO_SLOW_QUERY_MS = float(os.getenv("MONGO_SLOW_QUERY_MS", 100))
+
+    # Create the indexes from app/database/indexes.py when the app starts
+    # (otherwise run `python -m app.manage ensure-indexes` on deploy).
+    ENSURE_INDEXES_ON_STARTUP = os.getenv("ENSURE_INDEXES_ON_STARTUP", "false").lower() == "true"
+    # How long an authenticated user document may be served from memory
+    # before it is re-read; bounds how long a ban or role change can lag.
+    USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", 30))
+    USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", 1024))
+    # Verified JWT payloads are reused until the token's exp (capped at this TTL).
+    TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", 300))
+    TOKEN_CACHE_MAX_SIZE = int(os.getenv("TOKEN_CACHE_MAX_SIZE", 4096))
+    # bcrypt runs on a worker pool ("thread" or "process") so it never blocks the event loop.
+    PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    # Hash/verify calls allowed in flight or queued before new ones are rejected with 503.
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 32))
+    # Article generation fan-out and OpenAI budgets
+    ARTICLE_GENERATION_CONCURRENCY = int(os.getenv("ARTICLE_GENERATION_CONCURRENCY", 8))
+    ARTICLE_GENERATION_MAX_RETRIES = int(os.getenv("ARTICLE_GENERATION_MAX_RETRIES", 3))
+    OPENAI_REQUESTS_PER_MINUTE = float(os.getenv("OPENAI_REQUESTS_PER_MINUTE", 500))
+    OPENAI_TOKENS_PER_MINUTE = float(os.getenv("OPENAI_TOKENS_PER_MINUTE", 150000))
+    # Generation jobs run on the Celery worker ("celery") or in-process ("asyncio"). The
+    # in-process runner is for local development only: Lambda freezes the container as soon
+    # as the response is sent, so it defaults to Celery there and "asyncio" is refused.
+    GENERATION_JOB_RUNNER = os.getenv(
+        "GENERATION_JOB_RUNNER", "celery" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "asyncio"
+    )
+    # An active job with no progress for this long is considered abandoned.
+    GENERATION_JOB_STALE_SECONDS = int(os.getenv("GENERATION_JOB_STALE_SECONDS", 900))
+    CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
+    # Cache of generated article text keyed by model + prompt ("mongo", "disk" or "none")
+    CONTENT_CACHE_BACKEND = os.getenv("CONTENT_CACHE_BACKEND", "mongo")
+    CONTENT_CACHE_TTL_SECONDS = int(os.getenv("CONTENT_CACHE_TTL_SECONDS", 86400))
+    CONTENT_CACHE_MAX_ENTRIES = int(os.getenv("CONTENT_CACHE_MAX_ENTRIES", 500))
+    CONTENT_CACHE_DIR = os.getenv("CONTENT_CACHE_DIR", ".cache/generated_content")
+    # Write-behind buffer for activity logs: flushed every N events or N seconds;
+    # once MAX_SIZE events are pending, callers wait for a flush (backpressure).
+    ACTIVITY_BUFFER_BATCH_SIZE = int(os.getenv("ACTIVITY_BUFFER_BATCH_SIZE", 100))
+    ACTIVITY_BUFFER_FLUSH_SECONDS = float(os.getenv("ACTIVITY_BUFFER_FLUSH_SECONDS", 1.0))
+    ACTIVITY_BUFFER_MAX_SIZE = int(os.getenv("ACTIVITY_BUFFER_MAX_SIZE", 5000))
+    # Activity storage: "documents" (one per event in user_activity) or "buckets"
+    # (per-user hour/day documents in user_activity_buckets, at most
+    # ACTIVITY_BUCKET_MAX_EVENTS events each). Events older than
+    # ACTIVITY_RETENTION_DAYS are removed by a TTL index (0 keeps them forever).
+    ACTIVITY_STORAGE_MODE = os.getenv("ACTIVITY_STORAGE_MODE", "documents")
+    ACTIVITY_BUCKET_SIZE = os.getenv("ACTIVITY_BUCKET_SIZE", "hour")
+    ACTIVITY_BUCKET_MAX_EVENTS = int(os.getenv("ACTIVITY_BUCKET_MAX_EVENTS", 500))
+    ACTIVITY_RETENTION_DAYS = int(os.getenv("ACTIVITY_RETENTION_DAYS", 0))
+    # Badge evaluation after a counter crosses a threshold: "debounced" coalesces a
+    # user's events for BADGE_EVALUATION_DEBOUNCE_SECONDS in a background task,
+    # "inline" evaluates immediately in the request. On Lambda every invocation drains
+    # pending evaluations before returning (a frozen container would lose them), so
+    # only events within a single invocation are coalesced there.
+    BADGE_EVALUATION_MODE = os.getenv("BADGE_EVALUATION_MODE", "debounced")
+    BADGE_EVALUATION_DEBOUNCE_SECONDS = float(os.getenv("BADGE_EVALUATION_DEBOUNCE_SECONDS", 2.0))
+    # Materialized engagement leaderboards: top LEADERBOARD_SIZE entries per board and
+    # window; a read of a board older than LEADERBOARD_MAX_AGE_SECONDS serves it and
+    # refreshes it in the background (refresh_all also runs on a schedule).
+    LEADERBOARD_SIZE = int(os.getenv("LEADERBOARD_SIZE", 100))
+    LEADERBOARD_MAX_AGE_SECONDS = int(os.getenv("LEADERBOARD_MAX_AGE_SECONDS", 300))
+    # Cache of public read responses ("memory", "redis" or "none"), invalidated by
+    # repository writes. The memory backend only invalidates within one process,
+    # so other instances may serve an entry for up to the TTL.
+    RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+    RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 30))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 1024))
+    RESPONSE_CACHE_REDIS_URL = os.getenv("RESPONSE_CACHE_REDIS_URL", CELERY_BROKER_URL)
     # SECTORS = ["Tech", "Health", "Corporate", "Politics", "Youth", "Lifestyle"]
     SECTORS = [
         {
@@ -1 +1 @@
-from .db import db 
\ No newline at end of file
+from .db import db, get_client, get_database, ping
@@ -0,0 +1,191 @@
+from app.config import config
+from app.database import db
+from bson import ObjectId
+from datetime import timedelta
+from pymongo import UpdateOne
+
+def _expires_at(moment):
+    """Expiry for data last written at `moment`, or None when retention is unlimited."""
+    if config.ACTIVITY_RETENTION_DAYS > 0:
+        return moment + timedelta(days=config.ACTIVITY_RETENTION_DAYS)
+    return None
+
+class DocumentActivityStore:
+    """One document per event in user_activity."""
+
+    collection = "user_activity"
+
+    async def insert_one(self, activity: dict):
+        document = dict(activity)
+        if _expires_at(document["timestamp"]):
+            document["expires_at"] = _expires_at(document["timestamp"])
+        result = await db[self.collection].insert_one(document)
+        return result.inserted_id
+
+    async def insert_many(self, activities: list):
+        documents = []
+        for activity in activities:
+            document = dict(activity)
+            if _expires_at(document["timestamp"]):
+                document["expires_at"] = _expires_at(document["timestamp"])
+            documents.append(document)
+        await db[self.collection].insert_many(documents, ordered=False)
+
+    async def find_by_user(self, user_id: ObjectId, limit: int) -> list:
+        return await db[self.collection].find({"user_id": user_id}, {"expires_at": 0}).to_list(length=limit)
+
+    async def find_recent(self, limit: int) -> list:
+        return await db[self.collection].find({}, {"expires_at": 0}).sort("timestamp", -1).limit(limit).to_list(length=limit)
+
+    def pipeline(self, match: dict) -> list:
+        """Aggregation stages producing one flat event document per activity matching `match`."""
+        return [{"$match": match}]
+
+    async def stream(self, batch_size: int):
+        """Yield every stored event in batches, oldest first (used by migrations)."""
+        batch = []
+        async for document in db[self.collection].find({}, {"expires_at": 0}).sort("_id", 1).batch_size(batch_size):
+            batch.append(document)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+class BucketActivityStore:
+    """Per-user, per-hour (or day) documents in user_activity_buckets with the events embedded.
+
+    A bucket holds at most ACTIVITY_BUCKET_MAX_EVENTS events; when it is full the
+    upsert no longer matches it and starts another bucket for the same period.
+    """
+
+    collection = "user_activity_buckets"
+
+    def __init__(self, bucket_size: str = "hour", max_events: int = 500):
+        self.bucket_size = bucket_size
+        self.max_events = max_events
+
+    def bucket_start(self, moment):
+        moment = moment.replace(minute=0, second=0, microsecond=0)
+        return moment.replace(hour=0) if self.bucket_size == "day" else moment
+
+    def _bucket_end(self, start):
+        return start + (timedelta(days=1) if self.bucket_size == "day" else timedelta(hours=1))
+
+    def _append(self, user_id: ObjectId, start, events: list) -> tuple:
+        """(filter, update) upserting `events` into a bucket of this user/period that still has room for them."""
+        update = {
+            "$push": {"events": {"$each": events}},
+            "$inc": {"count": len(events)},
+            "$min": {"first_at": min(event["timestamp"] for event in events)},
+            "$max": {"last_at": max(event["timestamp"] for event in events)},
+        }
+        expires_at = _expires_at(self._bucket_end(start))
+        if expires_at:
+            update["$setOnInsert"] = {"expires_at": expires_at}
+        return {"user_id": user_id, "bucket_start": start, "count": {"$lte": self.max_events - len(events)}}, update
+
+    @staticmethod
+    def _event(activity: dict) -> dict:
+        return {
+            "_id": activity.get("_id") or ObjectId(),
+            "action": activity["action"],
+            "metadata": activity.get("metadata", {}),
+            "timestamp": activity["timestamp"],
+        }
+
+    async def insert_one(self, activity: dict):
+        event = self._event(activity)
+        query, update = self._append(activity["user_id"], self.bucket_start(event["timestamp"]), [event])
+        await db[self.collection].update_one(query, update, upsert=True)
+        return event["_id"]
+
+    async def insert_many(self, activities: list):
+        grouped = {}
+        for activity in activities:
+            event = self._event(activity)
+            grouped.setdefault((activity["user_id"], self.bucket_start(event["timestamp"])), []).append(event)
+        operations = [
+            UpdateOne(*self._append(user_id, start, events[i:i + self.max_events]), upsert=True)
+            for (user_id, start), events in grouped.items()
+            for i in range(0, len(events), self.max_events)
+        ]
+        await db[self.collection].bulk_write(operations, ordered=False)
+
+    def _flatten(self) -> list:
+        return [
+            {"$unwind": "$events"},
+            {"$project": {
+                "_id": "$events._id", "user_id": 1, "action": "$events.action",
+                "metadata": "$events.metadata", "timestamp": "$events.timestamp",
+            }},
+        ]
+
+    async def find_by_user(self, user_id: ObjectId, limit: int) -> list:
+        pipeline = [{"$match": {"user_id": user_id}}, {"$sort": {"bucket_start": 1}}, *self._flatten(), {"$limit": limit}]
+        return await db[self.collection].aggregate(pipeline).to_list(length=limit)
+
+    async def find_recent(self, limit: int) -> list:
+        # The `limit` most recent events always lie within the `limit` most recently written buckets
+        pipeline = [
+            {"$sort": {"last_at": -1}}, {"$limit": limit},
+            *self._flatten(),
+            {"$sort": {"timestamp": -1}}, {"$limit": limit},
+        ]
+        return await db[self.collection].aggregate(pipeline).to_list(length=limit)
+
+    def pipeline(self, match: dict) -> list:
+        """Aggregation stages producing one flat event document per activity matching `match`."""
+        # Narrow down whole buckets first so only candidate buckets are unwound
+        prefilter = {}
+        if "user_id" in match:
+            prefilter["user_id"] = match["user_id"]
+        if "action" in match:
+            prefilter["events.action"] = match["action"]
+        if "metadata.article_id" in match:
+            prefilter["events.metadata.article_id"] = match["metadata.article_id"]
+        if isinstance(match.get("timestamp"), dict) and "$gte" in match["timestamp"]:
+            prefilter["last_at"] = {"$gte": match["timestamp"]["$gte"]}
+        return [{"$match": prefilter}, *self._flatten(), {"$match": match}]
+
+    async def stream(self, batch_size: int):
+        """Yield every stored event in batches, oldest bucket first (used by migrations)."""
+        batch = []
+        async for bucket in db[self.collection].find({}).sort("bucket_start", 1).batch_size(max(1, batch_size // 10)):
+            for event in bucket["events"]:
+                batch.append({**event, "user_id": bucket["user_id"]})
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+def get_activity_store(mode: str = None):
+    """Return the store for ACTIVITY_STORAGE_MODE (or an explicit mode)."""
+    mode = mode or config.ACTIVITY_STORAGE_MODE
+    if mode == "buckets":
+        return BucketActivityStore(config.ACTIVITY_BUCKET_SIZE, config.ACTIVITY_BUCKET_MAX_EVENTS)
+    if mode == "documents":
+        return DocumentActivityStore()
+    raise ValueError(f"Unknown activity storage mode: {mode}")
+
+def activity_source(match: dict) -> tuple:
+    """(collection, leading pipeline stages) yielding one flat event per activity matching `match`, for aggregations."""
+    store = get_activity_store()
+    return store.collection, store.pipeline(match)
+
+async def migrate_activity(source_mode: str, target_mode: str, batch_size: int = 1000, drop_source: bool = False) -> int:
+    """Copy every event from one storage mode to the other in batches; returns the number of events copied."""
+    source, target = get_activity_store(source_mode), get_activity_store(target_mode)
+    if source.collection == target.collection:
+        raise ValueError("Source and target storage modes are the same")
+    if await db[target.collection].estimated_document_count():
+        raise ValueError(f"{target.collection} is not empty; refusing to migrate into it twice")
+
+    copied = 0
+    async for batch in source.stream(batch_size):
+        await target.insert_many(batch)
+        copied += len(batch)
+    if drop_source:
+        await db[source.collection].drop()
+    return copied
@@ -1,6 +1,10 @@
 from app.database import db
 from bson import ObjectId
 from datetime import datetime, timezone
+from app.services.user_cache import UserCache
+from app.services.response_cache import ResponseCache
+from app.database.article_repository import ArticleRepository
+from app.database.comment_repository import CommentRepository
 
 class AdminRepository:
     """Handles admin actions like content moderation and user management."""
@@ -12,19 +16,19 @@ class AdminRepository:
             {"_id": ObjectId(article_id)},
             {"$set": {"status": "approved", "updated_at": datetime.now(timezone.utc)}}
         )
+        if update_result.modified_count:
+            await ResponseCache.invalidate(ResponseCache.ARTICLES)
         return update_result.modified_count > 0
 
     @staticmethod
     async def delete_article(article_id: str):
         """Delete an article."""
-        delete_result = await db["articles"].delete_one({"_id": ObjectId(article_id)})
-        return delete_result.deleted_count > 0
+        return await ArticleRepository.delete_article(article_id)
 
     @staticmethod
     async def delete_comment(comment_id: str):
         """Delete an inappropriate comment."""
-        delete_result = await db["comments"].delete_one({"_id": ObjectId(comment_id)})
-        return delete_result.deleted_count > 0
+        return await CommentRepository.delete_comment(comment_id)
 
     @staticmethod
     async def ban_user(user_id: str):
@@ -33,6 +37,7 @@ class AdminRepository:
             {"_id": ObjectId(user_id)},
             {"$set": {"status": "banned", "updated_at": datetime.now(timezone.utc)}}
         )
+        UserCache.invalidate_user(user_id)
         return update_result.modified_count > 0
 
     @staticmethod
@@ -42,6 +47,7 @@ class AdminRepository:
             {"_id": ObjectId(user_id)},
             {"$set": {"status": "active", "updated_at": datetime.now(timezone.utc)}}
         )
+        UserCache.invalidate_user(user_id)
         return update_result.modified_count > 0
 
     @staticmethod
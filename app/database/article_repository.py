@@ -1,16 +1,32 @@
 from app.database import db
+from app.database.activity_store import activity_source
+from app.database.user_counters_repository import UserCountersRepository
+from app.services.response_cache import ResponseCache
 from bson import ObjectId
+from bson.errors import InvalidId
 from datetime import datetime, timezone
+from pymongo import UpdateOne
+import base64
 
 class ArticleRepository:
     """Handles all database operations related to articles."""
 
+    # Feed cards only need the title, image and metadata, not the article body
+    SUMMARY_PROJECTION = {"description": 0}
+    # Engagement denormalized onto each article so feed cards need no extra queries;
+    # kept up to date with $inc on every comment/view, repaired by reconcile_engagement()
+    ENGAGEMENT_DEFAULTS = {"comment_count": 0, "view_count": 0, "last_commented_at": None}
+
     @staticmethod
     async def create_article(article_data: dict):
         """Insert a new article into the database."""
         article_data["created_at"] = datetime.now(timezone.utc)
         article_data["updated_at"] = datetime.now(timezone.utc)
+        for field, value in ArticleRepository.ENGAGEMENT_DEFAULTS.items():
+            article_data.setdefault(field, value)
         result = await db["articles"].insert_one(article_data)
+        await UserCountersRepository.increment(article_data.get("author_id"), articles_written=1)
+        await ResponseCache.invalidate(ResponseCache.ARTICLES)
         return result.inserted_id
 
     @staticmethod
@@ -18,7 +34,19 @@ class ArticleRepository:
         """Insert multiple articles into the database."""
         if not articles_data:
             return
+        for article in articles_data:
+            for field, value in ArticleRepository.ENGAGEMENT_DEFAULTS.items():
+                article.setdefault(field, value)
         await db["articles"].insert_many(articles_data)
+        await ResponseCache.invalidate(ResponseCache.ARTICLES)
+
+        written = {}
+        for article in articles_data:
+            if article.get("author_id"):
+                written[article["author_id"]] = written.get(article["author_id"], 0) + 1
+        await UserCountersRepository.increment_many(
+            {author_id: {"articles_written": count} for author_id, count in written.items()}
+        )
 
     @staticmethod
     async def find_by_id(article_id: str):
@@ -36,15 +64,220 @@ class ArticleRepository:
             {"_id": ObjectId(article_id)},
             {"$set": update_data, "$currentDate": {"updated_at": True}}
         )
+        if update_result.modified_count:
+            await ResponseCache.invalidate(ResponseCache.ARTICLES)
         return update_result.modified_count > 0  # Return True if updated successfully
 
     @staticmethod
     async def delete_article(article_id: str):
         """Delete an article from the database."""
-        delete_result = await db["articles"].delete_one({"_id": ObjectId(article_id)})
-        return delete_result.deleted_count > 0  # Return True if deleted successfully
+        article = await db["articles"].find_one_and_delete(
+            {"_id": ObjectId(article_id)}, {"author_id": 1, "comment_count": 1}
+        )
+        if not article:
+            return False
+        await ResponseCache.invalidate(ResponseCache.ARTICLES, ResponseCache.comments_tag(article["_id"]))
+        # Take the article, and the comments it received, off its author's counters
+        if article.get("author_id"):
+            comments_received = article.get("comment_count")
+            if comments_received is None:  # Article predates the field and was never commented on since
+                comments_received = await db["comments"].count_documents({"article_id": article["_id"]})
+            await UserCountersRepository.increment(
+                article["author_id"], articles_written=-1, comments_received=-comments_received
+            )
+        return True
+
+    @staticmethod
+    async def increment_comments(article_id: ObjectId, delta: int, commented_at: datetime = None):
+        """Apply a comment add (+1, with its time) or delete (-1); returns the article's author_id and
+        last_commented_at as they were before the change, or None if the article is gone."""
+        update = {"$inc": {"comment_count": delta}}
+        if commented_at:
+            update["$max"] = {"last_commented_at": commented_at}
+        article = await db["articles"].find_one_and_update(
+            {"_id": article_id, "comment_count": {"$type": "number"}}, update, {"author_id": 1, "last_commented_at": 1}
+        )
+        if article is None:
+            # Articles created before the engagement fields existed: $inc would count from zero,
+            # so leave their counts to reconcile-articles and only look up the author
+            article = await db["articles"].find_one({"_id": article_id}, {"author_id": 1, "last_commented_at": 1})
+        if article:
+            # Feed cards show the count; views are left to the cache TTL (see increment_views)
+            await ResponseCache.invalidate(ResponseCache.ARTICLES)
+        return article
+
+    @staticmethod
+    async def refresh_last_commented_at(article_id: ObjectId):
+        """Point last_commented_at at the newest remaining comment (after the latest one is deleted)."""
+        latest = await db["comments"].find_one({"article_id": article_id}, {"created_at": 1}, sort=[("created_at", -1)])
+        await db["articles"].update_one(
+            {"_id": article_id}, {"$set": {"last_commented_at": latest["created_at"] if latest else None}}
+        )
+
+    @staticmethod
+    async def increment_views(views_by_article: dict):
+        """Add {article_id: views} to the articles' view_count in one unordered bulk write.
+
+        The feed cache is deliberately not invalidated here: views arrive constantly, so
+        cached feed pages show view counts up to RESPONSE_CACHE_TTL_SECONDS old. Articles
+        without a view_count yet are skipped until reconcile-articles initialises them.
+        """
+        article_ids = [ObjectId(article_id) for article_id in views_by_article if ObjectId.is_valid(article_id)]
+        operations = [
+            UpdateOne({"_id": article_id, "view_count": {"$type": "number"}}, {"$inc": {"view_count": views_by_article[str(article_id)]}})
+            for article_id in article_ids
+        ]
+        if not operations:
+            return
+        await db["articles"].bulk_write(operations, ordered=False)
+
+    @staticmethod
+    async def reconcile_engagement(article_id: str = None, batch_size: int = 1000) -> int:
+        """Recompute comment_count, view_count and last_commented_at from comments and activity
+        (all articles, or just one) and fix the ones that drifted; returns how many were repaired.
+
+        Articles are read `batch_size` at a time and only that batch's comments and views are
+        aggregated, so memory stays flat however many articles there are.
+        """
+        repaired = 0
+        batch = []
+        cursor = db["articles"].find(
+            {"_id": ObjectId(article_id)} if article_id else {},
+            {"comment_count": 1, "view_count": 1, "last_commented_at": 1},
+        )
+        async for article in cursor:
+            batch.append(article)
+            if len(batch) >= batch_size:
+                repaired += await ArticleRepository._reconcile_batch(batch)
+                batch = []
+        if batch:
+            repaired += await ArticleRepository._reconcile_batch(batch)
+        if repaired:
+            await ResponseCache.invalidate(ResponseCache.ARTICLES)
+        return repaired
+
+    @staticmethod
+    async def _reconcile_batch(articles: list) -> int:
+        """Fix the engagement fields of these articles; returns how many had drifted."""
+        article_ids = [article["_id"] for article in articles]
+        comments = {
+            row["_id"]: row async for row in db["comments"].aggregate([
+                {"$match": {"article_id": {"$in": article_ids}}},
+                {"$group": {"_id": "$article_id", "count": {"$sum": 1}, "last": {"$max": "$created_at"}}},
+            ])
+        }
+        view_collection, view_stages = activity_source(
+            {"action": "viewed_article", "metadata.article_id": {"$in": [str(article_id) for article_id in article_ids]}}
+        )
+        views = {
+            row["_id"]: row["count"] async for row in db[view_collection].aggregate([
+                *view_stages,
+                {"$group": {"_id": "$metadata.article_id", "count": {"$sum": 1}}},
+            ])
+        }
+
+        operations = []
+        for article in articles:
+            stats = comments.get(article["_id"], {})
+            expected = {
+                "comment_count": stats.get("count", 0),
+                "view_count": views.get(str(article["_id"]), 0),
+                "last_commented_at": stats.get("last"),
+            }
+            if any(article.get(field) != value for field, value in expected.items()):
+                operations.append(UpdateOne({"_id": article["_id"]}, {"$set": expected}))
+        if operations:
+            await db["articles"].bulk_write(operations, ordered=False)
+        return len(operations)
+
+    @staticmethod
+    async def normalize_created_at(batch_size: int = 1000) -> int:
+        """Convert string created_at values to dates and fill missing ones from the ObjectId timestamp,
+        so older articles sort among the rest of the feed; returns how many were fixed."""
+        fixed = 0
+        operations = []
+        cursor = db["articles"].find(
+            {"$or": [{"created_at": {"$type": "string"}}, {"created_at": None}]}, {"created_at": 1}
+        )
+        async for article in cursor:
+            try:
+                created_at = datetime.fromisoformat(article["created_at"])
+                if created_at.tzinfo is None:
+                    created_at = created_at.replace(tzinfo=timezone.utc)
+            except (KeyError, TypeError, ValueError):
+                created_at = article["_id"].generation_time
+            operations.append(UpdateOne({"_id": article["_id"]}, {"$set": {"created_at": created_at}}))
+            if len(operations) >= batch_size:
+                fixed += len(operations)
+                await db["articles"].bulk_write(operations, ordered=False)
+                operations = []
+        if operations:
+            fixed += len(operations)
+            await db["articles"].bulk_write(operations, ordered=False)
+        if fixed:
+            await ResponseCache.invalidate(ResponseCache.ARTICLES)
+        return fixed
+
+    @staticmethod
+    def encode_cursor(article: dict) -> str:
+        """Build an opaque pagination cursor pointing just after this article.
+
+        Legacy articles may have a string or missing created_at (until `normalize_created_at`
+        runs), so the key is tagged with its type: d(ate), s(tring) or n(one).
+        """
+        created_at = article.get("created_at")
+        if isinstance(created_at, datetime):
+            key = f"d:{created_at.isoformat()}"
+        elif isinstance(created_at, str):
+            key = f"s:{created_at}"
+        else:
+            key = "n:"
+        raw = f"{key}|{article['_id']}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
 
     @staticmethod
-    async def get_all_articles():
-        """Retrieve all articles."""
-        return await db["articles"].find().sort("created_at", -1).to_list(length=100)
+    def decode_cursor(cursor: str) -> tuple:
+        """Decode a cursor into its (created_at, _id) key; raises ValueError if malformed."""
+        try:
+            key, article_id = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit("|", 1)
+            if key[1:2] != ":":  # Untagged cursors issued before legacy keys were supported
+                key = f"d:{key}"
+            kind, value = key[0], key[2:]
+            if kind == "d":
+                created_at = datetime.fromisoformat(value)
+            elif kind == "s":
+                created_at = value
+            elif kind == "n" and not value:
+                created_at = None
+            else:
+                raise ValueError(kind)
+            return created_at, ObjectId(article_id)
+        except (ValueError, InvalidId, UnicodeDecodeError):
+            raise ValueError("Invalid pagination cursor")
+
+    @staticmethod
+    async def get_all_articles(limit: int = 100, after: tuple = None, full: bool = False):
+        """Retrieve a page of articles, newest first, using keyset pagination on (created_at, _id).
+
+        `after` is a decoded cursor; unless `full` is set the description body is left out.
+        """
+        query = {}
+        if after:
+            created_at, article_id = after
+            # Mongo sorts dates before strings before null/missing in descending order, and
+            # range operators only match values of the same type, so later types are added explicitly
+            if created_at is None:
+                query = {"created_at": None, "_id": {"$lt": article_id}}
+            else:
+                conditions = [
+                    {"created_at": {"$lt": created_at}},
+                    {"created_at": created_at, "_id": {"$lt": article_id}},
+                ]
+                if isinstance(created_at, datetime):
+                    conditions.append({"created_at": {"$type": "string"}})
+                conditions.append({"created_at": None})
+                query = {"$or": conditions}
+        projection = None if full else ArticleRepository.SUMMARY_PROJECTION
+        return await db["articles"].find(query, projection).sort(
+            [("created_at", -1), ("_id", -1)]
+        ).limit(limit).to_list(length=limit)
@@ -1,10 +1,14 @@
 from app.database import db
+from app.database.user_counters_repository import UserCountersRepository
 from bson import ObjectId
 from datetime import datetime, timezone
+from pymongo import ReturnDocument
+from app.services.response_cache import ResponseCache
 
 class BadgeRepository:
     """Handles user badge assignments based on engagement metrics."""
 
+    # badge -> minimum value of each counter in user_counters
     BADGE_CRITERIA = {
         "Contributor": {"articles_written": 1},
         "Commenter": {"comments_made": 5},
@@ -15,37 +19,59 @@ class BadgeRepository:
     }
 
     @staticmethod
-    async def assign_badges(user_id: str):
-        """Assigns badges based on user engagement."""
-        engagement = await db["user_activity"].find({"user_id": ObjectId(user_id)}).to_list(length=100)
-
-        # Count user actions
-        articles_written = await db["articles"].count_documents({"author_id": ObjectId(user_id)})
-        comments_made = await db["comments"].count_documents({"user_id": ObjectId(user_id)})
-        articles_viewed = sum(1 for action in engagement if action["action"] == "viewed_article")
-        comments_received = await db["comments"].count_documents({"article_id": {"$in": [doc["_id"] for doc in await db["articles"].find({"author_id": ObjectId(user_id)}).to_list(length=100)]}})
-
-        # Determine badges
-        new_badges = []
-        for badge, criteria in BadgeRepository.BADGE_CRITERIA.items():
-            if all(
-                (criteria.get("articles_written", 0) <= articles_written) and
-                (criteria.get("comments_made", 0) <= comments_made) and
-                (criteria.get("articles_viewed", 0) <= articles_viewed) and
-                (criteria.get("comments_received", 0) <= comments_received)
-            ):
-                new_badges.append(badge)
-
-        # Store assigned badges
-        await db["badges"].update_one(
+    def evaluate(counters: dict) -> list:
+        """Return every badge whose criteria the counters meet."""
+        return [
+            badge for badge, criteria in BadgeRepository.BADGE_CRITERIA.items()
+            if all(counters.get(counter, 0) >= threshold for counter, threshold in criteria.items())
+        ]
+
+    @staticmethod
+    def crosses_threshold(before: dict, after: dict) -> bool:
+        """True if some counter moved up past a badge threshold, i.e. a new badge may be earned."""
+        return any(
+            before.get(counter, 0) < threshold <= after.get(counter, 0)
+            for criteria in BadgeRepository.BADGE_CRITERIA.values()
+            for counter, threshold in criteria.items()
+        )
+
+    @staticmethod
+    async def award_badges(user_id: str, badges: list, counters: dict = None) -> list:
+        """Add badges to the user's set and record a badge_events entry for each one newly earned."""
+        if not badges:
+            return []
+        now = datetime.now(timezone.utc)
+        previous = await db["badges"].find_one_and_update(
             {"user_id": ObjectId(user_id)},
-            {"$set": {"badges": new_badges, "updated_at": datetime.now(timezone.utc)}},
-            upsert=True
+            {"$addToSet": {"badges": {"$each": badges}}, "$set": {"updated_at": now}},
+            upsert=True,
+            return_document=ReturnDocument.BEFORE
         )
-        return new_badges
+        already_held = set(previous.get("badges", [])) if previous else set()
+        awarded = [badge for badge in badges if badge not in already_held]
+        if awarded:
+            await ResponseCache.invalidate(ResponseCache.badges_tag(user_id))
+            await db["badge_events"].insert_many([
+                {"user_id": ObjectId(user_id), "badge": badge, "counters": counters or {}, "awarded_at": now}
+                for badge in awarded
+            ])
+        return awarded
+
+    @staticmethod
+    async def assign_badges(user_id: str):
+        """Assigns badges based on user engagement."""
+        counters = await UserCountersRepository.get_counters(user_id)
+        earned = BadgeRepository.evaluate(counters)
+        await BadgeRepository.award_badges(user_id, earned, counters)
+        return earned
 
     @staticmethod
     async def get_user_badges(user_id: str):
         """Retrieve the badges a user has earned."""
         badge_record = await db["badges"].find_one({"user_id": ObjectId(user_id)})
         return badge_record["badges"] if badge_record else []
+
+    @staticmethod
+    async def get_badge_events(user_id: str, limit: int = 50):
+        """Retrieve a user's badge awards, newest first."""
+        return await db["badge_events"].find({"user_id": ObjectId(user_id)}).sort("awarded_at", -1).limit(limit).to_list(length=limit)
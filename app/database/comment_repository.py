@@ -1,4 +1,7 @@
 from app.database import db
+from app.database.article_repository import ArticleRepository
+from app.database.user_counters_repository import UserCountersRepository
+from app.services.response_cache import ResponseCache
 from bson import ObjectId
 from datetime import datetime, timezone
 
@@ -16,48 +19,80 @@ class CommentRepository:
             "updated_at": datetime.now(timezone.utc)
         }
         result = await db["comments"].insert_one(comment_data)
+        await CommentRepository._count_comment(comment_data, 1)
         return result.inserted_id
 
     @staticmethod
-    async def get_comments_by_article(article_id: str) -> list:
-        """Retrieve all comments for a specific article."""
+    async def _count_comment(comment: dict, delta: int):
+        """Apply a comment add (+1) or delete (-1) to the article, the counters and cached comment lists."""
+        await ResponseCache.invalidate(ResponseCache.comments_tag(comment["article_id"]))
+        await UserCountersRepository.increment(comment["user_id"], comments_made=delta)
+        article = await ArticleRepository.increment_comments(
+            comment["article_id"], delta, comment["created_at"] if delta > 0 else None
+        )
+        if not article:
+            return
+        if article.get("author_id"):
+            await UserCountersRepository.increment(article["author_id"], comments_received=delta)
+        # Deleting the newest comment moves last_commented_at back to the one before it
+        latest = article.get("last_commented_at")
+        if delta < 0 and latest and comment.get("created_at") and comment["created_at"] >= latest:
+            await ArticleRepository.refresh_last_commented_at(comment["article_id"])
+
+    @staticmethod
+    async def get_comments_by_article(article_id: str, limit: int = 100, after: str = None) -> list:
+        """Retrieve a page of comments for a specific article, oldest first.
 
+        Pass the ``_id`` of the last comment of the previous page as ``after``
+        to fetch the next page.
+        """
         query = {"article_id": ObjectId(article_id)}
-        comments = []
-        async for comment in db["comments"].find(query):
-            # Convert ObjectId to string for relevant fields
-            comment["_id"] = str(comment["_id"])
-            comment["user_id"] = str(comment["user_id"])
-            comment["article_id"] = str(comment["article_id"])
-            # Fetch user info for the comment's user_id
-            user = await db["users"].find_one({"_id": ObjectId(comment["user_id"])})
-            if user:
-                comment["user"] = {
+        if after:
+            query["_id"] = {"$gt": ObjectId(after)}
+
+        comments = await db["comments"].find(query).sort("_id", 1).limit(limit).to_list(length=limit)
+
+        # Fetch all commenters in one round trip instead of one per comment
+        user_ids = list({comment["user_id"] for comment in comments})
+        users = {}
+        if user_ids:
+            async for user in db["users"].find(
+                {"_id": {"$in": user_ids}},
+                {"username": 1, "profile_picture": 1}
+            ):
+                users[user["_id"]] = {
                     "username": user.get("username"),
                     "profile_picture": user.get("profile_picture")
                 }
-            else:
-                comment["user"] = {
-                    "username": "Unknown User",
-                    "profile_picture": None
-                }
-            comments.append(comment)
-        return comments[:100]
+
+        unknown_user = {"username": "Unknown User", "profile_picture": None}
+        for comment in comments:
+            comment["user"] = users.get(comment["user_id"], unknown_user)
+        return comments
 
     @staticmethod
     async def update_comment(comment_id: str, content: str):
         """Update an existing comment."""
-        update_result = await db["comments"].update_one(
+        comment = await db["comments"].find_one_and_update(
             {"_id": ObjectId(comment_id)},
-            {"$set": {"content": content, "updated_at": datetime.now(timezone.utc)}}
+            {"$set": {"content": content, "updated_at": datetime.now(timezone.utc)}},
+            {"article_id": 1}
         )
-        return update_result.modified_count > 0  # True if updated successfully
+        if not comment:
+            return False
+        await ResponseCache.invalidate(ResponseCache.comments_tag(comment["article_id"]))
+        return True
 
     @staticmethod
     async def delete_comment(comment_id: str):
         """Delete a comment from the database."""
-        delete_result = await db["comments"].delete_one({"_id": ObjectId(comment_id)})
-        return delete_result.deleted_count > 0  # True if deleted successfully
+        comment = await db["comments"].find_one_and_delete(
+            {"_id": ObjectId(comment_id)}, {"user_id": 1, "article_id": 1, "created_at": 1}
+        )
+        if not comment:
+            return False
+        await CommentRepository._count_comment(comment, -1)
+        return True
 
     @staticmethod
     async def find_comment_by_id(comment_id: str):
@@ -1,10 +1,47 @@
-from motor.motor_asyncio import AsyncIOMotorClient
 from app.config import config
 
-client = AsyncIOMotorClient(config.MONGO_DB_URL)
-client.admin.command('ping')
-print("Connection successful!")
-db = client["CollaborativeArticles"]
+_client = None
 
+def get_client():
+    """Return the shared Motor client, creating it on first use.
 
+    The client is kept at module level so warm Lambda invocations reuse its
+    connection pool instead of reconnecting.
+    """
+    global _client
+    if _client is None:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        from app.database.monitoring import RequestMetricsListener, profiler
+        listeners = [RequestMetricsListener()] if config.METRICS_ENABLED else []
+        if config.MONGO_PROFILER_ENABLED:
+            listeners.append(profiler)
+        _client = AsyncIOMotorClient(
+            config.MONGO_DB_URL,
+            maxPoolSize=config.MONGO_MAX_POOL_SIZE,
+            minPoolSize=config.MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=config.MONGO_MAX_IDLE_TIME_MS,
+            serverSelectionTimeoutMS=config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            connectTimeoutMS=config.MONGO_CONNECT_TIMEOUT_MS,
+            socketTimeoutMS=config.MONGO_SOCKET_TIMEOUT_MS,
+            event_listeners=listeners,
+        )
+    return _client
 
+def get_database():
+    """Return the application database on the shared client."""
+    return get_client()[config.MONGO_DB_NAME]
+
+async def ping() -> dict:
+    """Round-trip to the server; raises if MongoDB is unreachable."""
+    return await get_client().admin.command("ping")
+
+class LazyDatabase:
+    """Stand-in for the Motor database that only creates the client when a collection is first used."""
+
+    def __getitem__(self, name):
+        return get_database()[name]
+
+    def __getattr__(self, name):
+        return getattr(get_database(), name)
+
+db = LazyDatabase()
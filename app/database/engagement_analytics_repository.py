@@ -1,39 +1,24 @@
 from app.database import db
 from bson import ObjectId
+from app.database.leaderboard_repository import LeaderboardRepository
 
 class EngagementAnalyticsRepository:
     """Handles user engagement analytics queries."""
 
     @staticmethod
-    async def get_most_active_users(limit: int = 5):
+    async def get_most_active_users(limit: int = 5, window: str = "all"):
         """Retrieve the top users based on activity count."""
-        pipeline = [
-            {"$group": {"_id": "$user_id", "activity_count": {"$sum": 1}}},
-            {"$sort": {"activity_count": -1}},
-            {"$limit": limit}
-        ]
-        return await db["user_activity"].aggregate(pipeline).to_list(length=limit)
+        return await LeaderboardRepository.get_leaderboard("most_active_users", window, limit)
 
     @staticmethod
-    async def get_most_viewed_articles(limit: int = 5):
+    async def get_most_viewed_articles(limit: int = 5, window: str = "all"):
         """Retrieve the top viewed articles."""
-        pipeline = [
-            {"$match": {"action": "viewed_article"}},
-            {"$group": {"_id": "$metadata.article_id", "view_count": {"$sum": 1}}},
-            {"$sort": {"view_count": -1}},
-            {"$limit": limit}
-        ]
-        return await db["user_activity"].aggregate(pipeline).to_list(length=limit)
+        return await LeaderboardRepository.get_leaderboard("most_viewed_articles", window, limit)
 
     @staticmethod
-    async def get_most_commented_articles(limit: int = 5):
+    async def get_most_commented_articles(limit: int = 5, window: str = "all"):
         """Retrieve the most commented articles."""
-        pipeline = [
-            {"$group": {"_id": "$article_id", "comment_count": {"$sum": 1}}},
-            {"$sort": {"comment_count": -1}},
-            {"$limit": limit}
-        ]
-        return await db["comments"].aggregate(pipeline).to_list(length=limit)
+        return await LeaderboardRepository.get_leaderboard("most_commented_articles", window, limit)
 
     @staticmethod
     async def get_user_engagement(user_id: str):
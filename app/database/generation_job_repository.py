@@ -0,0 +1,101 @@
+from app.database import db
+from bson import ObjectId
+from datetime import datetime, timedelta, timezone
+from pymongo.errors import DuplicateKeyError
+from app.database.indexes import INDEXES
+
+class GenerationJobRepository:
+    """Handles persistence of background article generation jobs."""
+
+    # Present only on the queued/running job; a unique index on it lets
+    # concurrent generate requests coalesce into a single job.
+    ACTIVE_KEY = "generate_articles"
+    _active_index_ready = False
+
+    @staticmethod
+    async def _ensure_active_index():
+        """Create the unique active_key index (once per process) so coalescing never depends on a deploy step."""
+        if not GenerationJobRepository._active_index_ready:
+            await db["generation_jobs"].create_indexes(
+                [model for model in INDEXES["generation_jobs"] if model.document["name"] == "active_key_unique"]
+            )
+            GenerationJobRepository._active_index_ready = True
+
+    @staticmethod
+    async def create_or_get_active_job(tasks: list, requested_by: str, stale_after_seconds: int, force: bool = False):
+        """Return (job, created): the running job if there is one, otherwise a newly queued job."""
+        await GenerationJobRepository._ensure_active_index()
+        now = datetime.now(timezone.utc)
+        # Release a job whose runner died without finishing it
+        await db["generation_jobs"].update_one(
+            {"active_key": GenerationJobRepository.ACTIVE_KEY, "updated_at": {"$lt": now - timedelta(seconds=stale_after_seconds)}},
+            {"$set": {"status": "abandoned", "updated_at": now}, "$unset": {"active_key": ""}}
+        )
+
+        existing = await db["generation_jobs"].find_one({"active_key": GenerationJobRepository.ACTIVE_KEY})
+        if existing:
+            return existing, False
+
+        job = {
+            "active_key": GenerationJobRepository.ACTIVE_KEY,
+            "status": "queued",
+            "requested_by": ObjectId(requested_by),
+            "force": force,
+            "total": len(tasks),
+            "completed": 0,
+            "generated": 0,
+            "cached": 0,
+            "failed": 0,
+            "subsectors": [
+                {"sector": sector["sector"], "subsector": subsector, "status": "pending"}
+                for sector, subsector in tasks
+            ],
+            "created_at": now,
+            "updated_at": now
+        }
+        try:
+            result = await db["generation_jobs"].insert_one(job)
+        except DuplicateKeyError:
+            # Another request queued a job first; join it
+            return await db["generation_jobs"].find_one({"active_key": GenerationJobRepository.ACTIVE_KEY}), False
+        job["_id"] = result.inserted_id
+        return job, True
+
+    @staticmethod
+    async def find_by_id(job_id: str):
+        """Find a generation job by ID."""
+        return await db["generation_jobs"].find_one({"_id": ObjectId(job_id)})
+
+    @staticmethod
+    async def mark_running(job_id: str):
+        """Flag a job as picked up by a runner."""
+        await db["generation_jobs"].update_one(
+            {"_id": ObjectId(job_id)},
+            {"$set": {"status": "running", "started_at": datetime.now(timezone.utc), "updated_at": datetime.now(timezone.utc)}}
+        )
+
+    @staticmethod
+    async def record_progress(job_id: str, index: int, event: dict):
+        """Store the outcome of one subsector and bump the job counters."""
+        entry = f"subsectors.{index}"
+        update = {f"{entry}.status": event["status"], "updated_at": datetime.now(timezone.utc)}
+        if event["status"] == "done":
+            update[f"{entry}.article_id"] = event["article_id"]
+        elif event["status"] == "failed":
+            update[f"{entry}.error"] = event.get("error")
+        counter = {"done": "generated", "cached": "cached"}.get(event["status"], "failed")
+        await db["generation_jobs"].update_one(
+            {"_id": ObjectId(job_id)},
+            {"$set": update, "$inc": {"completed": 1, counter: 1}}
+        )
+
+    @staticmethod
+    async def finish(job_id: str, status: str, error: str = None):
+        """Close a job and release the active slot so a new job can be queued."""
+        update = {"status": status, "finished_at": datetime.now(timezone.utc), "updated_at": datetime.now(timezone.utc)}
+        if error:
+            update["error"] = error
+        await db["generation_jobs"].update_one(
+            {"_id": ObjectId(job_id)},
+            {"$set": update, "$unset": {"active_key": ""}}
+        )
@@ -0,0 +1,150 @@
+from typing import NamedTuple
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from app.database import db
+
+# Declarative registry of every index the repositories rely on, per collection.
+INDEXES = {
+    "users": [
+        IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+    ],
+    "articles": [
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="feed"),
+        IndexModel([("author_id", ASCENDING)], name="author_id"),
+        IndexModel([("status", ASCENDING)], name="status"),
+    ],
+    "comments": [
+        IndexModel([("article_id", ASCENDING), ("_id", ASCENDING)], name="article_id_id"),
+        IndexModel([("user_id", ASCENDING)], name="user_id"),
+        IndexModel([("status", ASCENDING)], name="status"),
+        IndexModel([("created_at", DESCENDING)], name="created_at"),
+    ],
+    "contributions": [
+        IndexModel([("user_id", ASCENDING)], name="user_id"),
+        IndexModel([("article_id", ASCENDING)], name="article_id"),
+    ],
+    "user_activity": [
+        IndexModel([("user_id", ASCENDING), ("timestamp", DESCENDING)], name="user_id_timestamp"),
+        IndexModel([("timestamp", DESCENDING)], name="timestamp"),
+        IndexModel([("action", ASCENDING), ("timestamp", DESCENDING)], name="action_timestamp"),
+        IndexModel([("metadata.article_id", ASCENDING), ("action", ASCENDING)], name="metadata_article_id_action"),
+        # Only documents written with ACTIVITY_RETENTION_DAYS set carry expires_at
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_ttl"),
+    ],
+    "user_activity_buckets": [
+        IndexModel([("user_id", ASCENDING), ("bucket_start", ASCENDING)], name="user_id_bucket_start"),
+        IndexModel([("last_at", DESCENDING)], name="last_at"),
+        IndexModel([("events.action", ASCENDING), ("last_at", DESCENDING)], name="events_action_last_at"),
+        IndexModel(
+            [("events.metadata.article_id", ASCENDING), ("events.action", ASCENDING)], name="events_metadata_article_id_action"
+        ),
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_ttl"),
+    ],
+    "badges": [
+        IndexModel([("user_id", ASCENDING)], unique=True, name="user_id_unique"),
+    ],
+    "badge_events": [
+        IndexModel([("user_id", ASCENDING), ("awarded_at", DESCENDING)], name="user_id_awarded_at"),
+    ],
+    "generation_jobs": [
+        # At most one queued/running job; concurrent generate requests coalesce on it
+        IndexModel(
+            [("active_key", ASCENDING)], unique=True, name="active_key_unique",
+            partialFilterExpression={"active_key": {"$exists": True}}
+        ),
+    ],
+    "generated_content": [
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_ttl"),
+        IndexModel([("created_at", ASCENDING)], name="created_at"),
+    ],
+}
+
+class QueryShape(NamedTuple):
+    """A repository query described by the fields it filters and sorts on."""
+    name: str
+    collection: str
+    equality: tuple = ()  # fields matched exactly (or with $in)
+    sort: tuple = ()      # sort fields, in order
+    range: tuple = ()     # fields filtered with $lt/$gt
+
+# Every filtered/sorted query issued by the repositories
+QUERY_SHAPES = [
+    QueryShape("UserRepository.find_by_email", "users", equality=("email",)),
+    QueryShape("ArticleRepository.get_all_articles", "articles", sort=("created_at", "_id"), range=("created_at",)),
+    QueryShape("UserCountersRepository.rebuild:articles_written", "articles", equality=("author_id",)),
+    QueryShape("AdminRepository.get_moderation_queue", "articles", equality=("status",)),
+    QueryShape("CommentRepository.get_comments_by_article", "comments", equality=("article_id",), sort=("_id",)),
+    QueryShape("UserCountersRepository.rebuild:comments_made", "comments", equality=("user_id",)),
+    QueryShape("ArticleRepository.delete_article:comments_received", "comments", equality=("article_id",)),
+    QueryShape("AdminRepository.get_flagged_comments", "comments", equality=("status",)),
+    QueryShape("ContributionRepository.get_contributions_by_user", "contributions", equality=("user_id",)),
+    QueryShape("ContributionRepository.get_contributions_by_article", "contributions", equality=("article_id",)),
+    QueryShape("UserActivityRepository.get_user_activity", "user_activity", equality=("user_id",)),
+    QueryShape("UserActivityRepository.get_recent_activity", "user_activity", sort=("timestamp",)),
+    QueryShape("LeaderboardRepository.refresh:most_active_users", "user_activity", range=("timestamp",)),
+    QueryShape("LeaderboardRepository.refresh:most_viewed_articles", "user_activity", equality=("action",), range=("timestamp",)),
+    QueryShape("LeaderboardRepository.refresh:most_commented_articles", "comments", range=("created_at",)),
+    QueryShape("UserCountersRepository.rebuild:articles_viewed", "user_activity", equality=("action",)),
+    QueryShape("ArticleRepository.reconcile_engagement:comments", "comments", equality=("article_id",)),
+    QueryShape("ArticleRepository.reconcile_engagement:views", "user_activity", equality=("metadata.article_id", "action")),
+    QueryShape("BucketActivityStore.append", "user_activity_buckets", equality=("user_id", "bucket_start")),
+    QueryShape("BucketActivityStore.find_by_user", "user_activity_buckets", equality=("user_id",), sort=("bucket_start",)),
+    QueryShape("BucketActivityStore.find_recent", "user_activity_buckets", sort=("last_at",)),
+    QueryShape("BucketActivityStore.pipeline:viewed_article", "user_activity_buckets", equality=("events.action",), range=("last_at",)),
+    QueryShape("BucketActivityStore.pipeline:article_views", "user_activity_buckets",
+               equality=("events.metadata.article_id", "events.action")),
+    QueryShape("BadgeRepository.get_user_badges", "badges", equality=("user_id",)),
+    QueryShape("BadgeRepository.get_badge_events", "badge_events", equality=("user_id",), sort=("awarded_at",)),
+    QueryShape("GenerationJobRepository.create_or_get_active_job", "generation_jobs", equality=("active_key",)),
+    QueryShape("MongoContentCacheBackend.set:trim", "generated_content", sort=("created_at",)),
+]
+
+def is_covered(shape: QueryShape, index_fields: list) -> bool:
+    """True if an index with these key fields can serve the query (equality, then sort, then range)."""
+    if not shape.equality and not shape.sort and not shape.range:
+        return True
+    position = len(shape.equality)
+    if set(index_fields[:position]) != set(shape.equality):
+        return False
+    if shape.sort:
+        if index_fields[position:position + len(shape.sort)] != list(shape.sort):
+            return False
+        position += len(shape.sort)
+    # Range fields may reuse a sort field or follow it directly
+    remaining = set(shape.range) - set(shape.sort)
+    return remaining <= set(index_fields[position:position + len(remaining)])
+
+def uncovered_queries(indexes_by_collection: dict) -> list:
+    """Return the query shapes that none of the given indexes (collection -> list of field lists) serve."""
+    uncovered = []
+    for shape in QUERY_SHAPES:
+        candidates = indexes_by_collection.get(shape.collection, []) + [["_id"]]
+        if not any(is_covered(shape, fields) for fields in candidates):
+            uncovered.append(shape)
+    return uncovered
+
+def declared_index_fields() -> dict:
+    """Key fields of every index in the registry, per collection."""
+    return {
+        collection: [list(model.document["key"].keys()) for model in models]
+        for collection, models in INDEXES.items()
+    }
+
+async def live_index_fields(database=None) -> dict:
+    """Key fields of the indexes that currently exist in the database, per collection."""
+    database = database if database is not None else db
+    fields = {}
+    for collection in {shape.collection for shape in QUERY_SHAPES} | set(INDEXES):
+        info = await database[collection].index_information()
+        fields[collection] = [[key for key, _ in index["key"]] for index in info.values()]
+    return fields
+
+async def ensure_indexes(database=None) -> dict:
+    """Create every registered index (a no-op for ones that already exist). Returns names or errors per collection."""
+    database = database if database is not None else db
+    results = {}
+    for collection, models in INDEXES.items():
+        try:
+            results[collection] = await database[collection].create_indexes(models)
+        except Exception as exc:
+            results[collection] = f"error: {exc}"
+    return results
@@ -0,0 +1,139 @@
+import asyncio
+import logging
+from app.database import db
+from app.database.activity_store import activity_source
+from app.services.response_cache import ResponseCache
+from app.config import config
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+class Leaderboard(NamedTuple):
+    """A top-N ranking rolled up from a source collection."""
+    collection: str    # "user_activity" reads from the configured activity store
+    group_by: str      # field the entries are keyed by
+    count_field: str   # name of the count in each entry
+    time_field: str    # field the time windows filter on
+    match: dict = {}
+
+class LeaderboardRepository:
+    """Top-N leaderboards materialized into the `leaderboards` collection by periodic $merge rollups.
+
+    Each (board, window) pair is one document holding its ranked entries, so reads are a
+    single find_one by _id. Boards are refreshed on a schedule (refresh_all); a read that finds
+    one older than LEADERBOARD_MAX_AGE_SECONDS still serves it and starts a background refresh.
+    Only a board that has never been built is built during the request.
+    """
+
+    BOARDS = {
+        "most_active_users": Leaderboard("user_activity", "user_id", "activity_count", "timestamp"),
+        "most_viewed_articles": Leaderboard(
+            "user_activity", "metadata.article_id", "view_count", "timestamp", {"action": "viewed_article"}
+        ),
+        "most_commented_articles": Leaderboard("comments", "article_id", "comment_count", "created_at"),
+    }
+    WINDOWS = {"all": None, "24h": timedelta(hours=24), "7d": timedelta(days=7), "30d": timedelta(days=30)}
+
+    _refresh_locks = {}          # first builds in progress; concurrent readers wait for them
+    _background_refreshes = {}   # refreshes of stale boards in progress, one per board per process
+
+    @staticmethod
+    def _key(board: str, window: str) -> str:
+        return f"{board}:{window}"
+
+    @staticmethod
+    def _source(spec: Leaderboard, match: dict) -> tuple:
+        """(collection, leading stages) producing the documents a board counts."""
+        if spec.collection == "user_activity":
+            return activity_source(match)
+        return spec.collection, [{"$match": match}]
+
+    @staticmethod
+    def rollup_pipeline(board: str, window: str, now: datetime) -> list:
+        """Aggregation that ranks the window's entries and $merges them into one leaderboards document."""
+        spec = LeaderboardRepository.BOARDS[board]
+        match = dict(spec.match)
+        if LeaderboardRepository.WINDOWS[window]:
+            match[spec.time_field] = {"$gte": now - LeaderboardRepository.WINDOWS[window]}
+        return [
+            *LeaderboardRepository._source(spec, match)[1],
+            {"$group": {"_id": f"${spec.group_by}", spec.count_field: {"$sum": 1}}},
+            {"$sort": {spec.count_field: -1, "_id": 1}},
+            {"$limit": config.LEADERBOARD_SIZE},
+            {"$group": {"_id": LeaderboardRepository._key(board, window), "entries": {"$push": "$$ROOT"}}},
+            {"$set": {"board": board, "window": window, "computed_at": now}},
+            {"$merge": {"into": "leaderboards", "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}},
+        ]
+
+    @staticmethod
+    async def refresh(board: str, window: str):
+        """Recompute one board for one window."""
+        now = datetime.now(timezone.utc)
+        collection, _ = LeaderboardRepository._source(LeaderboardRepository.BOARDS[board], {})
+        await db[collection].aggregate(LeaderboardRepository.rollup_pipeline(board, window, now)).to_list(length=None)
+        # $merge writes nothing for an empty window; record that explicitly (creating the document
+        # if the board has never had entries) so old entries don't linger and reads see it as fresh
+        try:
+            await db["leaderboards"].update_one(
+                {"_id": LeaderboardRepository._key(board, window), "computed_at": {"$lt": now}},
+                {"$set": {"board": board, "window": window, "entries": [], "computed_at": now}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            pass  # $merge (or a concurrent refresh) already wrote a newer document
+        await ResponseCache.invalidate(ResponseCache.LEADERBOARDS)
+
+    @staticmethod
+    async def refresh_all():
+        """Recompute every board for every window; returns the keys refreshed."""
+        refreshed = []
+        for board in LeaderboardRepository.BOARDS:
+            for window in LeaderboardRepository.WINDOWS:
+                await LeaderboardRepository.refresh(board, window)
+                refreshed.append(LeaderboardRepository._key(board, window))
+        return refreshed
+
+    @staticmethod
+    def _is_stale(document: dict) -> bool:
+        if not document:
+            return True
+        computed_at = document["computed_at"]
+        if computed_at.tzinfo is None:
+            computed_at = computed_at.replace(tzinfo=timezone.utc)
+        return datetime.now(timezone.utc) - computed_at > timedelta(seconds=config.LEADERBOARD_MAX_AGE_SECONDS)
+
+    @staticmethod
+    async def get_leaderboard(board: str, window: str = "all", limit: int = 5) -> list:
+        """Return the top `limit` entries of a materialized board, building it first if it has never been built."""
+        key = LeaderboardRepository._key(board, window)
+        document = await db["leaderboards"].find_one({"_id": key})
+        if document is None:
+            lock = LeaderboardRepository._refresh_locks.setdefault(key, asyncio.Lock())
+            async with lock:
+                document = await db["leaderboards"].find_one({"_id": key})
+                if document is None:
+                    await LeaderboardRepository.refresh(board, window)
+                    document = await db["leaderboards"].find_one({"_id": key})
+        elif LeaderboardRepository._is_stale(document):
+            LeaderboardRepository._refresh_in_background(board, window)
+
+        return (document or {}).get("entries", [])[:limit]
+
+    @staticmethod
+    def _refresh_in_background(board: str, window: str):
+        """Start a refresh of a stale board unless this process already has one running."""
+        key = LeaderboardRepository._key(board, window)
+        if key in LeaderboardRepository._background_refreshes:
+            return
+
+        async def refresh():
+            try:
+                await LeaderboardRepository.refresh(board, window)
+            except Exception:
+                logger.warning("Leaderboard refresh failed for %s", key, exc_info=True)
+            finally:
+                LeaderboardRepository._background_refreshes.pop(key, None)
+
+        LeaderboardRepository._background_refreshes[key] = asyncio.create_task(refresh())
@@ -0,0 +1,248 @@
+import logging
+import threading
+from typing import NamedTuple
+from pymongo import monitoring
+from app.config import config
+from app.utils.metrics import record_mongo
+
+class RequestMetricsListener(monitoring.CommandListener):
+    """Attributes every Mongo command's duration to the request that issued it."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        record_mongo(event.duration_micros / 1000)
+
+    def failed(self, event):
+        record_mongo(event.duration_micros / 1000)
+
+logger = logging.getLogger(__name__)
+
+# Driver housekeeping that says nothing about the application's queries
+IGNORED_COMMANDS = {
+    "hello", "ismaster", "isMaster", "ping", "buildInfo", "endSessions", "killCursors",
+    "saslStart", "saslContinue", "explain", "getLastError",
+}
+EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct", "update", "delete", "findAndModify"}
+# Open cursors remembered for getMore attribution; the oldest are forgotten beyond this
+# (cursors abandoned without being exhausted or killed would otherwise accumulate)
+MAX_TRACKED_CURSORS = 10_000
+# Session/topology fields that must not be replayed inside an explain
+_SESSION_FIELDS = {"lsid", "$db", "$clusterTime", "txnNumber", "$readPreference", "autocommit", "startTransaction"}
+
+class QueryShape(NamedTuple):
+    collection: str
+    operation: str
+    filter: tuple
+
+def filter_shape(query: dict) -> tuple:
+    """Reduce a query document to its sorted field names (plus operators), dropping the values."""
+    parts = []
+    for field, value in (query or {}).items():
+        if field in ("$or", "$and", "$nor") and isinstance(value, list):
+            branches = sorted({",".join(filter_shape(branch)) for branch in value})
+            parts.append(f"{field}({'|'.join(branches)})")
+        elif isinstance(value, dict) and value and all(key.startswith("$") for key in value):
+            parts.append(f"{field}:{'/'.join(sorted(value))}")
+        else:
+            parts.append(field)
+    return tuple(sorted(parts))
+
+def command_shape(command_name: str, command: dict) -> QueryShape:
+    """Normalize a command to (collection, operation, filter fields)."""
+    collection = command.get(command_name)
+    operation = command_name
+    query = None
+    if command_name == "find":
+        query = command.get("filter")
+    elif command_name == "aggregate":
+        pipeline = command.get("pipeline") or []
+        if pipeline and "$match" in pipeline[0]:
+            query = pipeline[0]["$match"]
+        operation = f"aggregate[{','.join(next(iter(stage)) for stage in pipeline)}]"
+    elif command_name in ("count", "distinct", "findAndModify"):
+        query = command.get("query")
+    elif command_name == "update" and command.get("updates"):
+        query = command["updates"][0].get("q")
+    elif command_name == "delete" and command.get("deletes"):
+        query = command["deletes"][0].get("q")
+    if not isinstance(collection, str):
+        collection = str(collection)
+    return QueryShape(collection, operation, filter_shape(query))
+
+def docs_returned(command_name: str, reply: dict) -> int:
+    """How many documents a reply carried (or the write count for writes)."""
+    cursor = reply.get("cursor")
+    if cursor:
+        return len(cursor.get("firstBatch") or cursor.get("nextBatch") or [])
+    if command_name == "findAndModify":
+        return 1 if reply.get("value") else 0
+    if command_name == "distinct":
+        return len(reply.get("values") or [])
+    return int(reply.get("n", 0))
+
+def has_collection_scan(explain: dict) -> bool:
+    """Whether any winning plan in an explain output contains a COLLSCAN stage."""
+
+    def walk(node, in_winning_plan):
+        if isinstance(node, dict):
+            if in_winning_plan and node.get("stage") == "COLLSCAN":
+                return True
+            return any(walk(value, in_winning_plan or key == "winningPlan") for key, value in node.items()
+                       if key != "rejectedPlans")
+        if isinstance(node, list):
+            return any(walk(item, in_winning_plan) for item in node)
+        return False
+
+    return walk(explain, False)
+
+class ShapeStats:
+    __slots__ = ("shape", "count", "errors", "total_ms", "max_ms", "docs", "sample", "collection_scan")
+
+    def __init__(self, shape: QueryShape):
+        self.shape = shape
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.docs = 0
+        self.sample = None
+        self.collection_scan = None
+
+    def as_dict(self) -> dict:
+        return {
+            "collection": self.shape.collection,
+            "operation": self.shape.operation,
+            "filter": list(self.shape.filter),
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total_ms, 2),
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "docs": self.docs,
+            "collection_scan": self.collection_scan,
+        }
+
+class QueryProfiler(monitoring.CommandListener):
+    """Aggregates every command by normalized shape; getMore batches count towards the query that opened the cursor."""
+
+    def __init__(self, slow_ms: float = None, max_cursors: int = MAX_TRACKED_CURSORS):
+        self.slow_ms = config.MONGO_SLOW_QUERY_MS if slow_ms is None else slow_ms
+        self.max_cursors = max_cursors
+        self._lock = threading.Lock()
+        self._shapes = {}
+        self._pending = {}
+        self._cursors = {}
+
+    def _stats(self, shape: QueryShape) -> ShapeStats:
+        stats = self._shapes.get(shape)
+        if stats is None:
+            stats = self._shapes[shape] = ShapeStats(shape)
+        return stats
+
+    def started(self, event):
+        if event.command_name == "killCursors":
+            with self._lock:
+                for cursor_id in event.command.get("cursors", []):
+                    self._cursors.pop(cursor_id, None)
+        if event.command_name in IGNORED_COMMANDS:
+            return
+        command = event.command
+        with self._lock:
+            cursor_id = None
+            if event.command_name == "getMore":
+                cursor_id = command.get("getMore")
+                shape = self._cursors.get(cursor_id)
+            else:
+                shape = command_shape(event.command_name, command)
+                stats = self._stats(shape)
+                if stats.sample is None and event.command_name in EXPLAINABLE_COMMANDS:
+                    stats.sample = self._explainable(event.command_name, command)
+            if shape is not None:
+                self._pending[(event.connection_id, event.request_id)] = (shape, event.command_name, cursor_id)
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+    def _finish(self, event, failed: bool):
+        with self._lock:
+            pending = self._pending.pop((event.connection_id, event.request_id), None)
+            if pending is None:
+                return
+            shape, command_name, requested_cursor = pending
+            duration_ms = event.duration_micros / 1000
+            stats = self._stats(shape)
+            if command_name != "getMore":
+                stats.count += 1
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+            if failed:
+                stats.errors += 1
+            else:
+                reply = event.reply or {}
+                stats.docs += docs_returned(command_name, reply)
+                cursor_id = (reply.get("cursor") or {}).get("id")
+                if cursor_id:
+                    self._cursors[cursor_id] = shape
+                    if len(self._cursors) > self.max_cursors:
+                        del self._cursors[next(iter(self._cursors))]
+                elif requested_cursor is not None:
+                    self._cursors.pop(requested_cursor, None)
+        if duration_ms >= self.slow_ms:
+            logger.warning("slow mongo command", extra={"fields": {
+                "collection": shape.collection, "operation": shape.operation,
+                "filter": list(shape.filter), "duration_ms": round(duration_ms, 2),
+            }})
+
+    @staticmethod
+    def _explainable(command_name: str, command: dict) -> dict:
+        sample = {key: value for key, value in command.items() if key not in _SESSION_FIELDS}
+        for batch in ("updates", "deletes"):
+            if batch in sample:
+                sample[batch] = list(sample[batch])[:1]
+        return sample
+
+    async def explain(self, database) -> int:
+        """Run a queryPlanner explain for each shape not yet checked; returns how many were explained."""
+        with self._lock:
+            todo = [stats for stats in self._shapes.values() if stats.sample is not None and stats.collection_scan is None]
+        for stats in todo:
+            try:
+                plan = await database.command({"explain": stats.sample, "verbosity": "queryPlanner"})
+            except Exception as exc:
+                logger.info("explain failed", extra={"fields": {"collection": stats.shape.collection, "error": str(exc)}})
+                continue
+            stats.collection_scan = has_collection_scan(plan)
+        return len(todo)
+
+    def report(self, min_mean_ms: float = 0.0, limit: int = 20) -> list:
+        """Shapes ordered by total time spent, slowest first."""
+        with self._lock:
+            rows = [stats.as_dict() for stats in self._shapes.values()]
+        rows = [row for row in rows if row["mean_ms"] >= min_mean_ms or row["collection_scan"]]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)[:limit]
+
+    def format_report(self, min_mean_ms: float = 0.0, limit: int = 20) -> str:
+        rows = self.report(min_mean_ms, limit)
+        lines = [f"{'total ms':>10} {'mean ms':>9} {'max ms':>9} {'calls':>6} {'docs':>8}  scan  shape"]
+        for row in rows:
+            scan = {True: "COLL", False: "idx", None: "?"}[row["collection_scan"]]
+            lines.append(
+                f"{row['total_ms']:>10.1f} {row['mean_ms']:>9.2f} {row['max_ms']:>9.2f} {row['count']:>6} {row['docs']:>8}  "
+                f"{scan:<4}  {row['collection']}.{row['operation']} {{{', '.join(row['filter'])}}}"
+            )
+        if not rows:
+            lines.append("(no commands recorded)")
+        return "\n".join(lines)
+
+    def reset(self):
+        with self._lock:
+            self._shapes.clear()
+            self._pending.clear()
+            self._cursors.clear()
+
+profiler = QueryProfiler()
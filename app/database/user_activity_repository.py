@@ -1,4 +1,6 @@
-from app.database import db
+from app.database.activity_store import get_activity_store
+from app.database.article_repository import ArticleRepository
+from app.database.user_counters_repository import UserCountersRepository
 from bson import ObjectId
 from datetime import datetime, timezone
 
@@ -6,23 +8,52 @@ class UserActivityRepository:
     """Handles all database operations related to user activity logging."""
 
     @staticmethod
-    async def log_activity(user_id: str, action: str, metadata: dict = None):
-        """Log user activity."""
-        activity_data = {
+    def build_activity(user_id: str, action: str, metadata: dict = None) -> dict:
+        """Build an activity document stamped with the current time."""
+        return {
             "user_id": ObjectId(user_id),
             "action": action,  # Example: "viewed_article", "commented", "liked"
             "metadata": metadata or {},  # Additional details (e.g., article_id)
             "timestamp": datetime.now(timezone.utc)
         }
-        result = await db["user_activity"].insert_one(activity_data)
-        return result.inserted_id
+
+    @staticmethod
+    async def log_activity(user_id: str, action: str, metadata: dict = None):
+        """Log user activity."""
+        activity_data = UserActivityRepository.build_activity(user_id, action, metadata)
+        activity_id = await get_activity_store().insert_one(activity_data)
+        if action == "viewed_article":
+            await UserCountersRepository.increment(activity_data["user_id"], articles_viewed=1)
+            if activity_data["metadata"].get("article_id"):
+                await ArticleRepository.increment_views({str(activity_data["metadata"]["article_id"]): 1})
+        return activity_id
+
+    @staticmethod
+    async def insert_activities(activities: list):
+        """Insert a batch of activity documents; one bad document does not block the rest."""
+        if not activities:
+            return
+        await get_activity_store().insert_many(activities)
+
+        views = {}
+        article_views = {}
+        for activity in activities:
+            if activity["action"] == "viewed_article":
+                views[activity["user_id"]] = views.get(activity["user_id"], 0) + 1
+                article_id = activity.get("metadata", {}).get("article_id")
+                if article_id:
+                    article_views[str(article_id)] = article_views.get(str(article_id), 0) + 1
+        await UserCountersRepository.increment_many(
+            {user_id: {"articles_viewed": count} for user_id, count in views.items()}
+        )
+        await ArticleRepository.increment_views(article_views)
 
     @staticmethod
     async def get_user_activity(user_id: str):
         """Retrieve all activity logs for a specific user."""
-        return await db["user_activity"].find({"user_id": ObjectId(user_id)}).to_list(length=100)
+        return await get_activity_store().find_by_user(ObjectId(user_id), limit=100)
 
     @staticmethod
     async def get_recent_activity(limit: int = 10):
         """Retrieve the most recent activities across all users."""
-        return await db["user_activity"].find().sort("timestamp", -1).limit(limit).to_list(length=limit)
+        return await get_activity_store().find_recent(limit)
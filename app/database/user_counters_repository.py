@@ -0,0 +1,104 @@
+from app.database import db
+from app.database.activity_store import activity_source
+from bson import ObjectId
+from datetime import datetime, timezone
+from pymongo import ReturnDocument, UpdateOne
+
+class UserCountersRepository:
+    """Materialized per-user engagement counters, kept current with atomic $inc from the write paths."""
+
+    COUNTERS = ("articles_written", "comments_made", "articles_viewed", "comments_received")
+
+    @staticmethod
+    async def increment(user_id, **deltas):
+        """Atomically add deltas (e.g. comments_made=1) to a user's counters, creating the document if needed."""
+        deltas = {name: delta for name, delta in deltas.items() if delta}
+        if not user_id or not deltas:
+            return
+        after = await db["user_counters"].find_one_and_update(
+            {"_id": ObjectId(user_id)},
+            {"$inc": deltas, "$set": {"updated_at": datetime.now(timezone.utc)}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        await UserCountersRepository._notify([after], {ObjectId(user_id): deltas})
+
+    @staticmethod
+    async def increment_many(deltas_by_user: dict):
+        """Apply {user_id: {counter: delta}} for many users in one bulk write."""
+        deltas_by_id = {ObjectId(user_id): deltas for user_id, deltas in deltas_by_user.items() if user_id and deltas}
+        if not deltas_by_id:
+            return
+        now = datetime.now(timezone.utc)
+        await db["user_counters"].bulk_write([
+            UpdateOne({"_id": user_id}, {"$inc": deltas, "$set": {"updated_at": now}}, upsert=True)
+            for user_id, deltas in deltas_by_id.items()
+        ], ordered=False)
+
+        # Read back after the batch; a concurrent $inc landing in between can hide a
+        # crossing from this check, which the next crossing or /badges/assign/ repairs.
+        updated = await db["user_counters"].find({"_id": {"$in": list(deltas_by_id)}}).to_list(length=None)
+        await UserCountersRepository._notify(updated, deltas_by_id)
+
+    @staticmethod
+    async def _notify(documents: list, deltas_by_id: dict):
+        """Tell the badge engine about each user's counters before and after the increment."""
+        from app.services.badge_engine import BadgeEngine  # imported lazily: the engine reads these counters
+        for after in documents:
+            deltas = deltas_by_id.get(after["_id"], {})
+            before = {name: after.get(name, 0) - deltas.get(name, 0) for name in UserCountersRepository.COUNTERS}
+            await BadgeEngine.counters_changed(after["_id"], before, after)
+
+    @staticmethod
+    async def get_counters(user_id: str) -> dict:
+        """Return a user's counters, with zeros for anything not yet recorded."""
+        document = await db["user_counters"].find_one({"_id": ObjectId(user_id)}) or {}
+        return {name: document.get(name, 0) for name in UserCountersRepository.COUNTERS}
+
+    @staticmethod
+    async def _count_by(collection: str, group_field: str, stages: list) -> dict:
+        pipeline = [*stages, {"$group": {"_id": f"${group_field}", "count": {"$sum": 1}}}]
+        return {row["_id"]: row["count"] async for row in db[collection].aggregate(pipeline) if row["_id"]}
+
+    @staticmethod
+    async def rebuild(user_id: str = None, batch_size: int = 1000) -> int:
+        """Recompute counters from the source collections (all users, or just one); returns documents written."""
+        author_match = {"author_id": ObjectId(user_id)} if user_id else {"author_id": {"$exists": True}}
+        user_match = {"user_id": ObjectId(user_id)} if user_id else {}
+
+        articles_written = await UserCountersRepository._count_by("articles", "author_id", [{"$match": author_match}])
+        comments_made = await UserCountersRepository._count_by("comments", "user_id", [{"$match": user_match}])
+        view_collection, view_stages = activity_source({"action": "viewed_article", **user_match})
+        articles_viewed = await UserCountersRepository._count_by(view_collection, "user_id", view_stages)
+        comments_received = await UserCountersRepository._count_by(
+            "comments", "article.author_id",
+            [
+                {"$lookup": {"from": "articles", "localField": "article_id", "foreignField": "_id", "as": "article"}},
+                {"$unwind": "$article"},
+                {"$match": {f"article.{key}": value for key, value in author_match.items()}},
+            ]
+        )
+
+        counts = {
+            "articles_written": articles_written,
+            "comments_made": comments_made,
+            "articles_viewed": articles_viewed,
+            "comments_received": comments_received,
+        }
+        user_ids = {ObjectId(user_id)} if user_id else set().union(*counts.values())
+        now = datetime.now(timezone.utc)
+        operations = [
+            UpdateOne(
+                {"_id": uid},
+                {"$set": {**{name: counts[name].get(uid, 0) for name in counts}, "updated_at": now}},
+                upsert=True
+            )
+            for uid in user_ids
+        ]
+        for start in range(0, len(operations), batch_size):
+            await db["user_counters"].bulk_write(operations[start:start + batch_size], ordered=False)
+        if not user_id:
+            # Users with no remaining activity must not keep stale counts; every document written
+            # above (or $inc-ed since) has a newer updated_at, so readers never see a gap
+            await db["user_counters"].delete_many({"updated_at": {"$lt": now}})
+        return len(operations)
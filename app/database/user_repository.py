@@ -1,6 +1,7 @@
 from app.database import db
 from bson import ObjectId
 from datetime import datetime, timezone
+from app.services.user_cache import UserCache
 
 class UserRepository:
     """Handles all user-related database interactions."""
@@ -29,12 +30,14 @@ class UserRepository:
             {"_id": ObjectId(user_id)},
             {"$set": update_data, "$currentDate": {"updated_at": True}}
         )
+        UserCache.invalidate_user(user_id)
         return update_result.modified_count > 0  # Return True if update was successful
 
     @staticmethod
     async def delete_user(user_id: str):
         """Delete a user from the database."""
         delete_result = await db["users"].delete_one({"_id": ObjectId(user_id)})
+        UserCache.invalidate_user(user_id)
         return delete_result.deleted_count > 0  # Return True if deletion was successful
 
     @staticmethod
@@ -44,4 +47,5 @@ class UserRepository:
             {"_id": ObjectId(user_id)},
             {"$set": {"hashed_password": new_hashed_password, "updated_at": datetime.now(timezone.utc)}}
         )
+        UserCache.invalidate_user(user_id)
         return update_result.modified_count > 0
@@ -0,0 +1,65 @@
+from fastapi import HTTPException, Depends, status
+from fastapi.security import OAuth2PasswordBearer
+from app.database.user_repository import UserRepository
+from app.services.auth_service import AuthService
+from app.services.user_cache import UserCache
+from app.roles.role_factory import UserRoleFactory
+from app.secrets_provider import get_secrets_provider
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+
+async def _decode_token(token: str) -> dict:
+    """Decode a JWT, refreshing the signing key off the event loop when its cache is stale."""
+    await get_secrets_provider().ensure_fresh()
+    return AuthService.decode_access_token(token)
+
+async def _load_user(user_email: str):
+    """Return the user for an email, served from the user cache when possible."""
+    user = UserCache.get(user_email)
+    if user is None:
+        user = await UserRepository.find_by_email(user_email)
+        if user:
+            UserCache.set(user_email, user)
+    return user
+
+async def get_current_user(token: str = Depends(oauth2_scheme)):
+    """Retrieve the currently authenticated user from JWT."""
+    try:
+        payload = await _decode_token(token)
+        user_email: str = payload.get("sub")
+        if not user_email:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
+        user = await _load_user(user_email)
+        if not user:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        return user
+    except:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication token")
+
+async def get_current_user_email(token: str = Depends(oauth2_scheme)):
+    """Retrieve the email of the authenticated user from JWT (no DB call)."""
+    try:
+        payload = await _decode_token(token)
+        user_email: str = payload.get("sub")
+        if not user_email:
+            raise HTTPException(status_code=401, detail="Invalid authentication credentials")
+        return user_email
+    except:
+        raise HTTPException(status_code=401, detail="Invalid authentication token")
+
+async def get_current_admin(token: str = Depends(oauth2_scheme)):
+    """Retrieve the currently authenticated admin user from JWT."""
+    try:
+        payload = await _decode_token(token)
+        user_email: str = payload.get("sub")
+        user = await _load_user(user_email)
+        if not user:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+        user_role = UserRoleFactory.get_role(user["role"])
+        if user_role.__class__.__name__ != "Admin":
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access restricted to admins")
+
+        return user
+    except:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication token")
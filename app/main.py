@@ -1,23 +1,42 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers.articles import articles_router
 from app.routers.users import users_router
 from app.routers.contributions import contributions_router
 from app.routers.comments import comments_router
 from app.routers.admin import admin_router
-import os
-import boto3
+from app.routers.engagement_analytics import engagement_analytics_router
+from app.routers.badges import badges_router
+from app.services.password_hasher import PasswordHasherBusyError
+from app.database.indexes import ensure_indexes
+from app.database import ping
+from app.services.activity_buffer import ActivityBuffer
+from app.services.badge_engine import BadgeEngine
+from app.utils.json_response import MongoJSONResponse
+from app.utils.metrics import MetricsMiddleware
+from app.utils.structured_logging import RequestContextMiddleware, configure_logging
+from app.config import config
+from contextlib import asynccontextmanager
+import logging
 
-def get_secret():
-    ssm_client = boto3.client("ssm", region_name="us-east-1")  # Ensure correct region
-    response = ssm_client.get_parameter(Name="/fastapi/jwt_secret_key", WithDecryption=True)
-    return response["Parameter"]["Value"]
+logger = logging.getLogger(__name__)
 
-# Fetch the secret dynamically
-JWT_SECRET_KEY = get_secret()
+# Mangum runs the lifespan on every Lambda invocation; indexes only need creating once per container
+_indexes_ensured = False
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _indexes_ensured
+    if config.ENSURE_INDEXES_ON_STARTUP and not _indexes_ensured:
+        await ensure_indexes()
+        _indexes_ensured = True
+    yield
+    await ActivityBuffer.drain()
+    await BadgeEngine.drain()
 
-app = FastAPI()
+configure_logging()
+app = FastAPI(lifespan=lifespan, default_response_class=MongoJSONResponse)
 # app = FastAPI(
 #     title="Collaborative Articles API",
 #     description="A FastAPI backend for AI-generated and user-contributed articles.",
@@ -40,7 +59,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Request-ID", "ETag", "X-Cache"],
 )
+if config.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+# Outermost, so the access log timing covers every other middleware
+app.add_middleware(RequestContextMiddleware)
+
+@app.exception_handler(PasswordHasherBusyError)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusyError):
+    """Shed login/signup load instead of queueing unbounded bcrypt work."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
 
 # Include all routers
 app.include_router(articles_router, prefix="/api/v1/articles", tags=["Articles"])
@@ -48,8 +81,24 @@ app.include_router(users_router, prefix="/api/v1/users", tags=["Users"])
 app.include_router(contributions_router, prefix="/api/v1", tags=["Contributions"])
 app.include_router(comments_router, prefix="/api/v1", tags=["Comments"])
 app.include_router(admin_router, prefix="/api/v1/admin", tags=["Admin"])
+app.include_router(engagement_analytics_router, prefix="/api/v1/analytics", tags=["Engagement Analytics"])
+app.include_router(badges_router, prefix="/api/v1/badges", tags=["Badges"])
 
 @app.get("/")
 async def root():
     return {"message": "Welcome to the Collaborative Articles API"}
 
+@app.get("/health")
+async def health():
+    """Report whether MongoDB is reachable."""
+    try:
+        await ping()
+    except Exception:
+        # The error can name hosts and credentials, so it is logged rather than returned
+        logger.warning("Health check could not reach MongoDB", exc_info=True)
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "unavailable"},
+        )
+    return {"status": "ok", "database": "ok"}
+
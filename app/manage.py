@@ -0,0 +1,166 @@
+"""Management commands.
+
+Usage: python -m app.manage <command>
+"""
+import argparse
+import asyncio
+from app.config import config
+from app.database import db
+from app.database.activity_store import migrate_activity
+from app.database.article_repository import ArticleRepository
+from app.database.indexes import declared_index_fields, ensure_indexes, live_index_fields, uncovered_queries
+from app.database.leaderboard_repository import LeaderboardRepository
+from app.database.user_counters_repository import UserCountersRepository
+
+async def ensure_indexes_command(args):
+    """Create all registered indexes."""
+    for collection, result in (await ensure_indexes()).items():
+        print(f"{collection}: {result}")
+
+async def check_indexes_command(args):
+    """Report repository queries that no index serves."""
+    fields = declared_index_fields() if args.declared else await live_index_fields()
+    uncovered = uncovered_queries(fields)
+    for shape in uncovered:
+        print(f"NOT COVERED  {shape.collection:<18} {shape.name}  "
+              f"equality={list(shape.equality)} sort={list(shape.sort)} range={list(shape.range)}")
+    print(f"{len(uncovered)} uncovered quer{'y' if len(uncovered) == 1 else 'ies'}")
+    return 1 if uncovered else 0
+
+async def rebuild_counters_command(args):
+    """Recompute per-user engagement counters from articles, comments and activity."""
+    written = await UserCountersRepository.rebuild(args.user_id)
+    print(f"Rebuilt counters for {written} user{'' if written == 1 else 's'}")
+
+async def reconcile_articles_command(args):
+    """Repair drift in the comment_count, view_count and last_commented_at stored on articles."""
+    repaired = await ArticleRepository.reconcile_engagement(args.article_id)
+    print(f"Repaired {repaired} article{'' if repaired == 1 else 's'}")
+
+async def normalize_article_dates_command(args):
+    """Convert legacy string or missing article created_at values to dates."""
+    fixed = await ArticleRepository.normalize_created_at()
+    print(f"Fixed created_at on {fixed} article{'' if fixed == 1 else 's'}")
+
+async def refresh_leaderboards_command(args):
+    """Recompute every materialized leaderboard (run on a schedule, e.g. every few minutes)."""
+    for key in await LeaderboardRepository.refresh_all():
+        print(f"refreshed {key}")
+
+async def migrate_activity_command(args):
+    """Copy user activity between per-event documents and hourly/daily buckets."""
+    source = "documents" if args.to == "buckets" else "buckets"
+    copied = await migrate_activity(source, args.to, batch_size=args.batch_size, drop_source=args.drop_source)
+    print(f"Copied {copied} events from {source} to {args.to}; set ACTIVITY_STORAGE_MODE={args.to} to use them")
+
+async def seed_command(args):
+    """Fill the database with deterministic synthetic users, articles, comments, contributions and activity."""
+    from app.seed_data import SeedVolumes, seed_data
+    volumes = SeedVolumes(
+        users=args.users, articles=args.articles, comments=args.comments, contributions=args.contributions,
+        activity=args.activity, description_chars=args.description_chars, days=args.days,
+    )
+    counts = await seed_data(volumes, seed=args.seed, drop=args.drop, batch_size=args.batch_size, hash_pool_size=args.hash_pool)
+    print(f"Seeded {counts}" if counts else "Database already has users or articles; pass --drop to replace them")
+
+async def _read_workload():
+    """Exercise the main read paths once, using whatever article and user exist."""
+    from app.database.article_repository import ArticleRepository
+    from app.database.badge_repository import BadgeRepository
+    from app.database.comment_repository import CommentRepository
+    from app.database.contribution_repository import ContributionRepository
+    from app.database.engagement_analytics_repository import EngagementAnalyticsRepository
+    from app.database.user_activity_repository import UserActivityRepository
+    from app.database.admin_repository import AdminRepository
+
+    articles = await ArticleRepository.get_all_articles(limit=20)
+    user = await db["users"].find_one({}, {"_id": 1})
+    for article in articles[:3]:
+        await ArticleRepository.find_by_id(str(article["_id"]))
+        await CommentRepository.get_comments_by_article(str(article["_id"]))
+        await ContributionRepository.get_contributions_by_article(str(article["_id"]))
+    if user:
+        user_id = str(user["_id"])
+        await BadgeRepository.get_user_badges(user_id)
+        await BadgeRepository.get_badge_events(user_id)
+        await UserCountersRepository.get_counters(user_id)
+        await EngagementAnalyticsRepository.get_user_engagement(user_id)
+        await UserActivityRepository.get_user_activity(user_id)
+        await ContributionRepository.get_contributions_by_user(user_id)
+    await UserActivityRepository.get_recent_activity()
+    await EngagementAnalyticsRepository.get_most_active_users()
+    await EngagementAnalyticsRepository.get_most_viewed_articles()
+    await EngagementAnalyticsRepository.get_most_commented_articles()
+    await AdminRepository.get_moderation_queue()
+    await AdminRepository.get_flagged_comments()
+
+async def profile_queries_command(args):
+    """Run the main read paths against the configured database and print a per-shape query report."""
+    from app.database.monitoring import profiler
+    # The profiler has to be registered before the client is created
+    config.MONGO_PROFILER_ENABLED = True
+    for _ in range(args.repeat):
+        await _read_workload()
+    if args.explain:
+        await profiler.explain(db)
+    print(profiler.format_report(args.min_mean_ms, args.limit))
+    scans = [row for row in profiler.report(limit=10_000) if row["collection_scan"]]
+    if scans:
+        print(f"{len(scans)} shape{'' if len(scans) == 1 else 's'} use a collection scan")
+    return 1 if scans and args.fail_on_scan else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.manage", description="Collaborative Articles management commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("ensure-indexes", help=ensure_indexes_command.__doc__).set_defaults(handler=ensure_indexes_command)
+
+    check = commands.add_parser("check-indexes", help=check_indexes_command.__doc__)
+    check.add_argument("--declared", action="store_true", help="check the index registry instead of the live database")
+    check.set_defaults(handler=check_indexes_command)
+
+    rebuild = commands.add_parser("rebuild-counters", help=rebuild_counters_command.__doc__)
+    rebuild.add_argument("--user-id", help="only rebuild this user's counters")
+    rebuild.set_defaults(handler=rebuild_counters_command)
+
+    reconcile = commands.add_parser("reconcile-articles", help=reconcile_articles_command.__doc__)
+    reconcile.add_argument("--article-id", help="only reconcile this article")
+    reconcile.set_defaults(handler=reconcile_articles_command)
+
+    commands.add_parser("normalize-article-dates", help=normalize_article_dates_command.__doc__).set_defaults(handler=normalize_article_dates_command)
+
+    commands.add_parser("refresh-leaderboards", help=refresh_leaderboards_command.__doc__).set_defaults(handler=refresh_leaderboards_command)
+
+    migrate = commands.add_parser("migrate-activity", help=migrate_activity_command.__doc__)
+    migrate.add_argument("--to", choices=["buckets", "documents"], required=True, help="target storage mode")
+    migrate.add_argument("--batch-size", type=int, default=1000)
+    migrate.add_argument("--drop-source", action="store_true", help="drop the source collection after copying")
+    migrate.set_defaults(handler=migrate_activity_command)
+
+    seed = commands.add_parser("seed", help=seed_command.__doc__)
+    seed.add_argument("--users", type=int, default=2)
+    seed.add_argument("--articles", type=int, default=2)
+    seed.add_argument("--comments", type=int, default=0)
+    seed.add_argument("--contributions", type=int, default=0, help="edits on top of one 'created' contribution per article")
+    seed.add_argument("--activity", type=int, default=0, help="article-view events")
+    seed.add_argument("--description-chars", type=int, default=2000, help="length of each article body")
+    seed.add_argument("--days", type=int, default=30, help="spread created_at/timestamps over this many days")
+    seed.add_argument("--seed", type=int, default=0, help="random seed; the same seed produces the same documents")
+    seed.add_argument("--batch-size", type=int, default=1000, help="documents per insert_many")
+    seed.add_argument("--hash-pool", type=int, default=8, help="distinct bcrypt hashes shared by the seeded users")
+    seed.add_argument("--drop", action="store_true", help="drop the seeded collections first")
+    seed.set_defaults(handler=seed_command)
+
+    profile = commands.add_parser("profile-queries", help=profile_queries_command.__doc__)
+    profile.add_argument("--repeat", type=int, default=3, help="run the workload this many times")
+    profile.add_argument("--explain", action="store_true", help="explain each shape to flag collection scans")
+    profile.add_argument("--min-mean-ms", type=float, default=0.0, help="hide faster shapes (collection scans are always shown)")
+    profile.add_argument("--limit", type=int, default=30)
+    profile.add_argument("--fail-on-scan", action="store_true", help="exit 1 if any shape uses a collection scan")
+    profile.set_defaults(handler=profile_queries_command)
+
+    args = parser.parse_args(argv)
+    return asyncio.run(args.handler(args)) or 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,35 +1,18 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, status
 from app.database.admin_repository import AdminRepository
-from app.database.user_repository import UserRepository
-from app.services.auth_service import AuthService
-from fastapi.security import OAuth2PasswordBearer
-from app.roles.role_factory import UserRoleFactory
+from app.database import db
+from app.database.monitoring import profiler
+from app.dependencies import get_current_admin
+from app.utils.json_response import MongoJSONResponse
+from app.utils.metrics import registry as metrics_registry
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 admin_router = APIRouter()
 
-async def get_current_admin(token: str = Depends(oauth2_scheme)):
-    """Retrieve the currently authenticated admin user from JWT."""
-    try:
-        payload = AuthService.decode_access_token(token)
-        user_email: str = payload.get("sub")
-        user = await UserRepository.find_by_email(user_email)
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-
-        user_role = UserRoleFactory.get_role(user["role"])
-        if user_role.__class__.__name__ != "Admin":
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access restricted to admins")
-
-        return user
-    except:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication token")
-
 @admin_router.get("/moderation-queue/", status_code=status.HTTP_200_OK)
 async def get_pending_articles(current_admin: dict = Depends(get_current_admin)):
     """Retrieve all articles pending admin approval."""
     pending_articles = await AdminRepository.get_moderation_queue()
-    return pending_articles
+    return MongoJSONResponse(pending_articles)
 
 @admin_router.post("/approve-article/{article_id}", status_code=status.HTTP_200_OK)
 async def approve_article(article_id: str, current_admin: dict = Depends(get_current_admin)):
@@ -53,7 +36,7 @@ async def delete_article(article_id: str, current_admin: dict = Depends(get_curr
 async def get_flagged_comments(current_admin: dict = Depends(get_current_admin)):
     """Retrieve flagged comments for review."""
     flagged_comments = await AdminRepository.get_flagged_comments()
-    return flagged_comments
+    return MongoJSONResponse(flagged_comments)
 
 @admin_router.delete("/delete-comment/{comment_id}", status_code=status.HTTP_200_OK)
 async def delete_comment(comment_id: str, current_admin: dict = Depends(get_current_admin)):
@@ -81,3 +64,32 @@ async def restore_user(user_id: str, current_admin: dict = Depends(get_current_a
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Failed to restore user")
 
     return {"message": "User restored successfully"}
+
+@admin_router.get("/metrics/", status_code=status.HTTP_200_OK)
+async def get_metrics(current_admin: dict = Depends(get_current_admin)):
+    """Per-route latency and Mongo/OpenAI usage recorded by this process."""
+    return metrics_registry.snapshot()
+
+@admin_router.delete("/metrics/", status_code=status.HTTP_200_OK)
+async def reset_metrics(current_admin: dict = Depends(get_current_admin)):
+    """Clear this process's metrics."""
+    metrics_registry.reset()
+    return {"message": "Metrics reset"}
+
+@admin_router.get("/query-profile/", status_code=status.HTTP_200_OK)
+async def get_query_profile(
+    explain: bool = Query(False, description="Run a queryPlanner explain for each new shape to flag collection scans"),
+    min_mean_ms: float = Query(0.0, ge=0),
+    limit: int = Query(20, ge=1, le=200),
+    current_admin: dict = Depends(get_current_admin),
+):
+    """Mongo commands recorded by this process (MONGO_PROFILER_ENABLED), grouped by shape."""
+    if explain:
+        await profiler.explain(db)
+    return profiler.report(min_mean_ms, limit)
+
+@admin_router.delete("/query-profile/", status_code=status.HTTP_200_OK)
+async def reset_query_profile(current_admin: dict = Depends(get_current_admin)):
+    """Clear the recorded query shapes."""
+    profiler.reset()
+    return {"message": "Query profile reset"}
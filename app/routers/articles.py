@@ -1,50 +1,45 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, status
+from typing import Optional
+from bson import ObjectId
 from app.database.article_repository import ArticleRepository
 from app.database.comment_repository import CommentRepository
 from app.database.contribution_repository import ContributionRepository
-from app.database.user_activity_repository import UserActivityRepository
+from app.services.activity_buffer import ActivityBuffer
+from app.services.response_cache import ResponseCache
+from app.utils.json_response import MongoJSONResponse
 from app.models.article import Article
-from app.database.user_repository import UserRepository
-from app.services.article_generator_service import ArticleGeneratorService
-from app.services.auth_service import AuthService
-from fastapi.security import OAuth2PasswordBearer
+from app.database.generation_job_repository import GenerationJobRepository
+from app.services.generation_job_service import GenerationJobService, GenerationRunnerUnavailableError
+from app.dependencies import get_current_user
 from app.roles.role_factory import UserRoleFactory
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 articles_router = APIRouter()
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    """Retrieve the currently authenticated user from JWT."""
-    try:
-        payload = AuthService.decode_access_token(token)
-        user_email: str = payload.get("sub")
-        if not user_email:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
-        user = await UserRepository.find_by_email(user_email)
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        return user
-    except:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication token")
-
-async def get_current_user_email(token: str = Depends(oauth2_scheme)):
-    """Retrieve the email of the authenticated user from JWT (no DB call)."""
+@articles_router.get("/", status_code=status.HTTP_200_OK, tags=["Articles"])
+async def get_all_articles(
+    request: Request,
+    limit: int = Query(default=100, ge=1, le=100),
+    after: Optional[str] = None,
+    full: bool = False
+):
+    """Retrieve a page of articles, newest first.
+
+    Article bodies are omitted unless `full=true`. When more articles may follow,
+    the `X-Next-Cursor` response header holds the value to pass as `after`.
+    """
     try:
-        payload = AuthService.decode_access_token(token)
-        user_email: str = payload.get("sub")
-        if not user_email:
-            raise HTTPException(status_code=401, detail="Invalid authentication credentials")
-        return user_email
-    except:
-        raise HTTPException(status_code=401, detail="Invalid authentication token")
+        cursor = ArticleRepository.decode_cursor(after) if after else None
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
 
-@articles_router.get("/", status_code=status.HTTP_200_OK, tags=["Articles"])
-async def get_all_articles():
-    """Retrieve all articles."""
-    articles = await ArticleRepository.get_all_articles()
-    for article in articles:
-        article["_id"] = str(article["_id"])
-    return articles
+    async def load():
+        articles = await ArticleRepository.get_all_articles(limit=limit, after=cursor, full=full)
+        headers = {}
+        if len(articles) == limit:
+            headers["X-Next-Cursor"] = ArticleRepository.encode_cursor(articles[-1])
+        return articles, headers
+
+    return await ResponseCache.respond(request, [ResponseCache.ARTICLES], load)
 
 @articles_router.post("/", status_code=status.HTTP_201_CREATED, tags=["Articles"])
 async def create_article(article: Article, current_user: dict = Depends(get_current_user)):
@@ -55,6 +50,7 @@ async def create_article(article: Article, current_user: dict = Depends(get_curr
 
     article_data = article.model_dump()
     article_data["authors"] = str(current_user["_id"])
+    article_data["author_id"] = ObjectId(current_user["_id"])
     article_id = await ArticleRepository.create_article(article_data)
 
     # Automatically Log Contribution
@@ -73,16 +69,14 @@ async def get_article(article_id: str, current_user: dict = Depends(get_current_
     if not article:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
 
-    article["_id"] = str(article["_id"])
-    
-    # Log user activity
-    await UserActivityRepository.log_activity(
+    # Log user activity (buffered; written in batches off the request path)
+    await ActivityBuffer.log(
         user_id=str(current_user["_id"]),
         action="viewed_article",
         metadata={"article_id": article_id}
     )
 
-    return article
+    return MongoJSONResponse(article)
 
 @articles_router.put("/{article_id}", status_code=status.HTTP_200_OK, tags=["Articles"])
 async def update_article(article_id: str, update_data: dict, current_user: dict = Depends(get_current_user)):
@@ -137,12 +131,41 @@ async def add_comment(article_id: str, content: str, current_user: dict = Depend
 
     return {"id": str(comment_id), "message": "Comment added successfully"}
 
-@articles_router.post("/generate/", status_code=201, tags=["Articles"])
-async def generate_articles(current_user: dict = Depends(get_current_user)):
-    """Generates AI articles (Only Admins)."""
+@articles_router.post("/generate/", status_code=status.HTTP_202_ACCEPTED, tags=["Articles"])
+async def generate_articles(force: bool = False, current_user: dict = Depends(get_current_user)):
+    """Queues AI article generation (Only Admins) and returns the job to poll.
+
+    Subsectors whose prompt is unchanged since an earlier run are skipped (their article
+    already exists) unless `force` is set. A request that joins a job already in progress
+    cannot change its `force` setting; `force_ignored` reports when that happened.
+    """
     user_role = UserRoleFactory.get_role(current_user["role"])
     if not user_role.can_create_articles():
         raise HTTPException(status_code=403, detail="You do not have permission to generate articles")
 
-    response = await ArticleGeneratorService.generate_and_save_articles()
-    return response
+    try:
+        job, created = await GenerationJobService.submit(str(current_user["_id"]), force=force)
+    except GenerationRunnerUnavailableError as exc:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc))
+    return {
+        "job_id": str(job["_id"]),
+        "status": job["status"],
+        "coalesced": not created,
+        "force_ignored": force and not job.get("force", False),
+        "message": "Article generation queued" if created else "Article generation already in progress"
+    }
+
+@articles_router.get("/generate/{job_id}", status_code=status.HTTP_200_OK, tags=["Articles"])
+async def get_generation_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    """Report the status and per-subsector progress of a generation job."""
+    user_role = UserRoleFactory.get_role(current_user["role"])
+    if not user_role.can_create_articles():
+        raise HTTPException(status_code=403, detail="You do not have permission to view generation jobs")
+    if not ObjectId.is_valid(job_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid job ID format")
+
+    job = await GenerationJobRepository.find_by_id(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Generation job not found")
+    job.pop("active_key", None)
+    return MongoJSONResponse(job)
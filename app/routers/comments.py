@@ -1,28 +1,14 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, status
+from bson import ObjectId
+from typing import Optional
 from app.database.comment_repository import CommentRepository
 from app.database.article_repository import ArticleRepository
-from app.database.user_repository import UserRepository
-from app.services.auth_service import AuthService
-from fastapi.security import OAuth2PasswordBearer
+from app.dependencies import get_current_user
+from app.services.response_cache import ResponseCache
 from app.roles.role_factory import UserRoleFactory
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 comments_router = APIRouter()
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    """Retrieve the currently authenticated user from JWT."""
-    try:
-        payload = AuthService.decode_access_token(token)
-        user_email: str = payload.get("sub")
-        if not user_email:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
-        user = await UserRepository.find_by_email(user_email)
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        return user
-    except:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication token")
-
 @comments_router.post("/articles/{article_id}/comment", status_code=status.HTTP_201_CREATED)
 async def add_comment(article_id: str, content: str, current_user: dict = Depends(get_current_user)):
     """Add a comment to an article."""
@@ -38,12 +24,23 @@ async def add_comment(article_id: str, content: str, current_user: dict = Depend
     return {"id": str(comment_id), "message": "Comment added successfully"}
 
 @comments_router.get("/articles/{article_id}/comment", status_code=status.HTTP_200_OK)
-async def get_comments(article_id: str) -> list:
-    """Retrieve all comments for an article."""
-    print("article_id", article_id)
-    comments = await CommentRepository.get_comments_by_article(article_id)
-    print("comments", type(comments))
-    return comments
+async def get_comments(
+    request: Request,
+    article_id: str,
+    limit: int = Query(default=100, ge=1, le=100),
+    after: Optional[str] = None
+):
+    """Retrieve a page of comments for an article (pass the last comment's id as `after` for the next page)."""
+    if after and not ObjectId.is_valid(after):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+
+    if not ObjectId.is_valid(article_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid article ID format")
+
+    async def load():
+        return await CommentRepository.get_comments_by_article(article_id, limit=limit, after=after), {}
+
+    return await ResponseCache.respond(request, [ResponseCache.comments_tag(ObjectId(article_id))], load)
 
 @comments_router.put("/comments/{comment_id}", status_code=status.HTTP_200_OK)
 async def update_comment(comment_id: str, content: str, current_user: dict = Depends(get_current_user)):
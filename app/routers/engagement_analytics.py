@@ -1,48 +1,52 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, status
 from app.database.engagement_analytics_repository import EngagementAnalyticsRepository
-from app.database.user_repository import UserRepository
-from app.services.auth_service import AuthService
-from fastapi.security import OAuth2PasswordBearer
-from roles.role_factory import UserRoleFactory
+from app.roles.role_factory import UserRoleFactory
+from app.dependencies import get_current_user
+from app.config import config
+from app.services.response_cache import ResponseCache
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 engagement_analytics_router = APIRouter()
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    """Retrieve the currently authenticated user from JWT."""
-    try:
-        payload = AuthService.decode_access_token(token)
-        user_email: str = payload.get("sub")
-        if not user_email:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
-        user = await UserRepository.find_by_email(user_email)
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        return user
-    except:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication token")
-
 @engagement_analytics_router.get("/top-users/", status_code=status.HTTP_200_OK)
-async def get_most_active_users(limit: int = 5, current_user: dict = Depends(get_current_user)):
+async def get_most_active_users(
+    request: Request,
+    limit: int = Query(default=5, ge=1, le=config.LEADERBOARD_SIZE),
+    window: str = Query(default="all", pattern="^(all|24h|7d|30d)$"),
+    current_user: dict = Depends(get_current_user)
+):
     """Retrieve the most active users (Admins only)."""
     user_role = UserRoleFactory.get_role(current_user["role"])
     if not user_role.can_manage_users():
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permission to view analytics")
 
-    top_users = await EngagementAnalyticsRepository.get_most_active_users(limit)
-    return top_users
+    async def load():
+        return await EngagementAnalyticsRepository.get_most_active_users(limit, window), {}
+
+    return await ResponseCache.respond(request, [ResponseCache.LEADERBOARDS], load)
 
 @engagement_analytics_router.get("/top-articles/", status_code=status.HTTP_200_OK)
-async def get_most_viewed_articles(limit: int = 5):
+async def get_most_viewed_articles(
+    request: Request,
+    limit: int = Query(default=5, ge=1, le=config.LEADERBOARD_SIZE),
+    window: str = Query(default="all", pattern="^(all|24h|7d|30d)$")
+):
     """Retrieve the most viewed articles."""
-    top_articles = await EngagementAnalyticsRepository.get_most_viewed_articles(limit)
-    return top_articles
+    async def load():
+        return await EngagementAnalyticsRepository.get_most_viewed_articles(limit, window), {}
+
+    return await ResponseCache.respond(request, [ResponseCache.LEADERBOARDS], load)
 
 @engagement_analytics_router.get("/most-commented/", status_code=status.HTTP_200_OK)
-async def get_most_commented_articles(limit: int = 5):
+async def get_most_commented_articles(
+    request: Request,
+    limit: int = Query(default=5, ge=1, le=config.LEADERBOARD_SIZE),
+    window: str = Query(default="all", pattern="^(all|24h|7d|30d)$")
+):
     """Retrieve the most commented articles."""
-    most_commented = await EngagementAnalyticsRepository.get_most_commented_articles(limit)
-    return most_commented
+    async def load():
+        return await EngagementAnalyticsRepository.get_most_commented_articles(limit, window), {}
+
+    return await ResponseCache.respond(request, [ResponseCache.LEADERBOARDS], load)
 
 @engagement_analytics_router.get("/user/{user_id}", status_code=status.HTTP_200_OK)
 async def get_user_engagement(user_id: str):
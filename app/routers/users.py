@@ -1,37 +1,25 @@
 from fastapi import APIRouter, HTTPException, Depends, status
 from app.database.user_repository import UserRepository
 from app.models.user import User
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from fastapi.security import OAuth2PasswordRequestForm
 from app.services.auth_service import AuthService
+from app.services.password_hasher import PasswordHasher
 from pydantic import BaseModel
 from app.roles.role_factory import UserRoleFactory
+from app.dependencies import get_current_user
+from app.secrets_provider import get_secrets_provider
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 users_router = APIRouter()
 
 class ChangePasswordRequest(BaseModel):
     old_password: str
     new_password: str
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    """Retrieve the currently authenticated user from JWT."""
-    try:
-        payload = AuthService.decode_access_token(token)
-        user_email: str = payload.get("sub")
-        if not user_email:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
-        user = await UserRepository.find_by_email(user_email)
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        return user
-    except:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication token")
-
 @users_router.post("/signup/", status_code=status.HTTP_201_CREATED)
 async def signup(user: User):
     """Registers a new user."""
     user_data = user.model_dump()  
-    user_data["hashed_password"] = AuthService.hash_password(user_data.pop("password"))  # Hash password
+    user_data["hashed_password"] = await PasswordHasher.hash_password(user_data.pop("password"))  # Hash password
     
     existing_user = await UserRepository.find_by_email(user_data["email"])
     if existing_user:
@@ -45,9 +33,10 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     """Authenticates a user and returns JWT token."""
     user = await UserRepository.find_by_email(form_data.username)
 
-    if not user or not AuthService.verify_password(form_data.password, user["hashed_password"]):
+    if not user or not await PasswordHasher.verify_password(form_data.password, user["hashed_password"]):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
+    await get_secrets_provider().ensure_fresh()
     access_token = AuthService.create_access_token({"sub": user["email"]})
     
     return {"access_token": access_token, "token_type": "bearer"}
@@ -78,10 +67,10 @@ async def update_profile(update_data: dict, current_user: dict = Depends(get_cur
 @users_router.put("/change-password/", status_code=status.HTTP_200_OK)
 async def change_password(request: ChangePasswordRequest, current_user: dict = Depends(get_current_user)):
     """Change user's password."""
-    if not AuthService.verify_password(request.old_password, current_user["hashed_password"]):
+    if not await PasswordHasher.verify_password(request.old_password, current_user["hashed_password"]):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Old password is incorrect")
 
-    new_hashed_password = AuthService.hash_password(request.new_password)
+    new_hashed_password = await PasswordHasher.hash_password(request.new_password)
     success = await UserRepository.update_password(str(current_user["_id"]), new_hashed_password)
 
     if not success:
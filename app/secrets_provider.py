@@ -0,0 +1,110 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+
+logger = logging.getLogger(__name__)
+
+class SecretsProvider(ABC):
+    """Fetches all parameters in one batch on first use and serves them from memory for a TTL."""
+
+    def __init__(self, ttl: float = 300, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self._values = {}
+        self._fetched_at = None
+
+    @abstractmethod
+    def _fetch_all(self) -> dict:
+        """Return every parameter as a name -> value dict."""
+
+    def is_fresh(self) -> bool:
+        return self._fetched_at is not None and self.clock() - self._fetched_at < self.ttl
+
+    def refresh(self):
+        """Re-fetch all parameters; keeps serving the previous values if a refresh fails."""
+        try:
+            self._values = self._fetch_all()
+        except Exception:
+            if self._fetched_at is None:
+                raise
+            logger.warning("Secrets refresh failed, serving cached values", exc_info=True)
+        self._fetched_at = self.clock()
+
+    def get(self, name: str, default=None):
+        """Return a parameter, fetching the whole batch if the cache is empty or stale."""
+        if not self.is_fresh():
+            self.refresh()
+        return self._values.get(name, default)
+
+    async def ensure_fresh(self):
+        """Refresh the cache off the event loop if it is empty or stale."""
+        if not self.is_fresh():
+            await asyncio.to_thread(self.refresh)
+
+class SSMSecretsProvider(SecretsProvider):
+    """Reads every parameter under an SSM path (e.g. /fastapi/) with GetParametersByPath."""
+
+    def __init__(self, path: str, region: str, ttl: float = 300, client=None, clock=time.monotonic):
+        super().__init__(ttl, clock)
+        self.path = path if path.endswith("/") else path + "/"
+        self.region = region
+        self._client = client
+
+    def _fetch_all(self) -> dict:
+        if self._client is None:
+            import boto3
+            self._client = boto3.client("ssm", region_name=self.region)
+        values = {}
+        paginator = self._client.get_paginator("get_parameters_by_path")
+        for page in paginator.paginate(Path=self.path, Recursive=True, WithDecryption=True):
+            for parameter in page["Parameters"]:
+                values[parameter["Name"][len(self.path):]] = parameter["Value"]
+        return values
+
+class FileSecretsProvider(SecretsProvider):
+    """Reads parameters from a local JSON file of {"name": "value"} for offline runs."""
+
+    def __init__(self, path: str, ttl: float = 300, clock=time.monotonic):
+        super().__init__(ttl, clock)
+        self.path = path
+
+    def _fetch_all(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path) as f:
+            return json.load(f)
+
+class EnvSecretsProvider(SecretsProvider):
+    """Reads parameters from environment variables (jwt_secret_key -> JWT_SECRET_KEY)."""
+
+    def _fetch_all(self) -> dict:
+        return {}
+
+    def get(self, name: str, default=None):
+        return os.getenv(name.upper(), default)
+
+    async def ensure_fresh(self):
+        return
+
+_provider = None
+
+def get_secrets_provider() -> SecretsProvider:
+    """Return the process-wide secrets provider selected by SECRETS_BACKEND."""
+    global _provider
+    if _provider is None:
+        backend = os.getenv("SECRETS_BACKEND") or ("ssm" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "env")
+        ttl = float(os.getenv("SECRETS_TTL_SECONDS", 300))
+        if backend == "ssm":
+            _provider = SSMSecretsProvider(
+                path=os.getenv("SECRETS_SSM_PATH", "/fastapi/"),
+                region=os.getenv("AWS_REGION", "us-east-1"),
+                ttl=ttl,
+            )
+        elif backend == "file":
+            _provider = FileSecretsProvider(os.getenv("SECRETS_FILE", ".secrets.json"), ttl=ttl)
+        else:
+            _provider = EnvSecretsProvider(ttl=ttl)
+    return _provider
@@ -1,47 +1,211 @@
-import motor.motor_asyncio
-from datetime import datetime
-from passlib.context import CryptContext
-from collaborative_articles_backend.app.database import db
-
-
-# Password hashing utility
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-async def seed_data():
-    now = datetime.now().isoformat()
-
-    # Default articles
-    articles = [
-        {
-            "title": "Introduction to AI",
-            "content": "AI is changing the world. Let's dive into its impact.",
-            "tags": ["AI", "Technology"],
-            "created_at": now,
-            "updated_at": now
-        },
-        {
-            "title": "The Rise of Renewable Energy",
-            "content": "Renewable energy sources are key to sustainability.",
-            "tags": ["Energy", "Sustainability"],
-            "created_at": now,
-            "updated_at": now
+"""Seed a database with synthetic users, articles, comments, contributions and activity.
+
+Volumes are configurable so the same data set can back local development (the
+defaults), load tests and production-scale reproductions
+(python -m app.manage seed --users 100000 --articles 1000000 ...).
+
+Documents are generated lazily and written in unordered insert_many batches,
+one writer per collection running concurrently, so memory stays flat however
+many are requested. Content and _ids depend only on the seed: references are
+computed from document indexes rather than looked up, and timestamps are
+offsets from `anchor` (default: now). Every seeded user's password is
+SEED_PASSWORD, hashed once per slot of a small pool; user 0 is an admin.
+"""
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, NamedTuple
+from bson import ObjectId
+from app.database import db
+from app.database.activity_store import get_activity_store
+from app.database.article_repository import ArticleRepository
+from app.database.indexes import ensure_indexes
+from app.database.user_counters_repository import UserCountersRepository
+from app.services.auth_service import AuthService
+from app.services.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+SEED_PASSWORD = "password123"
+SECTORS = ["Technology", "Energy", "Healthcare", "Finance", "Education", "Transport", "Retail", "Media"]
+# Every word is at least four letters, which _text relies on
+WORDS = (
+    "market growth adoption policy research platform customer supply model risk data team "
+    "strategy network cost energy capital design scale regulation talent product service"
+).split()
+SEEDED_COLLECTIONS = [
+    "users", "articles", "comments", "contributions", "user_activity", "user_activity_buckets",
+    "user_counters", "badges", "badge_events", "leaderboards",
+]
+# Fifth byte of generated ObjectIds, so ids never collide across collections
+_KINDS = {"users": 1, "articles": 2, "comments": 3, "contributions": 4, "activity": 5}
+_ID_EPOCH = 1_700_000_000
+
+class SeedVolumes(NamedTuple):
+    users: int = 2
+    articles: int = 2
+    comments: int = 0
+    contributions: int = 0
+    activity: int = 0
+    description_chars: int = 2000
+    days: int = 30
+
+def object_id(kind: str, index: int) -> ObjectId:
+    """Deterministic _id of the index-th generated document of a collection."""
+    return ObjectId(_ID_EPOCH.to_bytes(4, "big") + bytes([_KINDS[kind]]) + index.to_bytes(7, "big"))
+
+def seed_email(index: int) -> str:
+    """Email of the index-th seeded user (index 0 is the admin)."""
+    return "admin@example.com" if index == 0 else f"user{index}@example.com"
+
+def _rng(seed: int, kind: str) -> random.Random:
+    # One independent stream per collection, so concurrent generators stay reproducible
+    return random.Random(f"{seed}:{kind}")
+
+def _text(rng: random.Random, chars: int) -> str:
+    return " ".join(rng.choices(WORDS, k=chars // 5 + 1))[:chars]
+
+def _moment(rng: random.Random, anchor: datetime, days: int) -> datetime:
+    return anchor - timedelta(seconds=rng.randrange(max(1, days * 86400)))
+
+def _username(index: int) -> str:
+    return "admin" if index == 0 else f"user{index}"
+
+async def hash_pool(size: int) -> list:
+    """bcrypt hashes of SEED_PASSWORD with distinct salts, computed in parallel threads."""
+    loop = asyncio.get_running_loop()
+    return list(await asyncio.gather(*[
+        loop.run_in_executor(None, AuthService.hash_password, SEED_PASSWORD) for _ in range(max(1, size))
+    ]))
+
+def generate_users(volumes: SeedVolumes, hashes: list, anchor: datetime) -> Iterator[dict]:
+    for index in range(volumes.users):
+        yield {
+            "_id": object_id("users", index),
+            "username": _username(index),
+            "email": seed_email(index),
+            "hashed_password": hashes[index % len(hashes)],
+            "role": "admin" if index == 0 else "contributor",
+            "status": "active",
+            "created_at": anchor,
+            "updated_at": anchor,
         }
-    ]
-
-    # Default users (hashed passwords)
-    users = [
-        {"username": "admin", "email": "admin@example.com", "hashed_password": pwd_context.hash("adminpass123")},
-        {"username": "john_doe", "email": "john.doe@example.com", "hashed_password": pwd_context.hash("password123")}
-    ]
-
-    # Check if articles already exist
-    existing_articles = await db["articles"].count_documents({})
-    if existing_articles == 0:
-        await db["articles"].insert_many(articles)
-        print("Articles seeded!")
-
-    # Check if users already exist
-    existing_users = await db["users"].count_documents({})
-    if existing_users == 0:
-        await db["users"].insert_many(users)
-        print("Users seeded!")
+
+def generate_articles(volumes: SeedVolumes, seed: int, anchor: datetime, bodies: bool = True) -> Iterator[dict]:
+    rng = _rng(seed, "articles")
+    # Bodies come from their own stream, so skipping them leaves authors and dates unchanged
+    text_rng = _rng(seed, "articles:text")
+    for index in range(volumes.articles):
+        author = rng.randrange(volumes.users)
+        sector = rng.choice(SECTORS)
+        created_at = _moment(rng, anchor, volumes.days)
+        yield {
+            "_id": object_id("articles", index),
+            "title": f"{sector} outlook #{index}",
+            "description": _text(text_rng, volumes.description_chars) if bodies else "",
+            "img": f"https://picsum.photos/seed/{index}/600/400",
+            "tag": [sector, rng.choice(SECTORS)],
+            "authors": [{"name": _username(author), "avatar": f"https://ui-avatars.com/api/?name={_username(author)[:2]}"}],
+            "author_id": object_id("users", author),
+            "status": "approved",
+            "created_at": created_at,
+            "updated_at": created_at,
+            **ArticleRepository.ENGAGEMENT_DEFAULTS,
+        }
+
+def generate_comments(volumes: SeedVolumes, seed: int, anchor: datetime) -> Iterator[dict]:
+    rng = _rng(seed, "comments")
+    for index in range(volumes.comments):
+        created_at = _moment(rng, anchor, volumes.days)
+        yield {
+            "_id": object_id("comments", index),
+            "article_id": object_id("articles", rng.randrange(volumes.articles)),
+            "user_id": object_id("users", rng.randrange(volumes.users)),
+            "content": _text(rng, rng.randint(20, 280)),
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+def generate_contributions(volumes: SeedVolumes, seed: int, anchor: datetime) -> Iterator[dict]:
+    """A "created" contribution per article by its author, then `volumes.contributions` random edits."""
+    rng = _rng(seed, "contributions")
+    # Replaying the article stream (without bodies) recovers each article's author and date
+    for index, article in enumerate(generate_articles(volumes, seed, anchor, bodies=False)):
+        yield {
+            "_id": object_id("contributions", index),
+            "user_id": article["author_id"],
+            "article_id": article["_id"],
+            "action": "created",
+            "timestamp": article["created_at"],
+        }
+    for index in range(volumes.articles, volumes.articles + volumes.contributions):
+        yield {
+            "_id": object_id("contributions", index),
+            "user_id": object_id("users", rng.randrange(volumes.users)),
+            "article_id": object_id("articles", rng.randrange(volumes.articles)),
+            "action": "edited",
+            "timestamp": _moment(rng, anchor, volumes.days),
+        }
+
+def generate_activity(volumes: SeedVolumes, seed: int, anchor: datetime) -> Iterator[dict]:
+    rng = _rng(seed, "activity")
+    for index in range(volumes.activity):
+        yield {
+            "_id": object_id("activity", index),
+            "user_id": object_id("users", rng.randrange(volumes.users)),
+            "action": "viewed_article",
+            "metadata": {"article_id": str(object_id("articles", rng.randrange(volumes.articles)))},
+            "timestamp": _moment(rng, anchor, volumes.days),
+        }
+
+async def insert_stream(name: str, documents: Iterator[dict], batch_size: int, insert=None) -> int:
+    """Write `documents` in unordered batches of `batch_size`; returns how many were written."""
+    insert = insert or (lambda batch: db[name].insert_many(batch, ordered=False))
+    written = 0
+    batch = []
+    for document in documents:
+        batch.append(document)
+        if len(batch) >= batch_size:
+            await insert(batch)
+            written += len(batch)
+            batch = []
+            if written % (batch_size * 100) == 0:
+                logger.info("seeding", extra={"fields": {"collection": name, "written": written}})
+    if batch:
+        await insert(batch)
+        written += len(batch)
+    return written
+
+async def seed_data(volumes: SeedVolumes = SeedVolumes(), seed: int = 0, drop: bool = False,
+                    batch_size: int = 1000, hash_pool_size: int = 8, anchor: datetime = None) -> dict:
+    """Insert the synthetic data set; without `drop`, does nothing if users or articles already exist."""
+    if drop:
+        for name in SEEDED_COLLECTIONS:
+            await db[name].drop()
+        await ensure_indexes()
+    elif await db["users"].count_documents({}, limit=1) or await db["articles"].count_documents({}, limit=1):
+        logger.info("database already seeded; pass drop=True to replace it")
+        return {}
+    if not volumes.users:
+        return {}
+    if not volumes.articles:
+        volumes = volumes._replace(comments=0, contributions=0, activity=0)
+
+    anchor = anchor or datetime.now(timezone.utc)
+    hashes = await hash_pool(min(hash_pool_size, volumes.users))
+    streams = {
+        "users": insert_stream("users", generate_users(volumes, hashes, anchor), batch_size),
+        "articles": insert_stream("articles", generate_articles(volumes, seed, anchor), batch_size),
+        "comments": insert_stream("comments", generate_comments(volumes, seed, anchor), batch_size),
+        "contributions": insert_stream("contributions", generate_contributions(volumes, seed, anchor), batch_size),
+        "activity": insert_stream("activity", generate_activity(volumes, seed, anchor), batch_size,
+                                  insert=get_activity_store().insert_many),
+    }
+    counts = dict(zip(streams, await asyncio.gather(*streams.values())))
+
+    await UserCountersRepository.rebuild()
+    await ArticleRepository.reconcile_engagement()
+    await ResponseCache.invalidate(ResponseCache.ARTICLES, ResponseCache.LEADERBOARDS)
+    logger.info("seeded database", extra={"fields": counts})
+    return counts
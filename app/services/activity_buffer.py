@@ -0,0 +1,36 @@
+from app.config import config
+from app.database.user_activity_repository import UserActivityRepository
+from app.utils.write_buffer import WriteBehindBuffer
+
+class ActivityBuffer:
+    """Write-behind sink for activity logs so request handlers don't wait on the insert."""
+
+    _buffer = WriteBehindBuffer(
+        sink=UserActivityRepository.insert_activities,
+        batch_size=config.ACTIVITY_BUFFER_BATCH_SIZE,
+        flush_interval=config.ACTIVITY_BUFFER_FLUSH_SECONDS,
+        max_size=config.ACTIVITY_BUFFER_MAX_SIZE,
+    )
+
+    @staticmethod
+    async def log(user_id: str, action: str, metadata: dict = None):
+        """Queue an activity; it is written with the next batch."""
+        await ActivityBuffer._buffer.add(UserActivityRepository.build_activity(user_id, action, metadata))
+
+    @staticmethod
+    async def flush():
+        """Write all queued activities now."""
+        await ActivityBuffer._buffer.flush()
+
+    @staticmethod
+    async def drain():
+        """Flush everything, including batches already being written (shutdown / end of invocation)."""
+        await ActivityBuffer._buffer.drain()
+
+    @staticmethod
+    def pending() -> int:
+        return len(ActivityBuffer._buffer)
+
+    @staticmethod
+    def stats() -> dict:
+        return ActivityBuffer._buffer.stats()
@@ -1,32 +1,108 @@
-from app.services.openai_service import generate_article
+import asyncio
+import inspect
+import random
+from app.services.content_cache import GeneratedContentCache
+from app.services.openai_service import MODEL, complete_article, content_key, build_prompt, estimate_tokens
 from app.database.article_repository import ArticleRepository
-from datetime import datetime, timezone
+from app.utils.rate_limiter import AsyncRateLimiter
 from app.config import config
 
+def build_article_data(sector: dict, subsector: str, content: str) -> dict:
+    """Turns generated markdown into an article document."""
+    return {
+        "title": content.split("\n\n")[0].strip("*"),
+        "description": "\n\n".join(content.split("\n\n")[1:]),
+        "tags": [sector["sector"], subsector] + sector["keywords"],
+        "img": f"https://picsum.photos/800/450?{sector['sector']}",
+        "authors": ['AI'],
+    }
+
+class ArticleGenerationPipeline:
+    """Generates articles concurrently under rate limits and saves each one as soon as it is ready.
+
+    `generator(sector, subsector)` returns article text and `save(article_data)` persists it;
+    both default to the OpenAI service and ArticleRepository but can be swapped for fakes.
+    Prompts found in `cache` (the generated-content cache for the default generator) were
+    already saved by an earlier run, so they are skipped without spending rate-limit tokens;
+    content is cached only once its article is saved. `force` regenerates them anyway.
+    """
+
+    def __init__(self, generator=None, save=None, concurrency: int = None, rate_limiter: AsyncRateLimiter = None,
+                 max_retries: int = None, backoff_base: float = 1.0, on_progress=None, force: bool = False,
+                 cache=None):
+        # Cache keys are OpenAI prompts, so by default only the OpenAI generator is cached
+        self.cache = cache if cache is not None or generator else GeneratedContentCache
+        self.generator = generator or complete_article
+        self.save = save or ArticleRepository.create_article
+        self.force = force
+        self.concurrency = concurrency or config.ARTICLE_GENERATION_CONCURRENCY
+        self.rate_limiter = rate_limiter or AsyncRateLimiter(
+            config.OPENAI_REQUESTS_PER_MINUTE, config.OPENAI_TOKENS_PER_MINUTE
+        )
+        self.max_retries = config.ARTICLE_GENERATION_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = backoff_base
+        self.on_progress = on_progress
+
+    @staticmethod
+    def subsector_tasks(sectors: list = None) -> list:
+        """Returns one (sector, subsector) pair per article to generate."""
+        return [(sector, subsector) for sector in (sectors or config.SECTORS) for subsector in sector["subsectors"]]
+
+    async def _generate_with_retry(self, sector: dict, subsector: str) -> str:
+        """Calls the generator, backing off exponentially (with jitter) on failure."""
+        tokens = estimate_tokens(build_prompt(sector, subsector))
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire(tokens)
+            try:
+                return await self.generator(sector, subsector)
+            except Exception:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff_base * 2 ** attempt
+                await asyncio.sleep(delay + random.uniform(0, delay / 2))
+
+    async def _process(self, semaphore: asyncio.Semaphore, sector: dict, subsector: str, summary: dict):
+        async with semaphore:
+            event = {"sector": sector["sector"], "subsector": subsector}
+            try:
+                cache_key = content_key(sector, subsector) if self.cache else None
+                if cache_key and not self.force and await self.cache.get(cache_key):
+                    event.update(status="cached")
+                    summary["cached"] += 1
+                else:
+                    content = await self._generate_with_retry(sector, subsector)
+                    article_id = await self.save(build_article_data(sector, subsector, content))
+                    if cache_key:
+                        await self.cache.set(cache_key, content, MODEL)
+                    event.update(status="done", article_id=str(article_id))
+                    summary["generated"] += 1
+            except Exception as exc:
+                event.update(status="failed", error=str(exc))
+                summary["failed"].append({"sector": sector["sector"], "subsector": subsector, "error": str(exc)})
+            summary["completed"] += 1
+            event.update(completed=summary["completed"], total=summary["total"])
+            if self.on_progress:
+                result = self.on_progress(event)
+                if inspect.isawaitable(result):
+                    await result
+
+    async def run(self, tasks: list = None) -> dict:
+        """Runs every task and returns a summary of generated and failed articles."""
+        tasks = self.subsector_tasks() if tasks is None else tasks
+        summary = {"total": len(tasks), "completed": 0, "generated": 0, "cached": 0, "failed": []}
+        semaphore = asyncio.Semaphore(self.concurrency)
+        await asyncio.gather(*[self._process(semaphore, sector, subsector, summary) for sector, subsector in tasks])
+        return summary
+
 class ArticleGeneratorService:
     """Handles AI-based article generation and saving to the database."""
 
     @staticmethod
-    async def generate_and_save_articles():
-        """Generates AI-powered articles for different sectors and saves them to the DB."""
-        now = datetime.now(timezone.utc).isoformat()
-        new_articles = []
-
-        for sector in config.SECTORS:
-            for subsector in sector["subsectors"]:
-                content = await generate_article(sector, subsector)
-                print('Generated content: ', content)
-
-                article_data = {
-                    "title": content.split("\n\n")[0].strip("*"),
-                    "description": "\n\n".join(content.split("\n\n")[1:]), 
-                    "tags": [sector["sector"], subsector] + sector["keywords"], 
-                    "img": f"https://picsum.photos/800/450?{sector['sector']}", 
-                    "authors": ['AI'],
-                    "created_at": now,
-                    "updated_at": now
-                }
-                new_articles.append(article_data)
-
-        await ArticleRepository.bulk_insert_articles(new_articles)
-        return {"message": "Articles generated successfully!"}
+    async def generate_and_save_articles(generator=None, on_progress=None, force=False):
+        """Generates AI-powered articles for every subsector and saves them to the DB as they complete."""
+        summary = await ArticleGenerationPipeline(generator=generator, on_progress=on_progress, force=force).run()
+        if summary["failed"]:
+            message = f"Generated {summary['generated']} of {summary['total']} articles"
+        else:
+            message = "Articles generated successfully!"
+        return {"message": message, "generated": summary["generated"], "cached": summary["cached"], "failed": summary["failed"]}
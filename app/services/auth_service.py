@@ -2,14 +2,25 @@ from datetime import datetime, timedelta, timezone
 from passlib.context import CryptContext
 from jose import jwt
 from app.config import config
+from app.utils.ttl_cache import TTLCache
 
 class AuthService:
     """Handles authentication-related logic such as password hashing and JWT management."""
 
     pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-    SECRET_KEY = str(config.JWT_SECRET_KEY)
     ALGORITHM = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES = 30
+    _token_cache = TTLCache(maxsize=config.TOKEN_CACHE_MAX_SIZE, ttl=config.TOKEN_CACHE_TTL_SECONDS)
+    _active_secret = None
+
+    @staticmethod
+    def secret_key() -> str:
+        """Returns the current JWT signing key, dropping cached verifications if it was rotated."""
+        secret = str(config.JWT_SECRET_KEY)
+        if secret != AuthService._active_secret:
+            AuthService._token_cache.clear()
+            AuthService._active_secret = secret
+        return secret
 
     @staticmethod
     def hash_password(password: str) -> str:
@@ -27,9 +38,23 @@ class AuthService:
         to_encode = data.copy()
         expire = datetime.now(timezone.utc) + (expires_delta if expires_delta else timedelta(minutes=AuthService.ACCESS_TOKEN_EXPIRE_MINUTES))
         to_encode.update({"exp": expire})
-        return jwt.encode(to_encode, AuthService.SECRET_KEY, algorithm=AuthService.ALGORITHM)
+        return jwt.encode(to_encode, AuthService.secret_key(), algorithm=AuthService.ALGORITHM)
 
     @staticmethod
     def decode_access_token(token: str) -> dict:
-        """Decodes a JWT token and returns the payload."""
-        return jwt.decode(token, AuthService.SECRET_KEY, algorithms=[AuthService.ALGORITHM])
+        """Decodes a JWT token and returns the payload, reusing earlier verifications until exp."""
+        secret = AuthService.secret_key()
+        payload = AuthService._token_cache.get(token)
+        if payload is None:
+            payload = jwt.decode(token, secret, algorithms=[AuthService.ALGORITHM])
+            ttl = config.TOKEN_CACHE_TTL_SECONDS
+            if "exp" in payload:
+                ttl = min(ttl, payload["exp"] - datetime.now(timezone.utc).timestamp())
+            if ttl > 0:
+                AuthService._token_cache.set(token, payload, ttl=ttl)
+        return dict(payload)
+
+    @staticmethod
+    def token_cache_stats() -> dict:
+        """Returns hit/miss counters of the verified-token cache."""
+        return AuthService._token_cache.stats()
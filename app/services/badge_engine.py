@@ -0,0 +1,60 @@
+import asyncio
+import logging
+from app.config import config
+from app.database.badge_repository import BadgeRepository
+
+logger = logging.getLogger(__name__)
+
+class BadgeEngine:
+    """Evaluates badges off the request path, once per burst of counter changes per user."""
+
+    _scheduled = {}   # user_id -> task waiting out the debounce window
+    _running = set()  # evaluations in progress
+
+    @staticmethod
+    async def counters_changed(user_id, before: dict, after: dict):
+        """Queue a badge evaluation if the change crossed a badge threshold."""
+        if not BadgeRepository.crosses_threshold(before, after):
+            return
+        if config.BADGE_EVALUATION_MODE == "inline":
+            await BadgeEngine._evaluate(str(user_id))
+        else:
+            BadgeEngine.schedule(str(user_id))
+
+    @staticmethod
+    def schedule(user_id: str):
+        """Evaluate the user after the debounce window; later events in the window join this evaluation."""
+        if user_id not in BadgeEngine._scheduled:
+            BadgeEngine._scheduled[user_id] = asyncio.create_task(BadgeEngine._evaluate_later(user_id))
+
+    @staticmethod
+    async def _evaluate_later(user_id: str):
+        await asyncio.sleep(config.BADGE_EVALUATION_DEBOUNCE_SECONDS)
+        BadgeEngine._scheduled.pop(user_id, None)
+        task = asyncio.current_task()
+        BadgeEngine._running.add(task)
+        try:
+            await BadgeEngine._evaluate(user_id)
+        finally:
+            BadgeEngine._running.discard(task)
+
+    @staticmethod
+    async def _evaluate(user_id: str):
+        try:
+            earned = await BadgeRepository.assign_badges(user_id)
+            logger.debug("Evaluated badges for %s: %s", user_id, earned)
+        except Exception:
+            logger.warning("Badge evaluation failed for %s", user_id, exc_info=True)
+
+    @staticmethod
+    def pending() -> int:
+        return len(BadgeEngine._scheduled) + len(BadgeEngine._running)
+
+    @staticmethod
+    async def drain():
+        """Run every scheduled evaluation now and wait for those in progress (shutdown / end of invocation)."""
+        scheduled, BadgeEngine._scheduled = BadgeEngine._scheduled, {}
+        for task in scheduled.values():
+            task.cancel()
+        running = list(BadgeEngine._running)
+        await asyncio.gather(*(BadgeEngine._evaluate(user_id) for user_id in scheduled), *running, return_exceptions=True)
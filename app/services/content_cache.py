@@ -0,0 +1,98 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from app.config import config
+from app.database import db
+
+class MongoContentCacheBackend:
+    """Stores generated content in the generated_content collection (expired via a TTL index)."""
+
+    async def get(self, key: str):
+        doc = await db["generated_content"].find_one(
+            {"_id": key, "expires_at": {"$gt": datetime.now(timezone.utc)}},
+            {"content": 1}
+        )
+        return doc["content"] if doc else None
+
+    async def set(self, key: str, content: str, model: str, ttl: int, max_entries: int):
+        now = datetime.now(timezone.utc)
+        await db["generated_content"].replace_one(
+            {"_id": key},
+            {"model": model, "content": content, "created_at": now, "expires_at": now + timedelta(seconds=ttl)},
+            upsert=True
+        )
+        overflow = await db["generated_content"].estimated_document_count() - max_entries
+        if overflow > 0:
+            oldest = await db["generated_content"].find({}, {"_id": 1}).sort("created_at", 1).limit(overflow).to_list(length=overflow)
+            await db["generated_content"].delete_many({"_id": {"$in": [doc["_id"] for doc in oldest]}})
+
+class DiskContentCacheBackend:
+    """Stores generated content as JSON files in a local directory (useful offline)."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read(self, key: str):
+        try:
+            with open(self._path(key)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry["content"] if entry["expires_at"] > time.time() else None
+
+    def _write(self, key: str, content: str, model: str, ttl: int, max_entries: int):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self._path(key) + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"model": model, "content": content, "expires_at": time.time() + ttl}, f)
+        os.replace(tmp_path, self._path(key))
+
+        entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith(".json")]
+        if len(entries) > max_entries:
+            entries.sort(key=lambda entry: entry.stat().st_mtime)
+            for entry in entries[:len(entries) - max_entries]:
+                os.remove(entry.path)
+
+    async def get(self, key: str):
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, content: str, model: str, ttl: int, max_entries: int):
+        await asyncio.to_thread(self._write, key, content, model, ttl, max_entries)
+
+class GeneratedContentCache:
+    """Content-addressed cache of generated articles keyed by a hash of the model and prompt."""
+
+    _backend = None
+
+    @staticmethod
+    def fingerprint(model: str, prompt: str) -> str:
+        """Returns the cache key for a model/prompt pair."""
+        return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _get_backend():
+        if GeneratedContentCache._backend is None:
+            if config.CONTENT_CACHE_BACKEND == "disk":
+                GeneratedContentCache._backend = DiskContentCacheBackend(config.CONTENT_CACHE_DIR)
+            elif config.CONTENT_CACHE_BACKEND == "mongo":
+                GeneratedContentCache._backend = MongoContentCacheBackend()
+        return GeneratedContentCache._backend
+
+    @staticmethod
+    async def get(key: str):
+        """Returns cached content for a key, or None on a miss or when caching is disabled."""
+        backend = GeneratedContentCache._get_backend()
+        return await backend.get(key) if backend else None
+
+    @staticmethod
+    async def set(key: str, content: str, model: str):
+        """Caches generated content for the configured TTL."""
+        backend = GeneratedContentCache._get_backend()
+        if backend:
+            await backend.set(key, content, model, config.CONTENT_CACHE_TTL_SECONDS, config.CONTENT_CACHE_MAX_ENTRIES)
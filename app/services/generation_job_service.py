@@ -0,0 +1,79 @@
+import asyncio
+import os
+from app.config import config
+from app.database.generation_job_repository import GenerationJobRepository
+from app.services.article_generator_service import ArticleGenerationPipeline
+
+class GenerationRunnerUnavailableError(RuntimeError):
+    """The configured runner cannot execute jobs in this environment."""
+
+class GenerationJobService:
+    """Queues article generation as a background job and runs it on the configured runner."""
+
+    _running_tasks = set()  # Strong references so in-process jobs aren't garbage collected
+
+    @staticmethod
+    async def submit(requested_by: str, force: bool = False):
+        """Queue a generation job, or join the one already in progress. Returns (job, created)."""
+        if config.GENERATION_JOB_RUNNER == "asyncio" and os.getenv("AWS_LAMBDA_FUNCTION_NAME"):
+            raise GenerationRunnerUnavailableError(
+                "GENERATION_JOB_RUNNER=asyncio cannot run jobs on Lambda; use the celery runner"
+            )
+        tasks = ArticleGenerationPipeline.subsector_tasks()
+        job, created = await GenerationJobRepository.create_or_get_active_job(
+            tasks, requested_by, config.GENERATION_JOB_STALE_SECONDS, force=force
+        )
+        if created:
+            try:
+                GenerationJobService._dispatch(str(job["_id"]))
+            except Exception as exc:
+                # Release the active slot, otherwise later requests would join a job nothing runs
+                await GenerationJobRepository.finish(str(job["_id"]), "failed", error=f"Could not dispatch: {exc}")
+                raise GenerationRunnerUnavailableError(f"Could not dispatch the generation job: {exc}") from exc
+        return job, created
+
+    @staticmethod
+    def _dispatch(job_id: str):
+        """Hand the job to Celery or schedule it on the running event loop."""
+        if config.GENERATION_JOB_RUNNER == "celery":
+            from app.tasks.celery_worker import run_generation_job
+            run_generation_job.delay(job_id)
+            return
+        task = asyncio.create_task(GenerationJobService.run_job(job_id))
+        GenerationJobService._running_tasks.add(task)
+        task.add_done_callback(GenerationJobService._running_tasks.discard)
+
+    @staticmethod
+    async def run_job(job_id: str, generator=None):
+        """Generate every subsector of a job, persisting progress as each one completes."""
+        job = await GenerationJobRepository.find_by_id(job_id)
+        if not job or job["status"] not in ("queued", "running"):
+            return
+
+        sectors = {sector["sector"]: sector for sector in config.SECTORS}
+        tasks, positions = [], {}
+        for index, entry in enumerate(job["subsectors"]):
+            if entry["status"] == "pending" and entry["sector"] in sectors:
+                tasks.append((sectors[entry["sector"]], entry["subsector"]))
+                positions[(entry["sector"], entry["subsector"])] = index
+
+        async def on_progress(event):
+            index = positions[(event["sector"], event["subsector"])]
+            await GenerationJobRepository.record_progress(job_id, index, event)
+
+        await GenerationJobRepository.mark_running(job_id)
+        try:
+            summary = await ArticleGenerationPipeline(
+                generator=generator, on_progress=on_progress, force=job.get("force", False)
+            ).run(tasks)
+        except Exception as exc:
+            await GenerationJobRepository.finish(job_id, "failed", error=str(exc))
+            raise
+        status = "completed" if not summary["failed"] else "completed_with_errors"
+        await GenerationJobRepository.finish(job_id, status)
+
+    @staticmethod
+    async def wait_for_local_jobs():
+        """Wait for in-process jobs to finish (used on shutdown and in offline runs)."""
+        if GenerationJobService._running_tasks:
+            await asyncio.gather(*GenerationJobService._running_tasks, return_exceptions=True)
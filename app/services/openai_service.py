@@ -1,14 +1,27 @@
-import openai
 from app.config import config
+from app.services.content_cache import GeneratedContentCache
+from app.utils.metrics import record_openai
 import datetime
+import time
 
-openai.api_key = config.OPENAI_API_KEY
+MODEL = "gpt-4o"
+SYSTEM_PROMPT = "You are a journalist writing insightful news articles."
 
-async def generate_article(sector, subsector, word_count=500, tone="insightful and engaging"):
-    """Generates an AI-written article for a given sector using OpenAI API."""
+_client = None
+
+def get_client():
+    """Returns the shared async OpenAI client, creating it on first use."""
+    global _client
+    if _client is None:
+        import openai  # Deferred: the SDK is slow to import and only generation needs it
+        _client = openai.AsyncOpenAI(api_key=config.OPENAI_API_KEY)
+    return _client
+
+def build_prompt(sector, subsector, word_count=500, tone="insightful and engaging"):
+    """Builds the article prompt for a sector/subsector."""
     current_year = datetime.datetime.now().year
     next_year = current_year + 1
-    prompt = (
+    return (
         f"""
             As a {sector['sector']} journalist, write {word_count}-word article about {subsector}.
             Audience: {sector['audience']}
@@ -24,12 +37,41 @@ async def generate_article(sector, subsector, word_count=500, tone="insightful a
             """
     )
 
-    response = openai.chat.completions.create(
-        messages=[
-            {"role": "system", "content": "You are a journalist writing insightful news articles."},
-            {"role": "user", "content": prompt}
-        ],
-        model="gpt-4o",
-    )
+def estimate_tokens(prompt: str, word_count: int = 500) -> int:
+    """Rough prompt + completion token estimate used for rate limiting."""
+    return len(prompt) // 4 + int(word_count * 1.4)
+
+def content_key(sector, subsector, word_count=500, tone="insightful and engaging") -> str:
+    """Generated-content cache key of the article prompt for a sector/subsector."""
+    return GeneratedContentCache.fingerprint(MODEL, build_prompt(sector, subsector, word_count, tone))
 
+async def complete_article(sector, subsector, word_count=500, tone="insightful and engaging"):
+    """Asks OpenAI for an article, bypassing the generated-content cache."""
+    prompt = build_prompt(sector, subsector, word_count, tone)
+    start = time.perf_counter()
+    try:
+        response = await get_client().chat.completions.create(
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            model=MODEL,
+        )
+    finally:
+        record_openai((time.perf_counter() - start) * 1000)
     return response.choices[0].message.content
+
+async def generate_article(sector, subsector, word_count=500, tone="insightful and engaging", force=False):
+    """Generates an AI-written article for a given sector using OpenAI API.
+
+    Identical prompts are served from the generated-content cache unless `force` is set.
+    """
+    cache_key = content_key(sector, subsector, word_count, tone)
+    if not force:
+        cached = await GeneratedContentCache.get(cache_key)
+        if cached:
+            return cached
+
+    content = await complete_article(sector, subsector, word_count, tone)
+    await GeneratedContentCache.set(cache_key, content, MODEL)
+    return content
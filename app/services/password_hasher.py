@@ -0,0 +1,60 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from app.config import config
+from app.services.auth_service import AuthService
+
+def _hash_password(password: str) -> str:
+    return AuthService.hash_password(password)
+
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    return AuthService.verify_password(plain_password, hashed_password)
+
+class PasswordHasherBusyError(Exception):
+    """Raised when too many password operations are already queued."""
+
+class PasswordHasher:
+    """Runs bcrypt hashing/verification on a bounded worker pool with admission control."""
+
+    _executor = None
+    _pending = 0
+
+    @staticmethod
+    def _get_executor():
+        """Create the worker pool on first use."""
+        if PasswordHasher._executor is None:
+            if config.PASSWORD_HASH_EXECUTOR == "process":
+                PasswordHasher._executor = ProcessPoolExecutor(max_workers=config.PASSWORD_HASH_WORKERS)
+            else:
+                PasswordHasher._executor = ThreadPoolExecutor(
+                    max_workers=config.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt"
+                )
+        return PasswordHasher._executor
+
+    @staticmethod
+    async def _run(fn, *args):
+        """Run fn on the pool, rejecting work once the queue is full."""
+        if PasswordHasher._pending >= config.PASSWORD_HASH_MAX_PENDING:
+            raise PasswordHasherBusyError("Too many password operations in progress")
+        PasswordHasher._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(PasswordHasher._get_executor(), fn, *args)
+        finally:
+            PasswordHasher._pending -= 1
+
+    @staticmethod
+    async def hash_password(password: str) -> str:
+        """Hashes a plaintext password without blocking the event loop."""
+        return await PasswordHasher._run(_hash_password, password)
+
+    @staticmethod
+    async def verify_password(plain_password: str, hashed_password: str) -> bool:
+        """Verifies a password against its hash without blocking the event loop."""
+        return await PasswordHasher._run(_verify_password, plain_password, hashed_password)
+
+    @staticmethod
+    def shutdown():
+        """Stop the worker pool (it is recreated on next use)."""
+        if PasswordHasher._executor is not None:
+            PasswordHasher._executor.shutdown(wait=False)
+            PasswordHasher._executor = None
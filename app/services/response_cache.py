@@ -0,0 +1,160 @@
+import hashlib
+import itertools
+import json
+import logging
+from fastapi import Request, Response, status
+from app.config import config
+from app.utils.json_response import dumps
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+class MemoryResponseCacheBackend:
+    """Per-process LRU of rendered responses plus per-tag generation counters."""
+
+    def __init__(self, maxsize: int, ttl: int):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations = TTLCache(maxsize=maxsize * 4, ttl=ttl)
+        # Generations never repeat, so a forgotten tag can't revive old entries
+        self._counter = itertools.count(1)
+
+    async def generations(self, tags: list) -> list:
+        result = []
+        for tag in tags:
+            generation = self._generations.get(tag)
+            if generation is None:
+                generation = next(self._counter)
+                self._generations.set(tag, generation)
+            result.append(generation)
+        return result
+
+    async def bump(self, tags: list):
+        for tag in tags:
+            self._generations.set(tag, next(self._counter))
+
+    async def get(self, key: str):
+        return self._entries.get(key)
+
+    async def set(self, key: str, entry: dict, ttl: int):
+        self._entries.set(key, entry, ttl)
+
+class RedisResponseCacheBackend:
+    """Shares cached responses and invalidations across processes through Redis."""
+
+    def __init__(self, url: str):
+        import redis.asyncio  # optional dependency, only needed for this backend
+        self._redis = redis.asyncio.from_url(url)
+
+    async def generations(self, tags: list) -> list:
+        values = await self._redis.mget([f"response-cache:tag:{tag}" for tag in tags])
+        return [int(value or 0) for value in values]
+
+    async def bump(self, tags: list):
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.incr(f"response-cache:tag:{tag}")
+            await pipe.execute()
+
+    async def get(self, key: str):
+        value = await self._redis.get(f"response-cache:entry:{key}")
+        return json.loads(value) if value else None
+
+    async def set(self, key: str, entry: dict, ttl: int):
+        await self._redis.set(f"response-cache:entry:{key}", json.dumps(entry), ex=ttl)
+
+class ResponseCache:
+    """Caches rendered JSON responses per route and query, with ETag revalidation and tag-based invalidation.
+
+    Every entry is stored under the current generation of each of its tags
+    (e.g. "articles", "comments:<article_id>"); writes bump those generations,
+    which makes every dependent entry unreachable at once.
+    """
+
+    ARTICLES = "articles"
+    LEADERBOARDS = "leaderboards"
+
+    _backend = None
+
+    @staticmethod
+    def comments_tag(article_id) -> str:
+        return f"comments:{article_id}"
+
+    @staticmethod
+    def badges_tag(user_id) -> str:
+        return f"badges:{user_id}"
+
+    @staticmethod
+    def _get_backend():
+        if ResponseCache._backend is None:
+            if config.RESPONSE_CACHE_BACKEND == "memory":
+                ResponseCache._backend = MemoryResponseCacheBackend(
+                    config.RESPONSE_CACHE_MAX_ENTRIES, config.RESPONSE_CACHE_TTL_SECONDS
+                )
+            elif config.RESPONSE_CACHE_BACKEND == "redis":
+                ResponseCache._backend = RedisResponseCacheBackend(config.RESPONSE_CACHE_REDIS_URL)
+        return ResponseCache._backend
+
+    @staticmethod
+    def key(request: Request, tags: list, generations: list) -> str:
+        """Cache key for a request: route path, sorted query string and tag generations."""
+        query = "&".join(f"{name}={value}" for name, value in sorted(request.query_params.multi_items()))
+        versions = ",".join(f"{tag}@{generation}" for tag, generation in zip(tags, generations))
+        raw = f"{request.method} {request.url.path}?{query}#{versions}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def render(content, headers: dict = None) -> dict:
+        """Render content to a cacheable entry: JSON body, extra headers and a strong ETag."""
+        body = dumps(content).decode("utf-8")
+        etag = '"' + hashlib.sha1(body.encode("utf-8")).hexdigest() + '"'
+        return {"body": body, "headers": headers or {}, "etag": etag}
+
+    @staticmethod
+    def _matches(if_none_match: str, etag: str) -> bool:
+        candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+        return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+    @staticmethod
+    def _response(request: Request, entry: dict, cache_status: str) -> Response:
+        headers = {**entry["headers"], "ETag": entry["etag"], "Cache-Control": "no-cache", "X-Cache": cache_status}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and ResponseCache._matches(if_none_match, entry["etag"]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=entry["body"], media_type="application/json", headers=headers)
+
+    @staticmethod
+    async def respond(request: Request, tags: list, load) -> Response:
+        """Serve the request from the cache, or await `load()` -> (content, headers) and cache the result."""
+        backend = ResponseCache._get_backend()
+        if backend is None:
+            content, headers = await load()
+            return ResponseCache._response(request, ResponseCache.render(content, headers), "BYPASS")
+
+        try:
+            key = ResponseCache.key(request, tags, await backend.generations(tags))
+            entry = await backend.get(key)
+        except Exception:
+            # A cache outage must not take reads down with it
+            logger.warning("Response cache unavailable", exc_info=True)
+            key = entry = None
+        if entry is not None:
+            return ResponseCache._response(request, entry, "HIT")
+
+        content, headers = await load()
+        entry = ResponseCache.render(content, headers)
+        if key is not None:
+            try:
+                await backend.set(key, entry, config.RESPONSE_CACHE_TTL_SECONDS)
+            except Exception:
+                logger.warning("Response cache unavailable", exc_info=True)
+        return ResponseCache._response(request, entry, "MISS")
+
+    @staticmethod
+    async def invalidate(*tags: str):
+        """Drop every cached response depending on any of these tags."""
+        backend = ResponseCache._get_backend()
+        if backend is not None and tags:
+            try:
+                await backend.bump(list(tags))
+            except Exception:
+                logger.warning("Could not invalidate cached responses for %s", tags, exc_info=True)
@@ -0,0 +1,35 @@
+from app.config import config
+from app.utils.ttl_cache import TTLCache
+
+class UserCache:
+    """In-process cache of authenticated user documents keyed by JWT subject (email)."""
+
+    _cache = TTLCache(maxsize=config.USER_CACHE_MAX_SIZE, ttl=config.USER_CACHE_TTL_SECONDS)
+
+    @staticmethod
+    def get(email: str):
+        """Return a copy of the cached user document, or None."""
+        user = UserCache._cache.get(email)
+        return dict(user) if user is not None else None
+
+    @staticmethod
+    def set(email: str, user: dict):
+        """Cache a user document for the configured TTL."""
+        UserCache._cache.set(email, dict(user))
+
+    @staticmethod
+    def invalidate_email(email: str):
+        """Drop the cached document for an email."""
+        UserCache._cache.pop(email)
+
+    @staticmethod
+    def invalidate_user(user_id: str):
+        """Drop every cached document belonging to a user ID."""
+        for email, user in UserCache._cache.items():
+            if str(user.get("_id")) == str(user_id):
+                UserCache._cache.pop(email)
+
+    @staticmethod
+    def clear():
+        """Drop all cached users."""
+        UserCache._cache.clear()
@@ -1,27 +1,61 @@
 import os
+import asyncio
+import logging
 import openai
 from celery import Celery
-from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
 from datetime import datetime, timezone
-# from database import db
+from app.config import config
+from app.database import db
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Celery Configuration
-CELERY_BROKER_URL = "redis://localhost:6379/0"
+CELERY_BROKER_URL = config.CELERY_BROKER_URL
 celery = Celery("tasks", broker=CELERY_BROKER_URL)
+# Run with `celery -A app.tasks.celery_worker beat` (Lambda deployments use the EventBridge schedule instead)
+celery.conf.beat_schedule = {
+    "refresh-leaderboards": {
+        "task": "app.tasks.celery_worker.refresh_leaderboards",
+        "schedule": config.LEADERBOARD_MAX_AGE_SECONDS,
+    },
+}
 
 # OpenAI API Key
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
-# # MongoDB Connection
-MONGO_DB_URL = os.getenv("MONGODB_URL")
-client = AsyncIOMotorClient(MONGO_DB_URL)
-db = client["CollaborativeArticles"]
-
 SECTORS = ["Tech", "Health", "Corporate", "Politics", "Youth", "Lifestyle"]
 
+# One long-lived loop per worker process: the Motor client binds to the first
+# loop it is used on, so tasks must not each create a fresh loop.
+_loop = asyncio.new_event_loop()
+
+@celery.task
+def run_generation_job(job_id: str):
+    """
+    Runs a queued article generation job (see GenerationJobService).
+    """
+    from app.services.generation_job_service import GenerationJobService
+    _loop.run_until_complete(GenerationJobService.run_job(job_id))
+
+@celery.task
+def refresh_leaderboards():
+    """
+    Recomputes the materialized engagement leaderboards (schedule with celery beat).
+    """
+    from app.database.leaderboard_repository import LeaderboardRepository
+    _loop.run_until_complete(LeaderboardRepository.refresh_all())
+
+@celery.task
+def reconcile_article_engagement():
+    """
+    Repairs drift in the comment/view counts stored on articles (schedule with celery beat).
+    """
+    from app.database.article_repository import ArticleRepository
+    _loop.run_until_complete(ArticleRepository.reconcile_engagement())
+
 @celery.task
 async def generate_daily_articles():
     """
@@ -52,8 +86,8 @@ async def generate_daily_articles():
             }
 
             await db["articles"].insert_one(article_data)
-            print(f"Generated article for {sector}")
+            logger.info("Generated article for %s", sector)
 
         except Exception as e:
-            print(f"Error generating article for {sector}: {e}")
+            logger.error("Error generating article for %s: %s", sector, e)
 
@@ -0,0 +1,26 @@
+import orjson
+from bson import Decimal128, ObjectId
+from fastapi.responses import JSONResponse
+
+def _default(obj):
+    """Encode the BSON types orjson doesn't know; datetimes and nested dicts/lists are native."""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, Decimal128):
+        return str(obj.to_decimal())
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(content) -> bytes:
+    """Serialize Mongo documents (ObjectId, datetime, nested docs) to JSON bytes in one pass."""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+class MongoJSONResponse(JSONResponse):
+    """JSON response that renders raw Mongo documents with orjson.
+
+    Return it directly from an endpoint to skip FastAPI's jsonable_encoder pass.
+    """
+
+    def render(self, content) -> bytes:
+        return dumps(content)
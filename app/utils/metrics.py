@@ -0,0 +1,176 @@
+import bisect
+import random
+import threading
+import time
+from contextvars import ContextVar
+from app.config import config
+
+LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+CALL_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+class Histogram:
+    """Fixed-bucket histogram; quantiles are estimated as the upper bound of the bucket they fall in."""
+
+    def __init__(self, bounds: tuple = LATENCY_BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(self.bounds[index], self.max) if index < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 2) if self.count else 0.0,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": round(self.max, 2),
+            "buckets": {f"le_{bound}": count for bound, count in zip(self.bounds, self.counts)} | {"inf": self.counts[-1]},
+        }
+
+class RequestMetrics:
+    """Work done on behalf of one request."""
+
+    __slots__ = ("mongo_calls", "mongo_ms", "openai_calls", "openai_ms")
+
+    def __init__(self):
+        self.mongo_calls = 0
+        self.mongo_ms = 0.0
+        self.openai_calls = 0
+        self.openai_ms = 0.0
+
+# Set for sampled requests only; Motor copies the context into its executor threads,
+# so command listeners running there still see the request that issued the command.
+current_request_metrics: ContextVar = ContextVar("request_metrics", default=None)
+
+class RouteMetrics:
+    def __init__(self):
+        self.errors = 0
+        self.latency_ms = Histogram()
+        self.mongo_calls = Histogram(CALL_COUNT_BUCKETS)
+        self.mongo_ms = Histogram()
+        self.openai_calls = 0
+        self.openai_ms = 0.0
+
+class MetricsRegistry:
+    """Per-process aggregates keyed by "METHOD /route/template"."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+        self._openai_ms = Histogram()
+        self._started_at = time.time()
+
+    def record_request(self, route: str, status_code: int, duration_ms: float, work: RequestMetrics):
+        with self._lock:
+            metrics = self._routes.get(route)
+            if metrics is None:
+                metrics = self._routes[route] = RouteMetrics()
+            metrics.latency_ms.observe(duration_ms)
+            metrics.mongo_calls.observe(work.mongo_calls)
+            metrics.mongo_ms.observe(work.mongo_ms)
+            metrics.openai_calls += work.openai_calls
+            metrics.openai_ms += work.openai_ms
+            if status_code >= 500:
+                metrics.errors += 1
+
+    def record_openai(self, duration_ms: float):
+        with self._lock:
+            self._openai_ms.observe(duration_ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "since": self._started_at,
+                "sample_rate": config.METRICS_SAMPLE_RATE,
+                "routes": {
+                    route: {
+                        "requests": metrics.latency_ms.count,
+                        "errors": metrics.errors,
+                        "latency_ms": metrics.latency_ms.snapshot(),
+                        "mongo_calls_per_request": metrics.mongo_calls.snapshot(),
+                        "mongo_ms_per_request": metrics.mongo_ms.snapshot(),
+                        "openai_calls": metrics.openai_calls,
+                        "openai_ms": round(metrics.openai_ms, 2),
+                    }
+                    for route, metrics in sorted(self._routes.items())
+                },
+                "openai_ms": self._openai_ms.snapshot(),
+            }
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+            self._openai_ms = Histogram()
+            self._started_at = time.time()
+
+registry = MetricsRegistry()
+
+def record_mongo(duration_ms: float):
+    """Count a Mongo command against the current sampled request, if any."""
+    work = current_request_metrics.get()
+    if work is not None:
+        work.mongo_calls += 1
+        work.mongo_ms += duration_ms
+
+def record_openai(duration_ms: float):
+    """Record an OpenAI call (always aggregated; also attributed to the current request)."""
+    registry.record_openai(duration_ms)
+    work = current_request_metrics.get()
+    if work is not None:
+        work.openai_calls += 1
+        work.openai_ms += duration_ms
+
+class MetricsMiddleware:
+    """ASGI middleware that records per-route latency and per-request Mongo/OpenAI work for sampled requests,
+    and reports it in a Server-Timing header."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or random.random() >= config.METRICS_SAMPLE_RATE:
+            return await self.app(scope, receive, send)
+
+        work = RequestMetrics()
+        token = current_request_metrics.set(work)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                timing = f'app;dur={elapsed_ms:.1f}, mongo;dur={work.mongo_ms:.1f};desc="{work.mongo_calls} calls"'
+                if work.openai_calls:
+                    timing += f', openai;dur={work.openai_ms:.1f};desc="{work.openai_calls} calls"'
+                message["headers"] = [*message.get("headers", []), (b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request_metrics.reset(token)
+            # FastAPI records the matched route in the scope; all 404s share the "<unmatched>" label
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "<unmatched>"
+            registry.record_request(f"{scope['method']} {path}", status_code, (time.perf_counter() - start) * 1000, work)
@@ -0,0 +1,47 @@
+import asyncio
+import time
+
+class AsyncRateLimiter:
+    """Token-bucket limiter for requests per minute and (optionally) tokens per minute."""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float = None, clock=time.monotonic):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.clock = clock
+        self._request_allowance = float(requests_per_minute)
+        self._token_allowance = float(tokens_per_minute or 0)
+        self._updated_at = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        elapsed_minutes = (now - self._updated_at) / 60
+        self._updated_at = now
+        self._request_allowance = min(
+            self.requests_per_minute, self._request_allowance + elapsed_minutes * self.requests_per_minute
+        )
+        if self.tokens_per_minute:
+            self._token_allowance = min(
+                self.tokens_per_minute, self._token_allowance + elapsed_minutes * self.tokens_per_minute
+            )
+
+    def _wait_seconds(self, tokens: int) -> float:
+        """Seconds until one request (and `tokens` tokens) can be admitted."""
+        waits = [(1 - self._request_allowance) / self.requests_per_minute * 60]
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)
+            waits.append((tokens - self._token_allowance) / self.tokens_per_minute * 60)
+        return max(waits)
+
+    async def acquire(self, tokens: int = 0):
+        """Wait until a request using `tokens` tokens fits within both budgets."""
+        async with self._lock:
+            while True:
+                self._refill()
+                wait = self._wait_seconds(tokens)
+                if wait <= 0:
+                    self._request_allowance -= 1
+                    if self.tokens_per_minute:
+                        self._token_allowance -= min(tokens, self.tokens_per_minute)
+                    return
+                await asyncio.sleep(wait)
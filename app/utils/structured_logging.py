@@ -0,0 +1,116 @@
+import json
+import logging
+import random
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from app.config import config
+
+request_id_var: ContextVar = ContextVar("request_id", default=None)
+route_var: ContextVar = ContextVar("route", default=None)
+sampled_var: ContextVar = ContextVar("log_sampled", default=True)
+
+logger = logging.getLogger("app.access")
+
+class JsonFormatter(logging.Formatter):
+    """Renders records as one JSON object per line with the request correlation fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),  # %-args are only interpolated for emitted records
+            "request_id": request_id_var.get(),
+            "route": route_var.get(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class SamplingFilter(logging.Filter):
+    """Drops INFO/DEBUG records of requests that were not sampled, unless logged with extra={"sample_exempt": True}."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or getattr(record, "sample_exempt", False) or sampled_var.get()
+
+def parse_sample_rates(spec: str) -> list:
+    """Parse "GET /api/v1/articles/=0.1,POST /api/v1/users/login/=1" into (method, prefix, rate) rules."""
+    rules = []
+    for rule in filter(None, (part.strip() for part in spec.split(","))):
+        route, rate = rule.rsplit("=", 1)
+        method, _, prefix = route.strip().partition(" ")
+        rules.append((method.upper(), prefix.strip(), float(rate)))
+    # Longest prefix first so the most specific rule wins
+    return sorted(rules, key=lambda rule: -len(rule[1]))
+
+_sample_rules = parse_sample_rates(config.LOG_SAMPLE_RATES)
+
+def sample_rate_for(method: str, path: str) -> float:
+    """Return the sampling rate configured for a request."""
+    for rule_method, prefix, rate in _sample_rules:
+        if rule_method in (method, "*") and path.startswith(prefix):
+            return rate
+    return config.LOG_SAMPLE_RATE
+
+def configure_logging():
+    """Install the JSON handler on the root logger (idempotent)."""
+    root = logging.getLogger()
+    if any(isinstance(handler.formatter, JsonFormatter) for handler in root.handlers):
+        return
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter())
+    handler.addFilter(SamplingFilter())
+    # Lambda pre-installs a plain handler; replace it so lines stay JSON
+    root.handlers = [handler]
+    root.setLevel(config.LOG_LEVEL)
+    # Mangum writes its own per-request line; the access log already covers it
+    logging.getLogger("mangum.http").setLevel(logging.WARNING)
+
+class RequestContextMiddleware:
+    """ASGI middleware that assigns a request id, decides log sampling and writes one access log line."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope.get("headers") or [])
+        lambda_context = scope.get("aws.context")
+        request_id = (
+            headers.get(b"x-request-id", b"").decode()
+            or getattr(lambda_context, "aws_request_id", None)
+            or uuid.uuid4().hex
+        )
+        method, path = scope["method"], scope["path"]
+        tokens = (
+            request_id_var.set(request_id),
+            route_var.set(f"{method} {path}"),
+            sampled_var.set(random.random() < sample_rate_for(method, path)),
+        )
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", []), (b"x-request-id", request_id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            logger.info(
+                "%s %s %s", method, path, status_code,
+                extra={"fields": {"status": status_code, "duration_ms": round((time.perf_counter() - start) * 1000, 2)}}
+            )
+            for var, token in zip((request_id_var, route_var, sampled_var), tokens):
+                var.reset(token)
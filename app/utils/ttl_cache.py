@@ -0,0 +1,63 @@
+import time
+from collections import OrderedDict
+
+class TTLCache:
+    """Bounded in-process LRU cache whose entries expire after a time-to-live."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0, timer=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()  # key -> (expires_at, value)
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= self.timer():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, ttl: float = None):
+        """Store a value, evicting the least recently used entry when full."""
+        if self.maxsize <= 0:
+            return
+        expires_at = self.timer() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """Remove key from the cache and return its value."""
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def items(self) -> list:
+        """Return a snapshot of the live (key, value) pairs."""
+        now = self.timer()
+        return [(key, value) for key, (expires_at, value) in self._data.items() if expires_at > now]
+
+    def clear(self):
+        """Drop every entry (counters are kept)."""
+        self._data.clear()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the current size."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "maxsize": self.maxsize}
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        entry = self._data.get(key)
+        return entry is not None and entry[0] > self.timer()
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+class WriteBehindBuffer:
+    """Collects items in memory and hands them to an async sink in batches.
+
+    A flush is triggered when `batch_size` items are pending or `flush_interval`
+    seconds after the first unflushed item. Once `max_size` items are pending,
+    `add` waits for a flush instead of growing the buffer further.
+    """
+
+    def __init__(self, sink, batch_size: int = 100, flush_interval: float = 1.0, max_size: int = 5000):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_size = max(max_size, batch_size)
+        self._items = []
+        self._lock = None
+        self._timer = None
+        self._tasks = set()
+        self._flushed = 0
+        self._dropped = 0
+
+    def _get_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        self._timer = None
+        await self.flush()
+
+    async def add(self, item):
+        """Queue an item; only blocks when the buffer is full."""
+        if len(self._items) >= self.max_size:
+            await self.flush()
+        self._items.append(item)
+        if len(self._items) >= self.batch_size:
+            self._spawn(self.flush())
+        elif self._timer is None or self._timer.done():
+            self._timer = self._spawn(self._flush_later())
+
+    async def flush(self):
+        """Write every pending item to the sink in batches of `batch_size`."""
+        async with self._get_lock():
+            while self._items:
+                batch = self._items[:self.batch_size]
+                del self._items[:self.batch_size]
+                try:
+                    await self.sink(batch)
+                    self._flushed += len(batch)
+                except Exception:
+                    self._dropped += len(batch)
+                    logger.warning("Dropped %d buffered items after a failed flush", len(batch), exc_info=True)
+
+    async def drain(self):
+        """Cancel the pending timer, wait for in-flight flushes and write everything left."""
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+        self._timer = None
+        pending = [task for task in self._tasks if not task.done()]
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {"pending": len(self._items), "flushed": self._flushed, "dropped": self._dropped}
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -0,0 +1,65 @@
+"""Benchmark the article generation pipeline offline with a fake generator.
+
+The fake generator sleeps for a random "model latency" and occasionally
+fails, and articles are saved to an in-memory list, so no OpenAI key or
+database is needed.
+
+Usage: python -m benchmarks.bench_article_generation [--latency-ms MS] [--failure-rate R]
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from app.services.article_generator_service import ArticleGenerationPipeline
+from app.utils.rate_limiter import AsyncRateLimiter
+
+
+def fake_generator(latency_ms: float, failure_rate: float, rng: random.Random):
+    async def generate(sector, subsector):
+        await asyncio.sleep(rng.uniform(0.5, 1.5) * latency_ms / 1000)
+        if rng.random() < failure_rate:
+            raise RuntimeError("simulated 429")
+        return f"**{subsector} in focus**\n\nBody about {sector['sector']}."
+    return generate
+
+
+async def run(concurrency: int, args) -> dict:
+    saved = []
+
+    async def save(article):
+        saved.append(article)
+        return len(saved)
+
+    pipeline = ArticleGenerationPipeline(
+        generator=fake_generator(args.latency_ms, args.failure_rate, random.Random(args.seed)),
+        save=save,
+        concurrency=concurrency,
+        rate_limiter=AsyncRateLimiter(args.rpm, args.tpm),
+        backoff_base=0.05,
+    )
+    start = time.perf_counter()
+    summary = await pipeline.run()
+    return {
+        "concurrency": concurrency,
+        "elapsed_s": round(time.perf_counter() - start, 2),
+        "generated": summary["generated"],
+        "failed": len(summary["failed"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=500)
+    parser.add_argument("--failure-rate", type=float, default=0.05)
+    parser.add_argument("--rpm", type=float, default=500)
+    parser.add_argument("--tpm", type=float, default=150000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    for concurrency in (1, 8, 16):
+        print(asyncio.run(run(concurrency, args)))
+
+
+if __name__ == "__main__":
+    main()
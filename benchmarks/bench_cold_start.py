@@ -0,0 +1,133 @@
+"""Cold-start profile of the Lambda handler, checked against a regression budget.
+
+Each sample runs in a fresh interpreter:
+  * `python -X importtime -c "import handler"` gives a per-module import breakdown;
+  * a second process imports the handler and sends a synthetic API Gateway
+    event (events/event.json re-pointed at GET /) through CustomMangum.
+
+Exits non-zero if the median exceeds benchmarks/cold_start_budget.json or if a
+module listed under "lazy_modules" is imported eagerly.
+
+Usage: python -m benchmarks.bench_cold_start [--samples N] [--top N] [--json PATH]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_PATH = os.path.join(ROOT, "benchmarks", "cold_start_budget.json")
+
+FIRST_RESPONSE_SCRIPT = r"""
+import json, sys, time
+start = time.perf_counter()
+import handler
+imported = time.perf_counter()
+with open("events/event.json") as f:
+    event = json.load(f)
+event.update(path="/", resource="/", httpMethod="GET", body=None)
+event["requestContext"].update(path="/", resourcePath="/", httpMethod="GET")
+response = handler.lambda_handler(event, None)
+done = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "first_response_ms": (done - start) * 1000,
+    "status": response["statusCode"],
+    "loaded": sorted(m for m in sys.modules if "." not in m),
+}))
+"""
+
+
+def child_env() -> dict:
+    env = dict(os.environ)
+    # Keep the run offline: secrets come from the environment, not SSM
+    env.setdefault("SECRETS_BACKEND", "env")
+    env.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+    return env
+
+
+def import_breakdown() -> dict:
+    """Return {module: cumulative_us} from one -X importtime run of `import handler`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import handler"],
+        cwd=ROOT, env=child_env(), capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def first_response() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_RESPONSE_SCRIPT],
+        cwd=ROOT, env=child_env(), capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="packages to list in the breakdown")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    with open(BUDGET_PATH) as f:
+        budget = json.load(f)
+
+    packages = defaultdict(list)
+    for _ in range(args.samples):
+        totals = defaultdict(int)
+        for name, cumulative_us in import_breakdown().items():
+            # Only count each top-level package once (its outermost import)
+            top = name.split(".")[0]
+            totals[top] = max(totals[top], cumulative_us)
+        for top, cumulative_us in totals.items():
+            packages[top].append(cumulative_us / 1000)
+
+    runs = [first_response() for _ in range(args.samples)]
+    results = {
+        "samples": args.samples,
+        "import_handler_ms": round(statistics.median(r["import_ms"] for r in runs), 1),
+        "first_response_ms": round(statistics.median(r["first_response_ms"] for r in runs), 1),
+        "status": runs[-1]["status"],
+        "packages_ms": {
+            name: round(statistics.median(times), 1)
+            for name, times in sorted(packages.items(), key=lambda item: -statistics.median(item[1]))
+        },
+    }
+
+    print(f"import handler     {results['import_handler_ms']:>8.1f} ms (budget {budget['import_handler_ms']})")
+    print(f"first response     {results['first_response_ms']:>8.1f} ms (budget {budget['first_response_ms']}), status {results['status']}")
+    print("\nslowest imports (median cumulative ms):")
+    for name, ms in list(results["packages_ms"].items())[:args.top]:
+        print(f"  {name:<28} {ms:>8.1f}")
+
+    failures = []
+    for key in ("import_handler_ms", "first_response_ms"):
+        if results[key] > budget[key]:
+            failures.append(f"{key} {results[key]} > {budget[key]}")
+    eager = sorted(set(budget["lazy_modules"]) & set(runs[-1]["loaded"]))
+    if eager:
+        failures.append(f"imported eagerly: {', '.join(eager)}")
+    results["failures"] = failures
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if failures:
+        print("\nBUDGET EXCEEDED: " + "; ".join(failures))
+        sys.exit(1)
+    print("\nwithin budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Compare cold vs cached JWT decode throughput.
+
+Usage: python -m benchmarks.bench_jwt_decode [--iterations N] [--tokens N]
+"""
+import argparse
+import time
+from jose import jwt
+from app.services.auth_service import AuthService
+
+
+def bench(label: str, fn, tokens: list, iterations: int):
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(tokens[i % len(tokens)])
+    elapsed = time.perf_counter() - start
+    print(f"{label:<8} {iterations / elapsed:>12,.0f} decodes/s  {elapsed / iterations * 1e6:>8.2f} us/decode")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50_000)
+    parser.add_argument("--tokens", type=int, default=100, help="distinct tokens in rotation")
+    args = parser.parse_args()
+
+    tokens = [AuthService.create_access_token({"sub": f"user{i}@example.com"}) for i in range(args.tokens)]
+
+    def cold(token):
+        return jwt.decode(token, AuthService.secret_key(), algorithms=[AuthService.ALGORITHM])
+
+    AuthService._token_cache.clear()
+    bench("cold", cold, tokens, args.iterations)
+    bench("cached", AuthService.decode_access_token, tokens, args.iterations)
+    print("cache", AuthService.token_cache_stats())
+
+
+if __name__ == "__main__":
+    main()
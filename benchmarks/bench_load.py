@@ -0,0 +1,247 @@
+"""Mixed-workload load test of the API against a seeded MongoDB.
+
+Runs against the configured database (MONGODB_URL / MONGODB_DB_NAME), which
+must be a throwaway one: with --drop it is dropped and re-seeded first, and the
+run itself writes activity. The script refuses a non-localhost URL or the
+application's default database name unless --allow-any-database is given.
+Then --concurrency virtual users run for --duration seconds. Each picks its next request from a weighted mix of feed,
+article view, comment list, login and analytics calls. Requests go to the app
+in-process through httpx, or with --base-url to a running server, e.g.
+`uvicorn app.main:app --workers 4` started against the same database.
+
+Prints RPS and p50/p95/p99 per route. --json writes the results together with
+the git commit, and --compare prints the change against an earlier results file.
+
+Usage: python -m benchmarks.bench_load [--drop] [--duration S] [--concurrency N] [--base-url URL]
+                                       [--json PATH] [--compare PATH] [--allow-any-database]
+"""
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import httpx
+from pymongo.uri_parser import parse_uri
+
+from app.config import config
+from app.seed_data import SEED_PASSWORD, SeedVolumes, seed_data, seed_email
+from benchmarks.stats import summarize
+
+DEFAULT_MIX = "feed=40,article=25,comments=20,login=5,analytics=10"
+# The application's own default MONGODB_DB_NAME, i.e. most likely real data
+APP_DB_NAME = "CollaborativeArticles"
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+
+async def feed(client, state, rng):
+    params = {"limit": 20}
+    if state["cursors"] and rng.random() < 0.3:
+        params["after"] = rng.choice(state["cursors"])
+    response = await client.get("/api/v1/articles/", params=params)
+    if response.headers.get("x-next-cursor") and len(state["cursors"]) < 50:
+        state["cursors"].append(response.headers["x-next-cursor"])
+    return response
+
+
+async def article(client, state, rng):
+    return await client.get(f"/api/v1/articles/{rng.choice(state['article_ids'])}",
+                            headers={"Authorization": f"Bearer {rng.choice(state['tokens'])}"})
+
+
+async def comments(client, state, rng):
+    return await client.get(f"/api/v1/articles/{rng.choice(state['article_ids'])}/comment", params={"limit": 50})
+
+
+async def login(client, state, rng):
+    return await client.post("/api/v1/users/login/",
+                             data={"username": rng.choice(state["emails"]), "password": SEED_PASSWORD})
+
+
+async def analytics(client, state, rng):
+    board = rng.choice(["top-articles", "most-commented"])
+    return await client.get(f"/api/v1/analytics/{board}/", params={"window": rng.choice(["all", "7d"]), "limit": 10})
+
+
+OPERATIONS = {"feed": feed, "article": article, "comments": comments, "login": login, "analytics": analytics}
+
+
+def parse_mix(spec: str) -> dict:
+    """Parse "name=weight,..." into a weight per operation."""
+    mix = {}
+    for part in filter(None, (item.strip() for item in spec.split(","))):
+        name, weight = part.split("=")
+        if name not in OPERATIONS:
+            raise SystemExit(f"unknown operation {name!r}; choose from {', '.join(OPERATIONS)}")
+        mix[name] = float(weight)
+    return mix
+
+
+async def prepare(client, users: int) -> dict:
+    """Log in a handful of seeded users and collect article ids through the API."""
+    emails = [seed_email(index) for index in range(1, min(users, 21))] or [seed_email(0)]
+    tokens = []
+    for email in emails[:5]:
+        response = await client.post("/api/v1/users/login/", data={"username": email, "password": SEED_PASSWORD})
+        response.raise_for_status()
+        tokens.append(response.json()["access_token"])
+
+    article_ids, after = [], None
+    while len(article_ids) < 1000:
+        response = await client.get("/api/v1/articles/", params={"limit": 100, **({"after": after} if after else {})})
+        response.raise_for_status()
+        article_ids += [item["_id"] for item in response.json()]
+        after = response.headers.get("x-next-cursor")
+        if not after:
+            break
+    if not article_ids:
+        raise SystemExit("no articles found; pass --drop to seed the database")
+    return {"emails": emails, "tokens": tokens, "article_ids": article_ids, "cursors": []}
+
+
+async def run(client, state: dict, mix: dict, concurrency: int, duration: float, seed: int) -> dict:
+    samples = defaultdict(list)
+    errors = defaultdict(int)
+    names, weights = list(mix), list(mix.values())
+    deadline = time.perf_counter() + duration
+
+    async def virtual_user(index):
+        rng = random.Random(seed * 1000 + index)
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                response = await OPERATIONS[name](client, state, rng)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            samples[name].append((time.perf_counter() - start) * 1000)
+            if failed:
+                errors[name] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[virtual_user(index) for index in range(concurrency)])
+    elapsed = time.perf_counter() - start
+
+    routes = {
+        name: {"rps": round(len(samples[name]) / elapsed, 1), "errors": errors[name], **summarize(samples[name])}
+        for name in names
+    }
+    every = [value for values in samples.values() for value in values]
+    total = {"rps": round(len(every) / elapsed, 1), "errors": sum(errors.values()), **summarize(every)}
+    return {"elapsed_s": round(elapsed, 2), "total": total, "routes": routes}
+
+
+def unsafe_target(url: str, db_name: str):
+    """Why the database does not look like a throwaway local one, or None if it does."""
+    if db_name == APP_DB_NAME:
+        return f"MONGODB_DB_NAME is the application default {db_name!r}"
+    if url.startswith("mongodb+srv://"):
+        return "MONGODB_URL is a mongodb+srv:// (hosted) URL"
+    hosts = sorted({host for host, _ in parse_uri(url)["nodelist"]})
+    if not set(hosts) <= LOCAL_HOSTS:
+        return f"MONGODB_URL points at {', '.join(hosts)}, not localhost"
+    return None
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: dict, baseline: dict = None):
+    header = f"{'route':<10} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}"
+    print(header + ("   rps vs base   p95 vs base" if baseline else ""))
+    rows = list(results["routes"].items()) + [("TOTAL", results["total"])]
+    for name, row in rows:
+        line = f"{name:<10} {row['rps']:>8.1f} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['errors']:>7}"
+        before = (baseline or {}).get("total") if name == "TOTAL" else (baseline or {}).get("routes", {}).get(name)
+        if before:
+            line += f"   {_change(before['rps'], row['rps']):>11}   {_change(before['p95_ms'], row['p95_ms']):>11}"
+        print(line)
+
+
+def _change(before: float, after: float) -> str:
+    return f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+
+
+async def main_async(args):
+    mix = parse_mix(args.mix)
+    # Seeding and the in-process app both write to the configured database
+    if args.drop or not args.base_url:
+        reason = unsafe_target(config.MONGO_DB_URL, config.MONGO_DB_NAME)
+        if reason and not args.allow_any_database:
+            raise SystemExit(f"refusing to use this database: {reason}. "
+                             "Point it at a throwaway local database, or pass --allow-any-database.")
+    if args.drop:
+        volumes = SeedVolumes(users=args.users, articles=args.articles, comments=args.comments,
+                              activity=args.activity, description_chars=args.description_chars)
+        print("seeded", await seed_data(volumes, seed=args.seed, drop=True))
+
+    if args.base_url:
+        transport = httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=args.concurrency))
+        base_url = args.base_url
+    else:
+        from app.main import app
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://bench"
+
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=30) as client:
+        state = await prepare(client, args.users)
+        results = await run(client, state, mix, args.concurrency, args.duration, args.seed)
+
+    if not args.base_url:
+        from app.services.activity_buffer import ActivityBuffer
+        from app.services.badge_engine import BadgeEngine
+        await ActivityBuffer.drain()
+        await BadgeEngine.drain()
+
+    results.update({
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "target": args.base_url or "in-process",
+        "params": {"concurrency": args.concurrency, "duration_s": args.duration, "mix": mix, "seed": args.seed,
+                   "volumes": volumes._asdict() if args.drop else None},
+    })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of load")
+    parser.add_argument("--concurrency", type=int, default=20, help="virtual users")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="operation weights, e.g. " + DEFAULT_MIX)
+    parser.add_argument("--base-url", help="drive a running server instead of the in-process app")
+    parser.add_argument("--drop", action="store_true",
+                        help="drop the database's seeded collections and re-seed them before the run")
+    parser.add_argument("--allow-any-database", action="store_true",
+                        help="skip the check that the database is a throwaway local one")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--articles", type=int, default=2000)
+    parser.add_argument("--comments", type=int, default=20000)
+    parser.add_argument("--activity", type=int, default=50000)
+    parser.add_argument("--description-chars", type=int, default=8000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="results file from an earlier run to compare against")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"baseline: {baseline.get('commit')} at {baseline.get('timestamp')}")
+    print_results(results, baseline)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
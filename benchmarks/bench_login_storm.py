@@ -0,0 +1,86 @@
+"""Measure latency of an unrelated endpoint while a burst of logins runs.
+
+Runs the same storm twice against an in-process ASGI app: once verifying
+bcrypt inline on the event loop (the old behaviour) and once through
+PasswordHasher's worker pool.
+
+Usage: python -m benchmarks.bench_login_storm [--logins N] [--interval-ms MS]
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.services.auth_service import AuthService
+from app.services.password_hasher import PasswordHasher, PasswordHasherBusyError
+from benchmarks.stats import summarize
+
+HASHED = AuthService.hash_password("correct horse battery staple")
+
+
+def build_app(mode: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/login")
+    async def login():
+        if mode == "inline":
+            ok = AuthService.verify_password("correct horse battery staple", HASHED)
+        else:
+            try:
+                ok = await PasswordHasher.verify_password("correct horse battery staple", HASHED)
+            except PasswordHasherBusyError:
+                return {"ok": False, "shed": True}
+        return {"ok": ok}
+
+    @app.get("/ping")
+    async def ping():
+        return {"pong": True}
+
+    return app
+
+
+async def run(mode: str, logins: int, interval_ms: float) -> dict:
+    transport = httpx.ASGITransport(app=build_app(mode))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        latencies = []
+        storm_done = asyncio.Event()
+
+        async def probe():
+            # Latency is measured from each probe's scheduled start, so time
+            # spent waiting for a blocked event loop is counted.
+            loop = asyncio.get_running_loop()
+            scheduled = loop.time()
+            while not storm_done.is_set():
+                await asyncio.sleep(max(0.0, scheduled - loop.time()))
+                await client.get("/ping")
+                latencies.append((loop.time() - scheduled) * 1000)
+                scheduled += interval_ms / 1000
+
+        async def storm():
+            try:
+                return await asyncio.gather(*[client.post("/login") for _ in range(logins)])
+            finally:
+                storm_done.set()
+
+        start = time.perf_counter()
+        _, responses = await asyncio.gather(probe(), storm())
+        elapsed = time.perf_counter() - start
+        shed = sum(1 for r in responses if r.json().get("shed"))
+    return {"mode": mode, "elapsed_s": round(elapsed, 2), "logins_shed": shed, "ping": summarize(latencies)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=20)
+    parser.add_argument("--interval-ms", type=float, default=10.0, help="gap between /ping probes")
+    args = parser.parse_args()
+
+    for mode in ("inline", "pool"):
+        print(asyncio.run(run(mode, args.logins, args.interval_ms)))
+    PasswordHasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
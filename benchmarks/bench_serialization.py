@@ -0,0 +1,91 @@
+"""Compare the old str()-loop + jsonable_encoder response path with MongoJSONResponse.
+
+Usage: python -m benchmarks.bench_serialization [--iterations N] [--articles N] [--comments N]
+"""
+import argparse
+import copy
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.utils.json_response import MongoJSONResponse
+
+WORDS = "market policy quantum health youth design climate network growth future data city".split()
+
+
+def make_article(rng: random.Random, created_at: datetime, full: bool) -> dict:
+    article = {
+        "_id": ObjectId(),
+        "title": " ".join(rng.choices(WORDS, k=8)).title(),
+        "sector": rng.choice(["Technology & Innovation", "Health & Wellness", "Politics & Society"]),
+        "subsector": rng.choice(["AI Governance", "Quantum Computing", "Mental Health"]),
+        "image_url": "https://example.com/images/article.jpg",
+        "authors": str(ObjectId()),
+        "author_id": ObjectId(),
+        "tags": rng.choices(WORDS, k=4),
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+    if full:
+        article["description"] = " ".join(rng.choices(WORDS, k=500))
+    return article
+
+
+def make_comment(rng: random.Random, article_id: ObjectId, created_at: datetime) -> dict:
+    return {
+        "_id": ObjectId(),
+        "article_id": article_id,
+        "user_id": ObjectId(),
+        "content": " ".join(rng.choices(WORDS, k=30)),
+        "created_at": created_at,
+        "updated_at": created_at,
+        "user": {"username": rng.choice(WORDS), "profile_picture": None},
+    }
+
+
+def legacy_render(documents: list, id_fields: tuple) -> bytes:
+    """What the routers did before: stringify ids in place, then jsonable_encoder + json.dumps."""
+    for document in documents:
+        for field in id_fields:
+            if field in document:
+                document[field] = str(document[field])
+    return JSONResponse(jsonable_encoder(documents)).body
+
+
+def bench(label: str, fn, payload: list, iterations: int):
+    # Fresh copies each round: the legacy path mutates its input
+    copies = [copy.deepcopy(payload) for _ in range(iterations)]
+    start = time.perf_counter()
+    for documents in copies:
+        body = fn(documents)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed / iterations * 1e3:>8.3f} ms/response  {len(body) / 1024:>7.1f} KiB")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--articles", type=int, default=100, help="articles per feed page")
+    parser.add_argument("--comments", type=int, default=100, help="comments per page")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    payloads = {
+        "feed (summaries)": ([make_article(rng, now - timedelta(minutes=i), False) for i in range(args.articles)], ("_id", "author_id")),
+        "feed (full=true)": ([make_article(rng, now - timedelta(minutes=i), True) for i in range(args.articles)], ("_id", "author_id")),
+        "comments": ([make_comment(rng, ObjectId(), now - timedelta(seconds=i)) for i in range(args.comments)], ("_id", "user_id", "article_id")),
+    }
+
+    for name, (documents, id_fields) in payloads.items():
+        print(f"== {name}: {len(documents)} documents")
+        legacy = bench("str loop + jsonable_encoder", lambda docs: legacy_render(docs, id_fields), documents, args.iterations)
+        fast = bench("MongoJSONResponse", lambda docs: MongoJSONResponse(docs).body, documents, args.iterations)
+        print(f"speedup {legacy / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""Small helpers shared by the benchmark scripts."""
+import math
+
+
+def percentile(values: list, pct: float) -> float:
+    """Return the nearest-rank percentile of values (pct in 0-100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies_ms: list) -> dict:
+    """Return count and p50/p95/p99/max latency in milliseconds."""
+    return {
+        "count": len(latencies_ms),
+        "p50_ms": round(percentile(latencies_ms, 50), 2),
+        "p95_ms": round(percentile(latencies_ms, 95), 2),
+        "p99_ms": round(percentile(latencies_ms, 99), 2),
+        "max_ms": round(max(latencies_ms, default=0.0), 2),
+    }
@@ -1,19 +1,38 @@
+import asyncio
+import logging
 from mangum import Mangum
 from app.main import app
+from app.config import config
+from app.services.activity_buffer import ActivityBuffer
+from app.services.badge_engine import BadgeEngine
+from app.database.leaderboard_repository import LeaderboardRepository
+
+logger = logging.getLogger(__name__)
 
 class CustomMangum(Mangum):
     def __call__(self, event, context):
-        print("Event")
-        print(event)
-
-        print("Context")
-        print(context)
+        if config.LOG_LAMBDA_EVENTS:
+            # Explicitly enabled, so log every invocation at the default level, bypassing sampling
+            logger.info("Lambda invocation", extra={
+                "sample_exempt": True,
+                "fields": {"event": event, "context": vars(context) if hasattr(context, "__dict__") else context},
+            })
         # Ensure requestContext exists and has http key
         if "requestContext" in event and "http" in event["requestContext"]:
             if "sourceIp" not in event["requestContext"]["http"]:
                 event["requestContext"]["http"]["sourceIp"] = "0.0.0.0"
-        return super().__call__(event, context)
+        response = super().__call__(event, context)
+        # Write buffered activity (and the badge evaluations it triggers) before Lambda freezes the process
+        if ActivityBuffer.pending() or BadgeEngine.pending():
+            loop = asyncio.get_event_loop()
+            loop.run_until_complete(ActivityBuffer.drain())
+            loop.run_until_complete(BadgeEngine.drain())
+        return response
     
 
 lambda_handler = CustomMangum(app)
 
+def refresh_leaderboards_handler(event, context):
+    """EventBridge-scheduled entry point that recomputes every materialized leaderboard."""
+    refreshed = asyncio.get_event_loop().run_until_complete(LeaderboardRepository.refresh_all())
+    return {"refreshed": refreshed}
@@ -0,0 +1,27 @@
+import sys
+import pytest
+import app.database  # noqa: F401  (registers app.database.db in sys.modules)
+
+@pytest.fixture
+def mongo(monkeypatch):
+    """Point the shared Motor client at an in-memory mongomock database."""
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    client = mongomock_motor.AsyncMongoMockClient()
+    monkeypatch.setattr(sys.modules["app.database.db"], "_client", client)
+    from app.database import db
+    return db
+
+@pytest.fixture
+def mongo_bulk(mongo, monkeypatch):
+    """`mongo` with bulk_write emulated by single updates (mongomock's is incompatible with pymongo 4.11)."""
+    from types import SimpleNamespace
+
+    async def bulk_write(self, operations, ordered=True):
+        matched = 0
+        for operation in operations:
+            result = await self.update_one(operation._filter, operation._doc, upsert=operation._upsert)
+            matched += result.matched_count
+        return SimpleNamespace(matched_count=matched)
+
+    monkeypatch.setattr(type(mongo["articles"]), "bulk_write", bulk_write, raising=False)
+    return mongo
@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+from bson import ObjectId
+from app.database.activity_store import BucketActivityStore, DocumentActivityStore, activity_source, get_activity_store
+
+NOW = datetime(2025, 3, 4, 15, 42, 7, tzinfo=timezone.utc)
+
+def test_bucket_boundaries():
+    assert BucketActivityStore("hour").bucket_start(NOW) == datetime(2025, 3, 4, 15, tzinfo=timezone.utc)
+    assert BucketActivityStore("day").bucket_start(NOW) == datetime(2025, 3, 4, tzinfo=timezone.utc)
+
+def test_append_only_matches_buckets_with_room():
+    store = BucketActivityStore("hour", max_events=10)
+    user_id = ObjectId()
+    events = [{"_id": ObjectId(), "action": "viewed_article", "metadata": {}, "timestamp": NOW}] * 3
+
+    query, update = store._append(user_id, store.bucket_start(NOW), events)
+
+    assert query == {"user_id": user_id, "bucket_start": store.bucket_start(NOW), "count": {"$lte": 7}}
+    assert update["$inc"] == {"count": 3}
+    assert update["$push"]["events"]["$each"] == events
+
+def test_bucket_pipeline_prefilters_whole_buckets():
+    user_id = ObjectId()
+    match = {"action": "viewed_article", "user_id": user_id, "timestamp": {"$gte": NOW}}
+
+    pipeline = BucketActivityStore().pipeline(match)
+
+    assert pipeline[0] == {"$match": {"user_id": user_id, "events.action": "viewed_article", "last_at": {"$gte": NOW}}}
+    assert pipeline[1] == {"$unwind": "$events"}
+    assert pipeline[-1] == {"$match": match}
+    assert DocumentActivityStore().pipeline(match) == [{"$match": match}]
+
+def test_storage_mode_selects_the_store():
+    assert get_activity_store("buckets").collection == "user_activity_buckets"
+    assert get_activity_store("documents").collection == "user_activity"
+
+def test_activity_source_follows_the_configured_mode(monkeypatch):
+    from app.config import config
+    match = {"action": "viewed_article"}
+    monkeypatch.setattr(config, "ACTIVITY_STORAGE_MODE", "documents")
+    assert activity_source(match) == ("user_activity", [{"$match": match}])
+    monkeypatch.setattr(config, "ACTIVITY_STORAGE_MODE", "buckets")
+    collection, stages = activity_source(match)
+    assert collection == "user_activity_buckets"
+    assert stages[-1] == {"$match": match}
+
+def test_bucket_pipeline_prefilters_on_article_id():
+    match = {"action": "viewed_article", "metadata.article_id": {"$in": ["a", "b"]}}
+    stages = BucketActivityStore().pipeline(match)
+    assert stages[0] == {"$match": {"events.action": "viewed_article", "events.metadata.article_id": {"$in": ["a", "b"]}}}
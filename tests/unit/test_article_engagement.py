@@ -0,0 +1,165 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+import pytest
+from bson import ObjectId
+from app.database import article_repository, user_activity_repository
+from app.database.activity_store import get_activity_store
+from app.database.article_repository import ArticleRepository
+from app.database.comment_repository import CommentRepository
+from app.database.user_activity_repository import UserActivityRepository
+from app.database.user_counters_repository import UserCountersRepository
+from app.services.response_cache import ResponseCache
+
+class FakeArticles:
+    def __init__(self, document=None):
+        self.document = document
+        self.updates = []
+        self.bulk = []
+
+    async def find_one_and_update(self, query, update, projection=None):
+        self.updates.append((query, update))
+        return self.document
+
+    async def bulk_write(self, operations, ordered=True):
+        self.bulk.extend(operations)
+        return SimpleNamespace(matched_count=len(operations))
+
+async def _no_op(*args, **kwargs):
+    return None
+
+async def test_comment_add_increments_count_and_advances_last_commented_at(monkeypatch):
+    author_id, commenter = ObjectId(), ObjectId()
+    articles = FakeArticles({"_id": ObjectId(), "author_id": author_id})
+    monkeypatch.setattr(article_repository, "db", {"articles": articles})
+    invalidated, counted = [], []
+
+    async def invalidate(*tags):
+        invalidated.extend(tags)
+
+    async def increment(user_id, **deltas):
+        counted.append((user_id, deltas))
+    monkeypatch.setattr(ResponseCache, "invalidate", invalidate)
+    monkeypatch.setattr(UserCountersRepository, "increment", increment)
+
+    commented_at = datetime(2025, 1, 2)
+    await CommentRepository._count_comment(
+        {"article_id": articles.document["_id"], "user_id": commenter, "created_at": commented_at}, 1
+    )
+
+    [(query, update)] = articles.updates
+    assert update == {"$inc": {"comment_count": 1}, "$max": {"last_commented_at": commented_at}}
+    assert ResponseCache.ARTICLES in invalidated
+    assert (author_id, {"comments_received": 1}) in counted
+
+async def test_deleting_the_newest_comment_recomputes_last_commented_at(monkeypatch):
+    latest = datetime(2025, 1, 2)
+    articles = FakeArticles({"_id": ObjectId(), "last_commented_at": latest})
+    monkeypatch.setattr(article_repository, "db", {"articles": articles})
+    monkeypatch.setattr(ResponseCache, "invalidate", _no_op)
+    monkeypatch.setattr(UserCountersRepository, "increment", _no_op)
+    refreshed = []
+
+    async def refresh(article_id):
+        refreshed.append(article_id)
+    monkeypatch.setattr(ArticleRepository, "refresh_last_commented_at", refresh)
+
+    older = {"article_id": articles.document["_id"], "user_id": ObjectId(), "created_at": datetime(2025, 1, 1)}
+    await CommentRepository._count_comment(older, -1)
+    assert refreshed == []
+    await CommentRepository._count_comment({**older, "created_at": latest}, -1)
+    assert refreshed == [articles.document["_id"]]
+    assert articles.updates[0][1] == {"$inc": {"comment_count": -1}}
+
+async def test_buffered_views_are_added_per_article_in_one_bulk_write(monkeypatch):
+    articles = FakeArticles()
+    monkeypatch.setattr(article_repository, "db", {"articles": articles})
+    monkeypatch.setattr(UserCountersRepository, "increment_many", _no_op)
+
+    class Store:
+        insert_many = staticmethod(_no_op)
+    monkeypatch.setattr(user_activity_repository, "get_activity_store", lambda: Store())
+
+    first, second, user = ObjectId(), ObjectId(), str(ObjectId())
+    await UserActivityRepository.insert_activities([
+        UserActivityRepository.build_activity(user, "viewed_article", {"article_id": str(first)}),
+        UserActivityRepository.build_activity(user, "viewed_article", {"article_id": str(first)}),
+        UserActivityRepository.build_activity(user, "viewed_article", {"article_id": str(second)}),
+        UserActivityRepository.build_activity(user, "viewed_article", {"article_id": "not-an-id"}),
+        UserActivityRepository.build_activity(user, "commented", {"article_id": str(second)}),
+    ])
+
+    assert {(op._filter["_id"], op._doc["$inc"]["view_count"]) for op in articles.bulk} == {(first, 2), (second, 1)}
+
+@pytest.fixture
+def legacy_articles(mongo_bulk, monkeypatch):
+    monkeypatch.setattr(ResponseCache, "invalidate", _no_op)
+    return mongo_bulk
+
+async def test_comments_on_a_legacy_article_wait_for_reconcile(legacy_articles):
+    mongo = legacy_articles
+    article_id, author = ObjectId(), ObjectId()
+    await mongo["articles"].insert_one({"_id": article_id, "author_id": author, "title": "old"})
+    earlier = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    await mongo["comments"].insert_many([
+        {"article_id": article_id, "user_id": ObjectId(), "content": "hi", "created_at": earlier} for _ in range(3)
+    ])
+
+    await CommentRepository.add_comment(str(article_id), str(ObjectId()), "new")
+    await CommentRepository.add_comment(str(article_id), str(ObjectId()), "newer")
+
+    article = await mongo["articles"].find_one({"_id": article_id})
+    assert "comment_count" not in article
+
+    await ArticleRepository.reconcile_engagement()
+    article = await mongo["articles"].find_one({"_id": article_id})
+    assert article["comment_count"] == 5
+    assert article["last_commented_at"] > earlier.replace(tzinfo=None)
+
+async def test_views_of_a_legacy_article_wait_for_reconcile(legacy_articles):
+    mongo = legacy_articles
+    legacy, current = ObjectId(), ObjectId()
+    await mongo["articles"].insert_many([
+        {"_id": legacy, "title": "old"},
+        {"_id": current, "title": "new", **ArticleRepository.ENGAGEMENT_DEFAULTS},
+    ])
+    user = str(ObjectId())
+    # Viewed before the view_count field existed
+    await get_activity_store().insert_one(UserActivityRepository.build_activity(user, "viewed_article", {"article_id": str(legacy)}))
+    for _ in range(2):
+        await UserActivityRepository.log_activity(user, "viewed_article", {"article_id": str(legacy)})
+    await UserActivityRepository.log_activity(user, "viewed_article", {"article_id": str(current)})
+
+    stored = {doc["_id"]: doc.get("view_count") async for doc in mongo["articles"].find()}
+    assert stored == {legacy: None, current: 1}
+
+    await ArticleRepository.reconcile_engagement()
+    stored = {doc["_id"]: doc["view_count"] async for doc in mongo["articles"].find()}
+    assert stored == {legacy: 3, current: 1}
+
+async def test_reconcile_works_through_articles_in_batches(legacy_articles, monkeypatch):
+    mongo = legacy_articles
+    article_ids = [ObjectId() for _ in range(5)]
+    await mongo["articles"].insert_many([
+        {"_id": article_id, "comment_count": 7, "view_count": 7, "last_commented_at": None} for article_id in article_ids
+    ])
+    when = datetime(2024, 1, 1)
+    await mongo["comments"].insert_many([
+        {"article_id": article_id, "user_id": ObjectId(), "created_at": when}
+        for index, article_id in enumerate(article_ids) for _ in range(index)
+    ])
+    await get_activity_store().insert_many([
+        UserActivityRepository.build_activity(str(ObjectId()), "viewed_article", {"article_id": str(article_ids[-1])})
+    ])
+    batches = []
+    reconcile_batch = ArticleRepository._reconcile_batch
+
+    async def recording_batch(articles):
+        batches.append(len(articles))
+        return await reconcile_batch(articles)
+    monkeypatch.setattr(ArticleRepository, "_reconcile_batch", recording_batch)
+
+    assert await ArticleRepository.reconcile_engagement(batch_size=2) == 5
+    assert batches == [2, 2, 1]
+    stored = {doc["_id"]: (doc["comment_count"], doc["view_count"]) async for doc in mongo["articles"].find()}
+    assert stored == {article_id: (index, 1 if index == 4 else 0) for index, article_id in enumerate(article_ids)}
+    assert await ArticleRepository.reconcile_engagement(batch_size=2) == 0
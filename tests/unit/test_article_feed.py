@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from bson import ObjectId
+from app.database.article_repository import ArticleRepository
+from app.services.response_cache import ResponseCache
+
+ANCHOR = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def no_cache_invalidation(monkeypatch):
+    async def invalidate(*tags):
+        pass
+    monkeypatch.setattr(ResponseCache, "invalidate", invalidate)
+
+
+async def insert_mixed_articles(mongo):
+    """Five dated articles, three legacy string dates and two without created_at (one null, one missing)."""
+    articles = [{"_id": ObjectId(), "title": f"dated {i}", "created_at": ANCHOR - timedelta(days=i)} for i in range(5)]
+    articles += [{"_id": ObjectId(), "title": f"string {i}", "created_at": f"2023-0{i + 1}-01T00:00:00"} for i in range(3)]
+    articles += [{"_id": ObjectId(), "title": "null", "created_at": None}, {"_id": ObjectId(), "title": "missing"}]
+    await mongo["articles"].insert_many(articles)
+    return articles
+
+
+@pytest.mark.parametrize("article", [
+    {"_id": ObjectId(), "created_at": ANCHOR},
+    {"_id": ObjectId(), "created_at": "2023-01-01 10:00|odd"},
+    {"_id": ObjectId(), "created_at": None},
+    {"_id": ObjectId()},
+])
+def test_cursor_round_trips_every_key_type(article):
+    created_at, article_id = ArticleRepository.decode_cursor(ArticleRepository.encode_cursor(article))
+    assert (created_at, article_id) == (article.get("created_at"), article["_id"])
+
+
+def test_untagged_cursors_still_decode_and_garbage_is_rejected():
+    import base64
+    article_id = ObjectId()
+    legacy = base64.urlsafe_b64encode(f"{ANCHOR.isoformat()}|{article_id}".encode()).decode()
+    assert ArticleRepository.decode_cursor(legacy) == (ANCHOR, article_id)
+    for bad in ["not-base64!", base64.urlsafe_b64encode(b"x:1|nope").decode()]:
+        with pytest.raises(ValueError):
+            ArticleRepository.decode_cursor(bad)
+
+
+@pytest.mark.parametrize("limit", [1, 3, 4])
+async def test_paging_visits_every_article_once_across_mixed_created_at(mongo, limit):
+    articles = await insert_mixed_articles(mongo)
+
+    seen, after = [], None
+    while True:
+        page = await ArticleRepository.get_all_articles(limit=limit, after=after)
+        seen += [article["title"] for article in page]
+        if len(page) < limit:
+            break
+        after = ArticleRepository.decode_cursor(ArticleRepository.encode_cursor(page[-1]))
+
+    assert sorted(seen) == sorted(article["title"] for article in articles)
+    assert seen[:5] == [f"dated {i}" for i in range(5)]
+    assert seen[5:8] == ["string 2", "string 1", "string 0"]
+
+
+async def test_normalize_created_at_converts_legacy_values(mongo_bulk):
+    mongo = mongo_bulk
+    articles = await insert_mixed_articles(mongo)
+
+    assert await ArticleRepository.normalize_created_at() == 5
+    assert await ArticleRepository.normalize_created_at() == 0
+
+    stored = {doc["title"]: doc["created_at"] for doc in await mongo["articles"].find().to_list(None)}
+    assert all(isinstance(value, datetime) for value in stored.values())
+    assert stored["string 0"].replace(tzinfo=timezone.utc) == datetime(2023, 1, 1, tzinfo=timezone.utc)
+    missing = next(article for article in articles if article["title"] == "missing")
+    assert stored["missing"].replace(tzinfo=timezone.utc) == missing["_id"].generation_time
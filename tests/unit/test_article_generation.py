@@ -0,0 +1,127 @@
+from app.services.article_generator_service import ArticleGenerationPipeline
+from app.services.openai_service import content_key
+from app.utils.rate_limiter import AsyncRateLimiter
+
+SECTOR = {
+    "sector": "Tech",
+    "subsectors": ["AI", "Chips", "Cloud"],
+    "audience": "engineers",
+    "keywords": ["tech"],
+    "perspective": "neutral",
+}
+
+
+async def test_pipeline_retries_and_streams_saves():
+    attempts = {}
+    saved = []
+    events = []
+
+    async def generator(sector, subsector):
+        attempts[subsector] = attempts.get(subsector, 0) + 1
+        if subsector == "Chips" and attempts[subsector] == 1:
+            raise RuntimeError("rate limited")
+        if subsector == "Cloud":
+            raise RuntimeError("model unavailable")
+        return f"**{subsector}**\n\nBody"
+
+    async def save(article):
+        saved.append(article)
+        return len(saved)
+
+    pipeline = ArticleGenerationPipeline(
+        generator=generator,
+        save=save,
+        concurrency=2,
+        rate_limiter=AsyncRateLimiter(requests_per_minute=6000),
+        max_retries=1,
+        backoff_base=0,
+        on_progress=events.append,
+    )
+    summary = await pipeline.run(pipeline.subsector_tasks([SECTOR]))
+
+    assert summary["generated"] == 2
+    assert [f["subsector"] for f in summary["failed"]] == ["Cloud"]
+    assert attempts == {"AI": 1, "Chips": 2, "Cloud": 2}
+    assert sorted(article["title"] for article in saved) == ["AI", "Chips"]
+    assert [event["completed"] for event in events] == [1, 2, 3]
+
+
+class DictCache:
+    def __init__(self, entries=None):
+        self.entries = dict(entries or {})
+
+    async def get(self, key):
+        return self.entries.get(key)
+
+    async def set(self, key, content, model):
+        self.entries[key] = content
+
+
+class CountingLimiter:
+    def __init__(self):
+        self.acquired = 0
+
+    async def acquire(self, tokens=0):
+        self.acquired += 1
+
+
+async def run_cached_pipeline(cache, force=False):
+    saved, calls, limiter = [], [], CountingLimiter()
+
+    async def generator(sector, subsector):
+        calls.append(subsector)
+        return f"**{subsector}**\n\nBody"
+
+    async def save(article):
+        saved.append(article["title"])
+        return len(saved)
+
+    pipeline = ArticleGenerationPipeline(generator=generator, save=save, cache=cache, rate_limiter=limiter,
+                                         max_retries=0, force=force)
+    summary = await pipeline.run([(SECTOR, "AI"), (SECTOR, "Chips")])
+    return summary, saved, calls, limiter.acquired
+
+
+async def test_cache_hit_skips_generation_tokens_and_save():
+    cache = DictCache({content_key(SECTOR, "AI"): "**AI**\n\nOld body"})
+
+    summary, saved, calls, acquired = await run_cached_pipeline(cache)
+
+    assert (summary["generated"], summary["cached"]) == (1, 1)
+    assert calls == saved == ["Chips"]
+    assert acquired == 1
+    assert content_key(SECTOR, "Chips") in cache.entries
+
+
+async def test_cache_is_written_only_after_a_successful_save():
+    cache = DictCache()
+
+    async def generator(sector, subsector):
+        return f"**{subsector}**\n\nBody"
+
+    async def failing_save(article):
+        raise RuntimeError("db down")
+
+    pipeline = ArticleGenerationPipeline(generator=generator, save=failing_save, cache=cache, rate_limiter=CountingLimiter(), max_retries=0)
+    summary = await pipeline.run([(SECTOR, "AI")])
+
+    assert len(summary["failed"]) == 1
+    assert cache.entries == {}
+
+
+async def test_force_regenerates_cached_prompts():
+    cache = DictCache({content_key(SECTOR, "AI"): "**AI**\n\nOld body"})
+
+    summary, saved, calls, acquired = await run_cached_pipeline(cache, force=True)
+
+    assert (summary["generated"], summary["cached"]) == (2, 0)
+    assert sorted(saved) == ["AI", "Chips"]
+    assert acquired == 2
+
+
+def test_custom_generators_are_not_cached_by_default():
+    async def generator(sector, subsector):
+        return ""
+
+    assert ArticleGenerationPipeline(generator=generator).cache is None
+    assert ArticleGenerationPipeline().cache is not None
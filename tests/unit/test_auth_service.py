@@ -0,0 +1,25 @@
+from datetime import timedelta
+
+import pytest
+from jose import JWTError
+
+from app.services.auth_service import AuthService
+
+
+def test_decode_reuses_verified_token():
+    token = AuthService.create_access_token({"sub": "cache@example.com"})
+    hits = AuthService.token_cache_stats()["hits"]
+
+    first = AuthService.decode_access_token(token)
+    first["sub"] = "tampered@example.com"
+    second = AuthService.decode_access_token(token)
+
+    assert second["sub"] == "cache@example.com"
+    assert AuthService.token_cache_stats()["hits"] == hits + 1
+
+
+def test_expired_token_is_rejected_and_not_cached():
+    token = AuthService.create_access_token({"sub": "old@example.com"}, expires_delta=timedelta(seconds=-1))
+    with pytest.raises(JWTError):
+        AuthService.decode_access_token(token)
+    assert token not in AuthService._token_cache
@@ -0,0 +1,19 @@
+import pytest
+from benchmarks.bench_load import unsafe_target
+
+
+@pytest.mark.parametrize("url, db_name", [
+    ("mongodb://localhost:27017", "loadtest"),
+    ("mongodb://user:pw@127.0.0.1:27017,localhost:27018/?replicaSet=rs0", "bench"),
+])
+def test_local_throwaway_databases_are_allowed(url, db_name):
+    assert unsafe_target(url, db_name) is None
+
+
+@pytest.mark.parametrize("url, db_name, reason", [
+    ("mongodb://localhost:27017", "CollaborativeArticles", "application default"),
+    ("mongodb+srv://user:pw@cluster0.example.mongodb.net", "loadtest", "mongodb+srv"),
+    ("mongodb://localhost:27017,db.example.com:27017", "loadtest", "db.example.com"),
+])
+def test_shared_or_default_databases_are_refused(url, db_name, reason):
+    assert reason in unsafe_target(url, db_name)
@@ -0,0 +1,20 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def test_handler_import_defers_heavy_dependencies():
+    with open(os.path.join(ROOT, "benchmarks", "cold_start_budget.json")) as f:
+        lazy_modules = json.load(f)["lazy_modules"]
+
+    env = dict(os.environ, SECRETS_BACKEND="env")
+    result = subprocess.run(
+        [sys.executable, "-c", "import handler, sys, json; print(json.dumps(sorted(sys.modules)))"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    loaded = set(json.loads(result.stdout.strip().splitlines()[-1]))
+
+    assert not loaded & set(lazy_modules)
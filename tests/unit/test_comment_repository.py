@@ -0,0 +1,83 @@
+from bson import ObjectId
+from app.database import comment_repository
+from app.database.comment_repository import CommentRepository
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, field, direction):
+        self.documents = sorted(self.documents, key=lambda doc: doc[field], reverse=direction < 0)
+        return self
+
+    def limit(self, limit):
+        self.documents = self.documents[:limit]
+        return self
+
+    async def to_list(self, length):
+        return self.documents[:length]
+
+    def __aiter__(self):
+        async def iterate():
+            for document in self.documents:
+                yield document
+        return iterate()
+
+class FakeCollection:
+    def __init__(self, documents):
+        self.documents = documents
+        self.queries = []
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        return FakeCursor([doc for doc in self.documents if self._matches(doc, query)])
+
+    @staticmethod
+    def _matches(doc, query):
+        for field, condition in query.items():
+            if isinstance(condition, dict):
+                if "$in" in condition and doc.get(field) not in condition["$in"]:
+                    return False
+                if "$gt" in condition and not doc.get(field) > condition["$gt"]:
+                    return False
+            elif doc.get(field) != condition:
+                return False
+        return True
+
+def _setup(monkeypatch, comment_count=5):
+    article_id, alice, bob, ghost = ObjectId(), ObjectId(), ObjectId(), ObjectId()
+    authors = [alice, bob, ghost, alice, bob][:comment_count]
+    comments = FakeCollection([
+        {"_id": ObjectId(), "article_id": article_id, "user_id": user_id, "content": str(index)}
+        for index, user_id in enumerate(authors)
+    ])
+    users = FakeCollection([
+        {"_id": alice, "username": "alice", "profile_picture": "a.png"},
+        {"_id": bob, "username": "bob"},
+    ])
+    monkeypatch.setattr(comment_repository, "db", {"comments": comments, "users": users})
+    return article_id, comments, users, (alice, bob, ghost)
+
+async def test_commenters_are_fetched_in_one_batched_lookup(monkeypatch):
+    article_id, _, users, (alice, bob, ghost) = _setup(monkeypatch)
+
+    page = await CommentRepository.get_comments_by_article(str(article_id))
+
+    [query] = users.queries
+    assert set(query["_id"]["$in"]) == {alice, bob, ghost}
+    assert [comment["user"]["username"] for comment in page] == ["alice", "bob", "Unknown User", "alice", "bob"]
+    assert page[0]["user"]["profile_picture"] == "a.png"
+
+async def test_paging_with_after_continues_past_the_last_id(monkeypatch):
+    article_id, _, _, _ = _setup(monkeypatch)
+
+    first = await CommentRepository.get_comments_by_article(str(article_id), limit=2)
+    second = await CommentRepository.get_comments_by_article(str(article_id), limit=2, after=str(first[-1]["_id"]))
+    rest = await CommentRepository.get_comments_by_article(str(article_id), limit=2, after=str(second[-1]["_id"]))
+
+    assert [c["content"] for c in first + second + rest] == ["0", "1", "2", "3", "4"]
+
+async def test_no_user_lookup_for_an_empty_page(monkeypatch):
+    _, _, users, _ = _setup(monkeypatch)
+    assert await CommentRepository.get_comments_by_article(str(ObjectId())) == []
+    assert users.queries == []
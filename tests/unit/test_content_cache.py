@@ -0,0 +1,49 @@
+import os
+import time
+from app.services.content_cache import DiskContentCacheBackend, GeneratedContentCache, MongoContentCacheBackend
+
+
+def test_fingerprint_depends_on_model_and_prompt():
+    key = GeneratedContentCache.fingerprint("gpt-4o", "prompt")
+    assert key == GeneratedContentCache.fingerprint("gpt-4o", "prompt")
+    assert key != GeneratedContentCache.fingerprint("gpt-4o-mini", "prompt")
+    assert key != GeneratedContentCache.fingerprint("gpt-4o", "other prompt")
+
+
+async def test_disk_backend_round_trip_expiry_and_eviction(tmp_path):
+    backend = DiskContentCacheBackend(str(tmp_path))
+    assert await backend.get("missing") is None
+
+    await backend.set("a", "first", "gpt-4o", ttl=60, max_entries=2)
+    assert await backend.get("a") == "first"
+
+    await backend.set("expired", "old", "gpt-4o", ttl=-1, max_entries=2)
+    assert await backend.get("expired") is None
+
+    os.utime(tmp_path / "a.json", (time.time() - 100, time.time() - 100))
+    await backend.set("b", "second", "gpt-4o", ttl=60, max_entries=2)
+    assert sorted(os.listdir(tmp_path)) == ["b.json", "expired.json"]
+
+
+async def test_mongo_backend_round_trip_expiry_and_eviction(mongo):
+    backend = MongoContentCacheBackend()
+    assert await backend.get("missing") is None
+
+    await backend.set("a", "first", "gpt-4o", ttl=60, max_entries=2)
+    await backend.set("a", "replaced", "gpt-4o", ttl=60, max_entries=2)
+    assert await backend.get("a") == "replaced"
+
+    await backend.set("expired", "old", "gpt-4o", ttl=-1, max_entries=2)
+    assert await backend.get("expired") is None
+
+    await backend.set("b", "second", "gpt-4o", ttl=60, max_entries=2)
+    assert sorted(doc["_id"] for doc in await mongo["generated_content"].find().to_list(None)) == ["b", "expired"]
+
+
+async def test_disabled_cache_misses(monkeypatch):
+    from app.config import config
+    monkeypatch.setattr(config, "CONTENT_CACHE_BACKEND", "none")
+    monkeypatch.setattr(GeneratedContentCache, "_backend", None)
+
+    await GeneratedContentCache.set("a", "content", "gpt-4o")
+    assert await GeneratedContentCache.get("a") is None
@@ -0,0 +1,53 @@
+import sys
+import pytest
+from app.config import config
+import app.database  # noqa: F401
+
+db_module = sys.modules["app.database.db"]
+
+
+class RecordingClient:
+    instances = []
+
+    def __init__(self, url, **options):
+        self.url, self.options = url, options
+        RecordingClient.instances.append(self)
+
+    def __getitem__(self, database):
+        return {"articles": f"{database}.articles"}
+
+
+@pytest.fixture
+def recording_client(monkeypatch):
+    motor_asyncio = pytest.importorskip("motor.motor_asyncio")
+    RecordingClient.instances = []
+    monkeypatch.setattr(motor_asyncio, "AsyncIOMotorClient", RecordingClient)
+    monkeypatch.setattr(db_module, "_client", None)
+    return RecordingClient
+
+
+def test_client_is_created_once_with_the_configured_pool(recording_client, monkeypatch):
+    monkeypatch.setattr(config, "MONGO_MAX_POOL_SIZE", 7)
+    monkeypatch.setattr(config, "MONGO_MIN_POOL_SIZE", 1)
+    monkeypatch.setattr(config, "MONGO_MAX_IDLE_TIME_MS", 1234)
+    monkeypatch.setattr(config, "METRICS_ENABLED", False)
+    monkeypatch.setattr(config, "MONGO_PROFILER_ENABLED", False)
+
+    client = db_module.get_client()
+
+    assert db_module.get_client() is client
+    assert len(recording_client.instances) == 1
+    assert client.options["maxPoolSize"] == 7
+    assert client.options["minPoolSize"] == 1
+    assert client.options["maxIdleTimeMS"] == 1234
+    assert client.options["serverSelectionTimeoutMS"] == config.MONGO_SERVER_SELECTION_TIMEOUT_MS
+    assert client.options["event_listeners"] == []
+
+
+def test_lazy_database_defers_the_client_until_first_use(recording_client, monkeypatch):
+    monkeypatch.setattr(config, "MONGO_DB_NAME", "TestDB")
+    lazy = db_module.LazyDatabase()
+    assert recording_client.instances == []
+
+    assert lazy["articles"] == "TestDB.articles"
+    assert len(recording_client.instances) == 1
@@ -0,0 +1,88 @@
+import asyncio
+import sys
+from types import SimpleNamespace
+from datetime import datetime, timedelta, timezone
+import pytest
+from bson import ObjectId
+from app.config import config
+from app.database.generation_job_repository import GenerationJobRepository
+from app.services import generation_job_service
+from app.services.generation_job_service import GenerationJobService, GenerationRunnerUnavailableError
+
+SECTOR = {
+    "sector": "Technology", "subsectors": ["AI", "Chips"], "keywords": ["tech"],
+    "audience": "CTOs", "perspective": "Ethics",
+}
+TASKS = [(SECTOR, "AI"), (SECTOR, "Chips")]
+
+@pytest.fixture(autouse=True)
+def fresh_index(monkeypatch):
+    monkeypatch.setattr(GenerationJobRepository, "_active_index_ready", False)
+
+async def test_second_request_joins_the_active_job(mongo):
+    first, created = await GenerationJobRepository.create_or_get_active_job(TASKS, str(ObjectId()), 900)
+    second, joined = await GenerationJobRepository.create_or_get_active_job(TASKS, str(ObjectId()), 900)
+
+    assert created and not joined
+    assert second["_id"] == first["_id"]
+    assert await mongo["generation_jobs"].count_documents({}) == 1
+
+async def test_concurrent_requests_create_a_single_job(mongo):
+    results = await asyncio.gather(*[
+        GenerationJobRepository.create_or_get_active_job(TASKS, str(ObjectId()), 900) for _ in range(5)
+    ])
+    assert sum(created for _, created in results) == 1
+    assert len({job["_id"] for job, _ in results}) == 1
+
+async def test_stale_job_is_abandoned_and_replaced(mongo):
+    stale, _ = await GenerationJobRepository.create_or_get_active_job(TASKS, str(ObjectId()), 900)
+    long_ago = datetime.now(timezone.utc) - timedelta(hours=1)
+    await mongo["generation_jobs"].update_one({"_id": stale["_id"]}, {"$set": {"updated_at": long_ago}})
+
+    job, created = await GenerationJobRepository.create_or_get_active_job(TASKS, str(ObjectId()), 900)
+
+    assert created and job["_id"] != stale["_id"]
+    old = await mongo["generation_jobs"].find_one({"_id": stale["_id"]})
+    assert old["status"] == "abandoned" and "active_key" not in old
+
+async def test_run_job_records_progress_and_releases_the_slot(mongo, monkeypatch):
+    monkeypatch.setattr(config, "SECTORS", [SECTOR])
+    job, _ = await GenerationJobRepository.create_or_get_active_job(TASKS, str(ObjectId()), 900)
+
+    async def generator(sector, subsector):
+        if subsector == "Chips":
+            raise RuntimeError("model unavailable")
+        return f"**{subsector}**\n\nBody"
+    monkeypatch.setattr(config, "ARTICLE_GENERATION_MAX_RETRIES", 0)
+
+    await GenerationJobService.run_job(str(job["_id"]), generator=generator)
+
+    finished = await mongo["generation_jobs"].find_one({"_id": job["_id"]})
+    assert finished["status"] == "completed_with_errors"
+    assert (finished["completed"], finished["generated"], finished["failed"]) == (2, 1, 1)
+    assert [entry["status"] for entry in finished["subsectors"]] == ["done", "failed"]
+    assert "active_key" not in finished
+    assert await mongo["articles"].count_documents({}) == 1
+
+async def test_asyncio_runner_is_refused_on_lambda(monkeypatch):
+    monkeypatch.setattr(config, "GENERATION_JOB_RUNNER", "asyncio")
+    monkeypatch.setenv("AWS_LAMBDA_FUNCTION_NAME", "FastAPIBackend")
+    with pytest.raises(GenerationRunnerUnavailableError):
+        await GenerationJobService.submit(str(ObjectId()))
+
+async def test_dispatch_failure_fails_the_job_and_frees_the_slot(mongo, monkeypatch):
+    class BrokerDown:
+        @staticmethod
+        def delay(job_id):
+            raise ConnectionError("broker unreachable")
+
+    monkeypatch.setattr(config, "GENERATION_JOB_RUNNER", "celery")
+    monkeypatch.setitem(sys.modules, "app.tasks.celery_worker", SimpleNamespace(run_generation_job=BrokerDown))
+
+    with pytest.raises(GenerationRunnerUnavailableError):
+        await GenerationJobService.submit(str(ObjectId()))
+
+    job = await mongo["generation_jobs"].find_one({})
+    assert job["status"] == "failed"
+    assert "broker unreachable" in job["error"]
+    assert "active_key" not in job
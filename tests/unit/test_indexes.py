@@ -0,0 +1,17 @@
+from app.database.indexes import QueryShape, declared_index_fields, is_covered, uncovered_queries
+
+
+def test_every_repository_query_has_a_declared_index():
+    assert uncovered_queries(declared_index_fields()) == []
+
+
+def test_missing_indexes_are_reported():
+    uncovered = uncovered_queries({})
+    assert "UserRepository.find_by_email" in [shape.name for shape in uncovered]
+
+
+def test_equality_sort_range_ordering():
+    shape = QueryShape("q", "comments", equality=("article_id",), sort=("_id",))
+    assert is_covered(shape, ["article_id", "_id"])
+    assert not is_covered(shape, ["_id", "article_id"])
+    assert not is_covered(shape, ["user_id"])
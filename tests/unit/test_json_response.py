@@ -0,0 +1,24 @@
+import json
+from datetime import datetime, timezone
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from app.utils.json_response import MongoJSONResponse
+
+def test_renders_nested_bson_types_like_jsonable_encoder():
+    article_id = ObjectId()
+    document = {
+        "_id": article_id,
+        "created_at": datetime(2025, 1, 2, 3, 4, 5, 678000, tzinfo=timezone.utc),
+        "comments": [{"user_id": ObjectId(), "tags": ["a"], "user": {"username": "sam"}}],
+    }
+    expected = jsonable_encoder(document, custom_encoder={ObjectId: str})
+
+    body = MongoJSONResponse(document).body
+
+    assert json.loads(body) == expected
+    assert json.loads(body)["_id"] == str(article_id)
+
+def test_does_not_mutate_the_document():
+    document = {"_id": ObjectId()}
+    MongoJSONResponse([document])
+    assert isinstance(document["_id"], ObjectId)
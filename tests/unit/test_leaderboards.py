@@ -0,0 +1,81 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from app.database import leaderboard_repository
+from app.database.leaderboard_repository import LeaderboardRepository
+
+class FakeLeaderboards:
+    def __init__(self, document):
+        self.document = document
+
+    async def find_one(self, query):
+        return self.document
+
+def test_windowed_rollup_merges_into_one_document():
+    now = datetime(2025, 1, 31, tzinfo=timezone.utc)
+    pipeline = LeaderboardRepository.rollup_pipeline("most_viewed_articles", "7d", now)
+
+    assert pipeline[0]["$match"] == {"action": "viewed_article", "timestamp": {"$gte": now - timedelta(days=7)}}
+    assert pipeline[1]["$group"]["_id"] == "$metadata.article_id"
+    assert pipeline[-3]["$group"]["_id"] == "most_viewed_articles:7d"
+    assert pipeline[-1]["$merge"]["into"] == "leaderboards"
+
+def test_all_time_rollup_has_no_time_filter():
+    pipeline = LeaderboardRepository.rollup_pipeline("most_commented_articles", "all", datetime.now(timezone.utc))
+    assert pipeline[0]["$match"] == {}
+
+async def test_fresh_board_is_served_without_a_rollup(monkeypatch):
+    document = {
+        "computed_at": datetime.now(timezone.utc),
+        "entries": [{"_id": "a", "view_count": 3}, {"_id": "b", "view_count": 1}],
+    }
+    monkeypatch.setattr(leaderboard_repository, "db", {"leaderboards": FakeLeaderboards(document)})
+    refreshed = []
+
+    async def refresh(board, window):
+        refreshed.append((board, window))
+    monkeypatch.setattr(LeaderboardRepository, "refresh", refresh)
+
+    assert await LeaderboardRepository.get_leaderboard("most_viewed_articles", "all", limit=1) == [{"_id": "a", "view_count": 3}]
+    assert refreshed == []
+
+    # A stale board is still served; a single refresh runs in the background
+    document["computed_at"] -= timedelta(hours=1)
+    for _ in range(3):
+        assert len(await LeaderboardRepository.get_leaderboard("most_viewed_articles", "all")) == 2
+    await asyncio.gather(*LeaderboardRepository._background_refreshes.values())
+    assert refreshed == [("most_viewed_articles", "all")]
+    assert LeaderboardRepository._background_refreshes == {}
+
+async def test_empty_window_is_materialized_so_reads_stop_rebuilding(mongo, monkeypatch):
+    async def invalidate(*tags):
+        pass
+    monkeypatch.setattr(leaderboard_repository.ResponseCache, "invalidate", invalidate)
+    # mongomock has no $merge; with no source rows it would write nothing anyway
+    monkeypatch.setattr(LeaderboardRepository, "rollup_pipeline", lambda board, window, now: [{"$match": {}}])
+    refresh = LeaderboardRepository.refresh
+    refreshed = []
+
+    async def counting_refresh(board, window):
+        refreshed.append((board, window))
+        await refresh(board, window)
+    monkeypatch.setattr(LeaderboardRepository, "refresh", counting_refresh)
+
+    assert await LeaderboardRepository.get_leaderboard("most_commented_articles", "7d") == []
+    assert await LeaderboardRepository.get_leaderboard("most_commented_articles", "7d") == []
+
+    assert refreshed == [("most_commented_articles", "7d")]
+    document = await mongo["leaderboards"].find_one({"_id": "most_commented_articles:7d"})
+    assert document["entries"] == []
+
+async def test_empty_window_write_keeps_a_newer_merged_document(mongo, monkeypatch):
+    async def invalidate(*tags):
+        pass
+    monkeypatch.setattr(leaderboard_repository.ResponseCache, "invalidate", invalidate)
+    monkeypatch.setattr(LeaderboardRepository, "rollup_pipeline", lambda board, window, now: [{"$match": {}}])
+    merged = {"_id": "most_commented_articles:7d", "entries": [{"_id": "a"}],
+              "computed_at": datetime.now(timezone.utc) + timedelta(minutes=1)}
+    await mongo["leaderboards"].insert_one(merged)
+
+    await LeaderboardRepository.refresh("most_commented_articles", "7d")
+
+    assert (await mongo["leaderboards"].find_one({"_id": merged["_id"]}))["entries"] == [{"_id": "a"}]
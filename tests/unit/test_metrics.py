@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+import pytest
+from app.config import config
+from app.database.monitoring import RequestMetricsListener
+from app.utils.metrics import (
+    Histogram, MetricsMiddleware, MetricsRegistry, current_request_metrics, record_openai
+)
+from app.utils import metrics
+
+def test_histogram_quantiles_use_bucket_bounds():
+    histogram = Histogram((10, 100, 1000))
+    for value in [5] * 90 + [50] * 9 + [2000]:
+        histogram.observe(value)
+    assert histogram.quantile(0.5) == 10
+    assert histogram.quantile(0.95) == 100
+    assert histogram.quantile(1.0) == 2000
+    assert histogram.snapshot()["buckets"]["inf"] == 1
+
+@pytest.fixture
+def fresh_registry(monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(metrics, "registry", registry)
+    monkeypatch.setattr(config, "METRICS_SAMPLE_RATE", 1.0)
+    return registry
+
+async def test_middleware_records_route_template_and_server_timing(fresh_registry):
+    listener = RequestMetricsListener()
+
+    async def app(scope, receive, send):
+        listener.succeeded(SimpleNamespace(duration_micros=2500))
+        listener.succeeded(SimpleNamespace(duration_micros=500))
+        record_openai(40.0)
+        scope["route"] = SimpleNamespace(path="/api/v1/articles/{article_id}")
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/api/v1/articles/abc", "headers": []}
+    await MetricsMiddleware(app)(scope, None, send)
+
+    timing = dict(messages[0]["headers"])[b"server-timing"].decode()
+    assert 'mongo;dur=3.0;desc="2 calls"' in timing
+    assert "openai;dur=40.0" in timing
+    route = fresh_registry.snapshot()["routes"]["GET /api/v1/articles/{article_id}"]
+    assert route["requests"] == 1
+    assert route["mongo_calls_per_request"]["max"] == 2
+    assert route["openai_calls"] == 1
+    assert current_request_metrics.get() is None
+
+async def test_unsampled_requests_are_not_recorded(fresh_registry, monkeypatch):
+    monkeypatch.setattr(config, "METRICS_SAMPLE_RATE", 0.0)
+
+    async def app(scope, receive, send):
+        assert current_request_metrics.get() is None
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+
+    async def send(message):
+        assert message["headers"] == []
+
+    await MetricsMiddleware(app)({"type": "http", "method": "GET", "path": "/"}, None, send)
+    assert fresh_registry.snapshot()["routes"] == {}
@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+from app.database.monitoring import QueryProfiler, command_shape, filter_shape, has_collection_scan
+
+def _started(name, command, request_id, connection_id=("localhost", 27017)):
+    return SimpleNamespace(command_name=name, command=command, request_id=request_id, connection_id=connection_id)
+
+def _succeeded(name, reply, request_id, micros=1000, connection_id=("localhost", 27017)):
+    return SimpleNamespace(command_name=name, reply=reply, request_id=request_id,
+                           duration_micros=micros, connection_id=connection_id)
+
+def test_filter_shape_drops_values_and_keeps_operators():
+    shape = filter_shape({"user_id": 1, "timestamp": {"$gte": 5, "$lt": 9}, "$or": [{"a": 1}, {"b": 2}, {"a": 3}]})
+    assert shape == ("$or(a|b)", "timestamp:$gte/$lt", "user_id")
+
+def test_command_shape_uses_leading_match_and_stage_names():
+    shape = command_shape("aggregate", {"aggregate": "comments", "pipeline": [
+        {"$match": {"created_at": {"$gte": 1}}}, {"$group": {"_id": "$article_id"}}, {"$sort": {"n": -1}},
+    ]})
+    assert shape.collection == "comments"
+    assert shape.operation == "aggregate[$match,$group,$sort]"
+    assert shape.filter == ("created_at:$gte",)
+
+def test_profiler_groups_shapes_and_attributes_get_more():
+    profiler = QueryProfiler(slow_ms=1_000)
+    for request_id, user in enumerate(["a", "b"]):
+        profiler.started(_started("find", {"find": "badges", "filter": {"user_id": user}, "lsid": {}}, request_id))
+        profiler.succeeded(_succeeded("find", {"cursor": {"id": 0, "firstBatch": [{}]}}, request_id, micros=2000))
+    profiler.started(_started("find", {"find": "articles", "filter": {}}, 10))
+    profiler.succeeded(_succeeded("find", {"cursor": {"id": 77, "firstBatch": [{}] * 101}}, 10))
+    profiler.started(_started("getMore", {"getMore": 77, "collection": "articles"}, 11))
+    profiler.succeeded(_succeeded("getMore", {"cursor": {"id": 0, "nextBatch": [{}] * 9}}, 11))
+    profiler.started(_started("ping", {"ping": 1}, 12))
+
+    rows = {(row["collection"], row["operation"]): row for row in profiler.report()}
+    assert rows[("badges", "find")]["count"] == 2
+    assert rows[("badges", "find")]["filter"] == ["user_id"]
+    assert rows[("badges", "find")]["total_ms"] == 4.0
+    assert rows[("articles", "find")]["count"] == 1
+    assert rows[("articles", "find")]["docs"] == 110
+    assert len(rows) == 2
+    assert "badges.find {user_id}" in profiler.format_report()
+
+def test_has_collection_scan_ignores_rejected_plans():
+    plan = {"queryPlanner": {
+        "winningPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}},
+        "rejectedPlans": [{"stage": "COLLSCAN"}],
+    }}
+    assert not has_collection_scan(plan)
+    assert has_collection_scan({"stages": [{"$cursor": {"queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}}}}]})
+
+async def test_explain_flags_collection_scans():
+    profiler = QueryProfiler(slow_ms=1_000)
+    profiler.started(_started("find", {"find": "comments", "filter": {"status": "flagged"}, "lsid": {}, "$db": "x"}, 1))
+    profiler.succeeded(_succeeded("find", {"cursor": {"id": 0, "firstBatch": []}}, 1))
+    explained = []
+
+    class FakeDatabase:
+        async def command(self, command):
+            explained.append(command)
+            return {"queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}}}
+
+    assert await profiler.explain(FakeDatabase()) == 1
+    assert explained[0]["explain"] == {"find": "comments", "filter": {"status": "flagged"}}
+    assert profiler.report()[0]["collection_scan"] is True
+    assert await profiler.explain(FakeDatabase()) == 0
+
+def test_killed_and_excess_cursors_are_forgotten():
+    profiler = QueryProfiler(slow_ms=1_000, max_cursors=2)
+    for request_id, cursor_id in enumerate([101, 102, 103]):
+        profiler.started(_started("find", {"find": "articles", "filter": {}}, request_id))
+        profiler.succeeded(_succeeded("find", {"cursor": {"id": cursor_id, "firstBatch": []}}, request_id))
+    assert list(profiler._cursors) == [102, 103]
+
+    profiler.started(_started("killCursors", {"killCursors": "articles", "cursors": [102]}, 10))
+    assert list(profiler._cursors) == [103]
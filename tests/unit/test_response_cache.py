@@ -0,0 +1,53 @@
+import pytest
+from starlette.requests import Request
+from app.services import response_cache
+from app.services.response_cache import MemoryResponseCacheBackend, ResponseCache
+
+def make_request(query: bytes = b"", headers: list = ()):
+    return Request({"type": "http", "method": "GET", "path": "/api/v1/articles/", "query_string": query, "headers": list(headers)})
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    monkeypatch.setattr(ResponseCache, "_backend", MemoryResponseCacheBackend(maxsize=16, ttl=30))
+    yield
+    monkeypatch.setattr(ResponseCache, "_backend", None)
+
+async def test_hit_after_miss_and_invalidation_by_tag(memory_cache):
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return [{"title": f"v{len(loads)}"}], {"X-Next-Cursor": "abc"}
+
+    first = await ResponseCache.respond(make_request(b"limit=1"), ["articles"], load)
+    second = await ResponseCache.respond(make_request(b"limit=1"), ["articles"], load)
+    assert (first.headers["x-cache"], second.headers["x-cache"]) == ("MISS", "HIT")
+    assert second.headers["x-next-cursor"] == "abc"
+    assert second.body == first.body and len(loads) == 1
+
+    await ResponseCache.invalidate("comments:other")
+    assert (await ResponseCache.respond(make_request(b"limit=1"), ["articles"], load)).headers["x-cache"] == "HIT"
+
+    await ResponseCache.invalidate("articles")
+    third = await ResponseCache.respond(make_request(b"limit=1"), ["articles"], load)
+    assert third.headers["x-cache"] == "MISS" and b"v2" in third.body
+
+async def test_query_parameters_are_part_of_the_key(memory_cache):
+    async def load():
+        return [], {}
+
+    await ResponseCache.respond(make_request(b"limit=1&full=true"), ["articles"], load)
+    assert (await ResponseCache.respond(make_request(b"full=true&limit=1"), ["articles"], load)).headers["x-cache"] == "HIT"
+    assert (await ResponseCache.respond(make_request(b"limit=2"), ["articles"], load)).headers["x-cache"] == "MISS"
+
+async def test_if_none_match_returns_304(monkeypatch):
+    monkeypatch.setattr(response_cache.config, "RESPONSE_CACHE_BACKEND", "none")
+    monkeypatch.setattr(ResponseCache, "_backend", None)
+
+    async def load():
+        return {"badges": ["Contributor"]}, {}
+
+    etag = (await ResponseCache.respond(make_request(), ["badges:u"], load)).headers["etag"]
+    revalidated = await ResponseCache.respond(make_request(headers=[(b"if-none-match", f'W/{etag}'.encode())]), ["badges:u"], load)
+    assert revalidated.status_code == 304
+    assert revalidated.body == b""
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from app.secrets_provider import FileSecretsProvider, SecretsProvider, SSMSecretsProvider
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakePaginator:
+    def __init__(self, pages, calls):
+        self.pages = pages
+        self.calls = calls
+
+    def paginate(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.pages
+
+
+class FakeSSM:
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def get_paginator(self, name):
+        assert name == "get_parameters_by_path"
+        return FakePaginator(self.pages, self.calls)
+
+
+def test_ssm_provider_fetches_path_once_per_ttl():
+    client = FakeSSM([
+        {"Parameters": [{"Name": "/fastapi/jwt_secret_key", "Value": "s3cret"}]},
+        {"Parameters": [{"Name": "/fastapi/openai_api_key", "Value": "sk-test"}]},
+    ])
+    clock = FakeClock()
+    provider = SSMSecretsProvider("/fastapi", region="us-east-1", ttl=60, client=client, clock=clock)
+
+    assert provider.get("jwt_secret_key") == "s3cret"
+    assert provider.get("openai_api_key") == "sk-test"
+    assert len(client.calls) == 1
+    assert client.calls[0]["Path"] == "/fastapi/"
+
+    clock.now = 61
+    provider.get("jwt_secret_key")
+    assert len(client.calls) == 2
+
+
+def test_file_provider_keeps_serving_cached_values_if_refresh_fails(tmp_path):
+    path = tmp_path / "secrets.json"
+    path.write_text(json.dumps({"jwt_secret_key": "local"}))
+    clock = FakeClock()
+    provider = FileSecretsProvider(str(path), ttl=10, clock=clock)
+    assert provider.get("jwt_secret_key") == "local"
+
+    path.write_text("not json")
+    clock.now = 11
+    assert provider.get("jwt_secret_key") == "local"
+
+
+def test_base_provider_cannot_be_instantiated_without_a_fetch():
+    with pytest.raises(TypeError):
+        SecretsProvider()
@@ -0,0 +1,42 @@
+from datetime import datetime, timezone
+import pytest
+from app import seed_data
+from app.seed_data import (
+    SeedVolumes, generate_articles, generate_comments, generate_contributions, generate_users,
+    insert_stream, object_id, seed_email
+)
+
+ANCHOR = datetime(2025, 1, 1, tzinfo=timezone.utc)
+VOLUMES = SeedVolumes(users=5, articles=20, comments=50, contributions=10, description_chars=300)
+
+def test_generators_are_deterministic_by_seed():
+    first = list(generate_articles(VOLUMES, 7, ANCHOR))
+    assert first == list(generate_articles(VOLUMES, 7, ANCHOR))
+    assert [a["description"] for a in first] != [a["description"] for a in generate_articles(VOLUMES, 8, ANCHOR)]
+    assert all(len(article["description"]) == 300 for article in first)
+
+def test_generated_documents_reference_each_other():
+    users = list(generate_users(VOLUMES, ["h1", "h2"], ANCHOR))
+    articles = list(generate_articles(VOLUMES, 7, ANCHOR))
+    user_ids = {user["_id"] for user in users}
+    article_ids = {article["_id"] for article in articles}
+    comments = list(generate_comments(VOLUMES, 7, ANCHOR))
+    contributions = list(generate_contributions(VOLUMES, 7, ANCHOR))
+
+    assert users[0]["email"] == seed_email(0) and users[0]["role"] == "admin"
+    assert {user["hashed_password"] for user in users} == {"h1", "h2"}
+    assert all(article["author_id"] in user_ids for article in articles)
+    assert all(c["article_id"] in article_ids and c["user_id"] in user_ids for c in comments)
+    created = [c for c in contributions if c["action"] == "created"]
+    assert [(c["article_id"], c["user_id"]) for c in created] == [(a["_id"], a["author_id"]) for a in articles]
+    assert len(contributions) == 30
+    assert object_id("users", 3) != object_id("articles", 3)
+
+async def test_insert_stream_writes_unordered_batches():
+    batches = []
+
+    async def insert(batch):
+        batches.append(len(batch))
+
+    assert await insert_stream("comments", iter(range(2500)), 1000, insert=insert) == 2500
+    assert batches == [1000, 1000, 500]
@@ -0,0 +1,59 @@
+import json
+import logging
+import pytest
+from app.utils import structured_logging
+from app.utils.structured_logging import (
+    JsonFormatter, SamplingFilter, RequestContextMiddleware, parse_sample_rates,
+    request_id_var, sampled_var
+)
+
+def _record(level=logging.INFO, msg="hello %s", args=("world",), **extra):
+    record = logging.LogRecord("test", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+def test_json_formatter_includes_request_id_and_fields():
+    token = request_id_var.set("req-1")
+    try:
+        line = JsonFormatter().format(_record(fields={"status": 200}))
+    finally:
+        request_id_var.reset(token)
+    entry = json.loads(line)
+    assert entry["message"] == "hello world"
+    assert entry["request_id"] == "req-1"
+    assert entry["status"] == 200
+
+def test_sampling_filter_keeps_warnings_for_unsampled_requests():
+    token = sampled_var.set(False)
+    try:
+        assert not SamplingFilter().filter(_record(logging.INFO))
+        assert SamplingFilter().filter(_record(logging.WARNING))
+        assert SamplingFilter().filter(_record(logging.INFO, sample_exempt=True))
+    finally:
+        sampled_var.reset(token)
+
+def test_parse_sample_rates_prefers_longest_prefix(monkeypatch):
+    rules = parse_sample_rates("GET /api/v1/=0.5, GET /api/v1/articles/=0.01,POST /api/v1/users/login/=1")
+    monkeypatch.setattr(structured_logging, "_sample_rules", rules)
+    assert structured_logging.sample_rate_for("GET", "/api/v1/articles/") == 0.01
+    assert structured_logging.sample_rate_for("GET", "/api/v1/comments") == 0.5
+    assert structured_logging.sample_rate_for("POST", "/api/v1/users/login/") == 1.0
+
+async def test_middleware_propagates_request_id():
+    seen = {}
+
+    async def app(scope, receive, send):
+        seen["request_id"] = request_id_var.get()
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"x-request-id", b"abc")]}
+    await RequestContextMiddleware(app)(scope, None, send)
+    assert seen["request_id"] == "abc"
+    assert (b"x-request-id", b"abc") in messages[0]["headers"]
+    assert request_id_var.get() is None
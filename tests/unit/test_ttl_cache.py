@@ -0,0 +1,43 @@
+from app.utils.ttl_cache import TTLCache
+from app.services.user_cache import UserCache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    timer = FakeTimer()
+    cache = TTLCache(maxsize=10, ttl=5, timer=timer)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    timer.now = 5
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert "a" in cache
+    assert "b" not in cache
+    assert len(cache) == 2
+
+
+def test_user_cache_invalidates_by_user_id():
+    UserCache.clear()
+    UserCache.set("jane@example.com", {"_id": "abc", "email": "jane@example.com", "role": "reader"})
+    cached = UserCache.get("jane@example.com")
+    cached["role"] = "admin"
+    assert UserCache.get("jane@example.com")["role"] == "reader"
+
+    UserCache.invalidate_user("abc")
+    assert UserCache.get("jane@example.com") is None
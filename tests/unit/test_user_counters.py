@@ -0,0 +1,98 @@
+from bson import ObjectId
+from app.database import badge_repository, user_counters_repository
+from app.database.badge_repository import BadgeRepository
+from app.database.user_counters_repository import UserCountersRepository
+from app.services.badge_engine import BadgeEngine
+
+class FakeCollection:
+    def __init__(self, document=None):
+        self.document = document
+        self.updates = []
+        self.inserted = []
+
+    async def find_one_and_update(self, query, update, upsert=False, return_document=None):
+        self.updates.append((query, update, upsert))
+        return self.document
+
+    async def find_one(self, query):
+        return self.document
+
+    async def insert_many(self, documents):
+        self.inserted.extend(documents)
+
+async def test_increment_is_an_atomic_upsert(monkeypatch):
+    user_id = ObjectId()
+    counters = FakeCollection({"_id": user_id, "comments_made": 1})
+    monkeypatch.setattr(user_counters_repository, "db", {"user_counters": counters})
+    notified = []
+
+    async def counters_changed(*args):
+        notified.append(args)
+    monkeypatch.setattr(BadgeEngine, "counters_changed", counters_changed)
+
+    await UserCountersRepository.increment(user_id, comments_made=1, articles_viewed=0)
+    await UserCountersRepository.increment(None, articles_written=1)
+
+    [(query, update, upsert)] = counters.updates
+    assert query == {"_id": user_id}
+    assert update["$inc"] == {"comments_made": 1}
+    assert upsert
+    [(notified_user, before, after)] = notified
+    assert notified_user == user_id and before["comments_made"] == 0
+
+def test_threshold_crossing_and_evaluation():
+    assert BadgeRepository.crosses_threshold({"comments_made": 4}, {"comments_made": 5})
+    assert not BadgeRepository.crosses_threshold({"comments_made": 5}, {"comments_made": 6})
+    assert not BadgeRepository.crosses_threshold({"comments_made": 5}, {"comments_made": 4})
+    assert BadgeRepository.evaluate({"articles_written": 5, "comments_made": 7}) == ["Contributor", "Commenter", "Top Contributor"]
+
+async def test_award_emits_events_only_for_new_badges(monkeypatch):
+    badges = FakeCollection({"badges": ["Contributor"]})
+    events = FakeCollection()
+    monkeypatch.setattr(badge_repository, "db", {"badges": badges, "badge_events": events})
+
+    awarded = await BadgeRepository.award_badges(str(ObjectId()), ["Contributor", "Commenter"])
+
+    assert awarded == ["Commenter"]
+    assert badges.updates[0][1]["$addToSet"] == {"badges": {"$each": ["Contributor", "Commenter"]}}
+    assert [event["badge"] for event in events.inserted] == ["Commenter"]
+
+async def test_engine_coalesces_a_burst_into_one_evaluation(monkeypatch):
+    evaluated = []
+
+    async def assign_badges(user_id):
+        evaluated.append(user_id)
+    monkeypatch.setattr(BadgeRepository, "assign_badges", assign_badges)
+
+    await BadgeEngine.counters_changed("u1", {"articles_written": 0}, {"articles_written": 1})
+    await BadgeEngine.counters_changed("u1", {"comments_made": 4}, {"comments_made": 5})
+    await BadgeEngine.counters_changed("u1", {"articles_written": 4}, {"articles_written": 5})
+    await BadgeEngine.counters_changed("u2", {"comments_made": 4}, {"comments_made": 5})
+    await BadgeEngine.counters_changed("u3", {"comments_made": 5}, {"comments_made": 6})
+
+    assert evaluated == []
+    await BadgeEngine.drain()
+    assert sorted(evaluated) == ["u1", "u2"]
+    assert BadgeEngine.pending() == 0
+
+async def test_full_rebuild_upserts_in_batches_then_drops_stale_counters(mongo_bulk):
+    from datetime import datetime, timezone
+    mongo = mongo_bulk
+    author, commenter, inactive = ObjectId(), ObjectId(), ObjectId()
+    article_ids = [ObjectId(), ObjectId()]
+    await mongo["articles"].insert_many([{"_id": article_id, "author_id": author} for article_id in article_ids])
+    await mongo["comments"].insert_many([
+        {"article_id": article_id, "user_id": commenter} for article_id in article_ids
+    ])
+    long_ago = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    await mongo["user_counters"].insert_many([
+        {"_id": inactive, "comments_made": 4, "updated_at": long_ago},
+        {"_id": author, "articles_written": 9, "updated_at": long_ago},
+    ])
+
+    assert await UserCountersRepository.rebuild(batch_size=1) == 2
+
+    counters = {doc["_id"]: doc async for doc in mongo["user_counters"].find()}
+    assert set(counters) == {author, commenter}
+    assert (counters[author]["articles_written"], counters[author]["comments_received"]) == (2, 2)
+    assert counters[commenter]["comments_made"] == 2
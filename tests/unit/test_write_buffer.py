@@ -0,0 +1,47 @@
+import asyncio
+from app.utils.write_buffer import WriteBehindBuffer
+
+class RecordingSink:
+    def __init__(self, delay=0.0, fail=False):
+        self.batches = []
+        self.delay = delay
+        self.fail = fail
+
+    async def __call__(self, batch):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("insert failed")
+        self.batches.append(list(batch))
+
+async def test_flushes_when_batch_is_full():
+    sink = RecordingSink()
+    buffer = WriteBehindBuffer(sink, batch_size=3, flush_interval=60)
+    for i in range(3):
+        await buffer.add(i)
+    await asyncio.sleep(0.01)
+    assert sink.batches == [[0, 1, 2]]
+    await buffer.drain()
+
+async def test_flushes_after_interval():
+    sink = RecordingSink()
+    buffer = WriteBehindBuffer(sink, batch_size=100, flush_interval=0.01)
+    await buffer.add("a")
+    assert sink.batches == []
+    await asyncio.sleep(0.05)
+    assert sink.batches == [["a"]]
+
+async def test_full_buffer_applies_backpressure():
+    sink = RecordingSink(delay=0.01)
+    buffer = WriteBehindBuffer(sink, batch_size=2, flush_interval=60, max_size=4)
+    for i in range(9):
+        await buffer.add(i)
+        assert len(buffer) <= 4
+    await buffer.drain()
+    assert sorted(item for batch in sink.batches for item in batch) == list(range(9))
+    assert buffer.stats() == {"pending": 0, "flushed": 9, "dropped": 0}
+
+async def test_failed_flush_is_counted_not_raised():
+    buffer = WriteBehindBuffer(RecordingSink(fail=True), batch_size=10, flush_interval=60)
+    await buffer.add(1)
+    await buffer.drain()
+    assert buffer.stats()["dropped"] == 1